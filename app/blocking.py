@@ -1,71 +1,136 @@
-import socket
+import asyncio
+import heapq
+import itertools
+from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
+if TYPE_CHECKING:
+    from app.connection import ClientConnection
 
-@dataclass
+
+@dataclass(eq=False)
 class WaitingClient:
-    socket: socket.socket
-    keys: list[str]
-    timeout_at: datetime | None
-    callback: Callable[[str], tuple[str, Any] | None | list[Any]]
+    client: "ClientConnection"
+    keys: list[bytes]
+    timeout_at: float | None  # time.monotonic() deadline, None = forever
+    callback: Callable[[bytes], Any]  # See BlockingResponse.unblock_callback
+    # Used by AsyncRedisServer: resolved with the reply bytes on wake-up or
+    # timeout, which is scheduled with loop.call_at instead of polling
+    future: "asyncio.Future[bytes] | None" = None
+    timer: asyncio.TimerHandle | None = None
+    # Cleared once the waiter is woken, timed out or removed. Its entries in
+    # the per-key queues and the deadline heap are then stale.
+    active: bool = True
 
 
 class BlockingState:
+    """
+    Blocked clients, queued per key in arrival order.
+
+    A client blocked on several keys sits in the queue of each. Removing it
+    only marks it inactive, which is O(1); its leftover entries are skipped
+    when they reach the front of a queue, or swept out once they make up
+    most of the entries. Deadlines live in a min-heap cleaned up the same
+    way, so the nearest timeout is always at hand and expired waiters are
+    found without looking at the rest.
+    """
+
+    # Sweep stale entries once there are at least this many, and more than
+    # there are live ones
+    COMPACT_THRESHOLD = 1024
+
     def __init__(self):
-        self._waiters: dict[str, list[WaitingClient]] = {}
-
-    def add(self, client: WaitingClient) -> None:
-        for key in client.keys:
-            self._waiters.setdefault(key, []).append(client)
-
-    def pop(self, key: str) -> WaitingClient | None:
-        """Pop the first waiter for a given key."""
-        waiters = self._waiters.get(key)
-        if not waiters:
-            return None
-
-        waiter = waiters.pop(0)
-        if not waiters:
-            del self._waiters[key]
-
-        # Remove from all other keys this client was waiting on
-        for k in waiter.keys:
-            if k != key and k in self._waiters:
-                try:
-                    self._waiters[k].remove(waiter)
-                except ValueError:
-                    pass
-                if not self._waiters[k]:
-                    del self._waiters[k]
-
-        return waiter
-
-    def remove(self, client: WaitingClient) -> None:
-        """Remove a client from all waiting lists (e.g., on timeout)."""
-        for key in client.keys:
-            if key in self._waiters:
-                try:
-                    self._waiters[key].remove(client)
-                except ValueError:
-                    pass
-                if not self._waiters[key]:
-                    del self._waiters[key]
-
-    def get_expired(self, now: datetime) -> list[WaitingClient]:
-        """Get all clients whose timeout has passed."""
-        expired = []
-        seen: set[int] = set()
-
-        for waiters in self._waiters.values():
-            for waiter in waiters:
-                if (
-                    id(waiter) not in seen
-                    and waiter.timeout_at
-                    and waiter.timeout_at < now
-                ):
-                    expired.append(waiter)
-                    seen.add(id(waiter))
+        self._waiters: dict[bytes, deque[WaitingClient]] = {}
+        # (deadline, tie-breaker, waiter)
+        self._deadlines: list[tuple[float, int, WaitingClient]] = []
+        self._sequence = itertools.count()
+        self._entries = 0  # Queue entries, live or stale
+        self._stale = 0
+        self._timed = 0  # Live waiters with a deadline
+
+    def add(self, waiter: WaitingClient) -> None:
+        waiter.keys = list(dict.fromkeys(waiter.keys))  # BLPOP a a 0
+        for key in waiter.keys:
+            queue = self._waiters.get(key)
+            if queue is None:
+                queue = self._waiters[key] = deque()
+            queue.append(waiter)
+            self._entries += 1
+        if waiter.timeout_at is not None:
+            self._timed += 1
+            heapq.heappush(
+                self._deadlines, (waiter.timeout_at, next(self._sequence), waiter)
+            )
+
+    def has_waiters(self, key: bytes) -> bool:
+        """Whether any client may be blocked on key."""
+        return key in self._waiters
 
+    def waiters(self, key: bytes) -> list[WaitingClient]:
+        """
+        The clients blocked on key, in the order they blocked.
+
+        Returns a snapshot, so waiters can be woken (and new ones added)
+        while iterating over it. Stale entries for the key are dropped.
+        """
+        queue = self._waiters.get(key)
+        if queue is None:
+            return []
+        live = [waiter for waiter in queue if waiter.active]
+        stale = len(queue) - len(live)
+        if stale:
+            self._stale -= stale
+            self._entries -= stale
+            if live:
+                self._waiters[key] = deque(live)
+            else:
+                del self._waiters[key]
+        return live
+
+    def remove(self, waiter: WaitingClient) -> None:
+        """Remove a client from all waiting lists (when woken, timed out or gone)."""
+        if waiter.active:
+            self._deactivate(waiter, len(waiter.keys))
+
+    def next_deadline(self) -> float | None:
+        """The earliest timeout of any waiter, or None if none can time out."""
+        deadlines = self._deadlines
+        while deadlines and not deadlines[0][2].active:
+            heapq.heappop(deadlines)
+        return deadlines[0][0] if deadlines else None
+
+    def pop_expired(self, now: float) -> list[WaitingClient]:
+        """Remove and return every waiter whose deadline is at or before now."""
+        expired = []
+        # remove() may rebuild the heap, so don't hold on to it
+        while self._deadlines and self._deadlines[0][0] <= now:
+            waiter = heapq.heappop(self._deadlines)[2]
+            if waiter.active:
+                self.remove(waiter)
+                expired.append(waiter)
         return expired
+
+    def _deactivate(self, waiter: WaitingClient, stale: int) -> None:
+        waiter.active = False
+        self._stale += stale
+        if self._stale >= self.COMPACT_THRESHOLD and 2 * self._stale > self._entries:
+            self._compact_queues()
+        if waiter.timeout_at is not None:
+            self._timed -= 1
+            if len(self._deadlines) > 2 * self._timed + self.COMPACT_THRESHOLD:
+                self._deadlines = [
+                    entry for entry in self._deadlines if entry[2].active
+                ]
+                heapq.heapify(self._deadlines)
+
+    def _compact_queues(self) -> None:
+        """Drop every stale queue entry."""
+        waiters = {}
+        for key, queue in self._waiters.items():
+            live = deque(waiter for waiter in queue if waiter.active)
+            if live:
+                waiters[key] = live
+        self._waiters = waiters
+        self._entries -= self._stale
+        self._stale = 0
@@ -8,11 +8,37 @@ from app.commands.lpush import LPushCommand
 from app.commands.llen import LLenCommand
 from app.commands.lpop import LPopCommand
 from app.commands.blpop import BLPopCommand
+from app.commands.rpop import RPopCommand
+from app.commands.lindex import LIndexCommand
+from app.commands.lset import LSetCommand
+from app.commands.linsert import LInsertCommand
+from app.commands.ltrim import LTrimCommand
+from app.commands.lrem import LRemCommand
+from app.commands.lmove import LMoveCommand
+from app.commands.brpop import BRPopCommand
+from app.commands.blmove import BLMoveCommand
+from app.commands.lmpop import LMPopCommand
+from app.commands.blmpop import BLMPopCommand
 from app.commands.type import TypeCommand
 from app.commands.xadd import XaddCommand
 from app.commands.xrange import XRangeCommand
 from app.commands.xread import XReadCommand
+from app.commands.xtrim import XTrimCommand
+from app.commands.xdel import XDelCommand
+from app.commands.xgroup import XGroupCommand
+from app.commands.xreadgroup import XReadGroupCommand
+from app.commands.xack import XAckCommand
+from app.commands.xpending import XPendingCommand
+from app.commands.xclaim import XClaimCommand
+from app.commands.xautoclaim import XAutoClaimCommand
 from app.commands.incr import IncrCommand
+from app.commands.memory import MemoryCommand
+from app.commands.info import InfoCommand
+from app.commands.scan import ScanCommand
+from app.commands.keys import KeysCommand
+from app.commands.delete import DelCommand
+from app.commands.unlink import UnlinkCommand
+from app.commands.flushall import FlushAllCommand, FlushDbCommand
 from app.commands.registry import CommandRegistry
 
 __all__ = ["CommandRegistry"]
@@ -4,15 +4,23 @@ from typing import Any, Callable
 
 
 @dataclass
-class BlockingResponse:
-    keys: list[str]
-    timeout: float  # 0 = wait forever
-    unblock_callback: Callable[[str], tuple[str, Any] | list[Any] | None]
+class UnblockEvent:
+    key: bytes
 
 
 @dataclass
-class UnblockEvent:
-    key: str
+class BlockingResponse:
+    """
+    Returned by a blocking command that found nothing to do yet.
+
+    unblock_callback is called with the key that became ready. It returns
+    None to keep waiting, or the reply, optionally paired with an
+    UnblockEvent like a command result (BLMOVE pushes to its destination).
+    """
+
+    keys: list[bytes]
+    timeout: float  # 0 = wait forever
+    unblock_callback: Callable[[bytes], Any | tuple[Any, UnblockEvent] | None]
 
 
 class Command(ABC):
@@ -23,25 +31,28 @@ class Command(ABC):
     - name: The command name (e.g., "GET")
     - arity: Tuple of (min_args, max_args), use float('inf') for unlimited
     - execute(): The command logic
+
+    Commands that can grow memory set denyoom, so they are refused while the
+    database is over maxmemory and eviction can't make room.
     """
 
     name: str
     arity: tuple[int, int | float]  # (min, max) -- max can be infinity
+    denyoom: bool = False
 
     @abstractmethod
-    def execute(self, args: list[str]) -> Any:
+    def execute(self, args: list[bytes]) -> Any:
         """
         Execute the command with the given arguments.
 
         Args:
-            args: List of arguments (command name already removed)
+            args: List of raw argument bytes (command name already removed)
 
         Returns:
             The result to be encoded and sent to client
         """
-        pass
 
-    def validate(self, args: list[str] | None) -> str | None:
+    def validate(self, args: list[bytes] | None) -> str | None:
         """
         Validate argument count against arity.
 
@@ -0,0 +1,48 @@
+from app.commands.base import BlockingResponse, Command, UnblockEvent
+from app.commands.blpop import TIMEOUT_ERROR
+from app.commands.lmove import SIDES
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError
+from app.utils.command_utils import parse_timeout
+
+
+class BLMoveCommand(Command):
+    """
+    BLMOVE command - LMOVE that waits for the source list to have data.
+
+    Syntax: BLMOVE source destination LEFT|RIGHT LEFT|RIGHT timeout
+
+    The pop and push happen together when the client is woken, so an
+    element is never out of both lists (the reliable queue pattern).
+    """
+
+    name = "BLMOVE"
+    arity = (5, 5)
+    denyoom = True
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(
+        self, args: list[bytes]
+    ) -> tuple[bytes, UnblockEvent] | BlockingResponse | RESPError:
+        source, destination = args[0], args[1]
+        from_left = SIDES.get(args[2].upper())
+        to_left = SIDES.get(args[3].upper())
+        if from_left is None or to_left is None:
+            return RESPError("ERR syntax error")
+        timeout = parse_timeout(args[4])
+        if timeout is None:
+            return RESPError(TIMEOUT_ERROR)
+
+        def move(key: bytes) -> tuple[bytes, UnblockEvent] | None:
+            value = self.list_ops.lmove(source, destination, from_left, to_left)
+            if value is None:
+                return None
+            return value, UnblockEvent(key=destination)
+
+        result = move(source)
+        if result is not None:
+            return result
+        return BlockingResponse(keys=[source], timeout=timeout, unblock_callback=move)
@@ -0,0 +1,42 @@
+from typing import Any
+
+from app.commands.base import BlockingResponse, Command
+from app.commands.blpop import TIMEOUT_ERROR
+from app.commands.lmpop import parse_mpop_args
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError
+from app.utils.command_utils import parse_timeout
+
+
+class BLMPopCommand(Command):
+    """
+    BLMPOP command - LMPOP that waits up to timeout seconds (0 = forever)
+    for one of the lists to have data.
+
+    Syntax: BLMPOP timeout numkeys key [key ...] LEFT|RIGHT [COUNT count]
+    """
+
+    name = "BLMPOP"
+    arity = (4, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> list | BlockingResponse | RESPError:
+        timeout = parse_timeout(args[0])
+        if timeout is None:
+            return RESPError(TIMEOUT_ERROR)
+        parsed = parse_mpop_args(args[1:])
+        if isinstance(parsed, RESPError):
+            return parsed
+        keys, left, count = parsed
+
+        result = self.list_ops.mpop(keys, count, left)
+        if result is not None:
+            return result
+
+        def pop(key: bytes) -> list[Any] | None:
+            return self.list_ops.mpop([key], count, left)
+
+        return BlockingResponse(keys=keys, timeout=timeout, unblock_callback=pop)
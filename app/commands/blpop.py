@@ -2,6 +2,34 @@ from typing import Any
 from app.commands.base import BlockingResponse, Command
 from app.data.db import DataBase
 from app.data.list_helper import ListOps
+from app.types import RESPError
+from app.utils.command_utils import parse_timeout
+
+TIMEOUT_ERROR = "timeout is not a float or out of range"
+
+
+def blocking_pop(
+    list_ops: ListOps, args: list[bytes], left: bool
+) -> list | BlockingResponse | RESPError:
+    """Shared by BLPOP and BRPOP: args are the keys followed by the timeout."""
+    keys = args[:-1]
+    timeout = parse_timeout(args[-1])
+    if timeout is None:
+        return RESPError(TIMEOUT_ERROR)
+
+    def pop(key: bytes) -> list[Any] | None:
+        if not list_ops.has_data(key):
+            return None
+        value = list_ops.lpop(key) if left else list_ops.rpop(key)
+        return [key, value]
+
+    for key in keys:
+        result = pop(key)
+        if result is not None:
+            return result
+
+    # No data available - signal to block
+    return BlockingResponse(keys=keys, timeout=timeout, unblock_callback=pop)
 
 
 class BLPopCommand(Command):
@@ -11,24 +39,5 @@ class BLPopCommand(Command):
     def __init__(self, database: DataBase):
         self.list_ops = ListOps(database)
 
-    def execute(self, args: list[str]) -> list | BlockingResponse:
-        keys = args[:-1]
-        timeout = float(args[-1])
-
-        for key in keys:
-            if self.list_ops.has_data(key):
-                value = self.list_ops.lpop(key)
-                return [key, value]
-
-        def unblock_for_blpop(key: str) -> tuple[str, Any] | None:
-            if not self.list_ops.has_data(key):
-                return None
-            value = self.list_ops.lpop(key)
-            return key, value
-
-        # No data available - signal to block
-        return BlockingResponse(
-            keys=keys,
-            timeout=timeout,
-            unblock_callback=unblock_for_blpop,
-        )
+    def execute(self, args: list[bytes]) -> list | BlockingResponse | RESPError:
+        return blocking_pop(self.list_ops, args, left=True)
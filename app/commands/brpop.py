@@ -0,0 +1,23 @@
+from app.commands.base import BlockingResponse, Command
+from app.commands.blpop import blocking_pop
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError
+
+
+class BRPopCommand(Command):
+    """
+    BRPOP command - Pop from the tail of the first non-empty list, waiting
+    up to timeout seconds (0 = forever) for one.
+
+    Syntax: BRPOP key [key ...] timeout
+    """
+
+    name = "BRPOP"
+    arity = (2, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> list | BlockingResponse | RESPError:
+        return blocking_pop(self.list_ops, args, left=False)
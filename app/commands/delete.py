@@ -0,0 +1,23 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+
+
+class DelCommand(Command):
+    """
+    DEL command - Remove keys.
+
+    Syntax: DEL key [key ...]
+
+    Values are freed before replying unless lazyfree_lazy_user_del is set,
+    which makes DEL behave like UNLINK.
+    """
+
+    name = "DEL"
+    arity = (1, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.database = database
+
+    def execute(self, args: list[bytes]) -> int:
+        lazy = self.database.config.lazyfree_lazy_user_del
+        return sum(self.database.delete(key, lazy=lazy) for key in args)
@@ -6,5 +6,5 @@ class EchoCommand(Command):
     name = "ECHO"
     arity = (1, 1)
 
-    def execute(self, args: list[str]) -> Any:
+    def execute(self, args: list[bytes]) -> Any:
         return args[0]
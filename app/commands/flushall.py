@@ -0,0 +1,49 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+from app.types import RESPError, SimpleString
+
+
+def flush(database: DataBase, args: list[bytes]) -> SimpleString | RESPError:
+    """Shared by FLUSHALL and FLUSHDB: there is only one database."""
+    mode = args[0].upper() if args else b"SYNC"
+    if mode not in (b"SYNC", b"ASYNC"):
+        return RESPError("ERR syntax error")
+    database.flush(lazy=mode == b"ASYNC")
+    return SimpleString("OK")
+
+
+class FlushAllCommand(Command):
+    """
+    FLUSHALL command - Remove every key.
+
+    Syntax: FLUSHALL [ASYNC | SYNC]
+
+    ASYNC swaps in an empty keyspace and frees the old one on the lazyfree
+    thread, so it returns immediately whatever the dataset size.
+    """
+
+    name = "FLUSHALL"
+    arity = (0, 1)
+
+    def __init__(self, database: DataBase):
+        self.database = database
+
+    def execute(self, args: list[bytes]) -> SimpleString | RESPError:
+        return flush(self.database, args)
+
+
+class FlushDbCommand(Command):
+    """
+    FLUSHDB command - Remove every key in the current database.
+
+    Syntax: FLUSHDB [ASYNC | SYNC]
+    """
+
+    name = "FLUSHDB"
+    arity = (0, 1)
+
+    def __init__(self, database: DataBase):
+        self.database = database
+
+    def execute(self, args: list[bytes]) -> SimpleString | RESPError:
+        return flush(self.database, args)
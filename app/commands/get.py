@@ -12,7 +12,7 @@ class GetCommand(Command):
     def __init__(self, database: DataBase):
         self.string_ops = StringOps(database)
 
-    def execute(self, args: list[str]) -> Any:
+    def execute(self, args: list[bytes]) -> Any:
         val = self.string_ops.get(args[0])
         if val is None:
             return None
@@ -7,10 +7,11 @@ from app.data.string_helper import StringOps
 class IncrCommand(Command):
     name = "INCR"
     arity = (1, 1)
+    denyoom = True
 
     def __init__(self, database: DataBase):
         self._string_obs = StringOps(database)
 
-    def execute(self, args: list[str]) -> Any:
+    def execute(self, args: list[bytes]) -> Any:
         key = args[0]
         return self._string_obs.incr(key)
@@ -0,0 +1,85 @@
+from collections.abc import Callable
+
+from app.commands.base import Command
+from app.data.db import TYPE_NAMES, DataBase
+
+
+def format_bytes(n: int) -> str:
+    """Human readable size, as in used_memory_human"""
+    if n < 1024:
+        return f"{n}B"
+    size = n / 1024
+    for unit in "KMG":
+        if size < 1024 or unit == "G":
+            break
+        size /= 1024
+    return f"{size:.2f}{unit}"
+
+
+class InfoCommand(Command):
+    """
+    INFO command - Server statistics as "field:value" lines.
+
+    Syntax: INFO [section ...]
+    """
+
+    name = "INFO"
+    arity = (0, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.database = database
+        self._sections: dict[bytes, tuple[str, Callable[[], list[str]]]] = {
+            b"memory": ("Memory", self._memory),
+            b"stats": ("Stats", self._stats),
+            b"keyspace": ("Keyspace", self._keyspace),
+        }
+
+    def execute(self, args: list[bytes]) -> bytes:
+        wanted = [arg.lower() for arg in args]
+        if not wanted or b"all" in wanted or b"default" in wanted:
+            wanted = list(self._sections)
+
+        lines: list[str] = []
+        for name in wanted:
+            section = self._sections.get(name)
+            if section is None:
+                continue
+            title, build = section
+            if lines:
+                lines.append("")
+            lines.append(f"# {title}")
+            lines.extend(build())
+        return "".join(f"{line}\r\n" for line in lines).encode()
+
+    def _memory(self) -> list[str]:
+        db = self.database
+        lines = [
+            f"used_memory:{db.used_memory}",
+            f"used_memory_human:{format_bytes(db.used_memory)}",
+            f"used_memory_peak:{db.peak_memory}",
+            f"used_memory_peak_human:{format_bytes(db.peak_memory)}",
+            f"maxmemory:{db.config.maxmemory}",
+            f"maxmemory_human:{format_bytes(db.config.maxmemory)}",
+            f"maxmemory_policy:{db.config.maxmemory_policy}",
+            f"lazyfree_pending_objects:{db.lazyfree.pending_objects}",
+            f"lazyfreed_objects:{db.lazyfree.freed_objects}",
+        ]
+        # Totals per data type
+        for dtype, type_name in enumerate(TYPE_NAMES):
+            lines.append(
+                f"type_{type_name}:keys={db.keys_by_type[dtype]},"
+                f"bytes={db.memory_by_type[dtype]}"
+            )
+        return lines
+
+    def _stats(self) -> list[str]:
+        return [
+            f"expired_keys:{self.database.expired_keys}",
+            f"evicted_keys:{self.database.evictor.evicted_keys}",
+        ]
+
+    def _keyspace(self) -> list[str]:
+        db = self.database
+        if not db.store:
+            return []
+        return [f"db0:keys={len(db.store)},expires={len(db.expires)}"]
@@ -0,0 +1,22 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+
+
+class KeysCommand(Command):
+    """
+    KEYS command - Every key matching a glob pattern.
+
+    Syntax: KEYS pattern
+
+    Patterns with a literal prefix (user:*) only look at keys sharing its
+    first bytes. Anything else walks the whole keyspace; use SCAN for that.
+    """
+
+    name = "KEYS"
+    arity = (1, 1)
+
+    def __init__(self, database: DataBase):
+        self.database = database
+
+    def execute(self, args: list[bytes]) -> list[bytes]:
+        return self.database.keys(args[0])
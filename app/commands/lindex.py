@@ -0,0 +1,26 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError
+
+
+class LIndexCommand(Command):
+    """
+    LINDEX command - The element at an index; negative indexes count from
+    the tail.
+
+    Syntax: LINDEX key index
+    """
+
+    name = "LINDEX"
+    arity = (2, 2)
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> bytes | RESPError | None:
+        try:
+            index = int(args[1])
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        return self.list_ops.lindex(args[0], index)
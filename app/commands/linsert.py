@@ -0,0 +1,27 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError
+
+
+class LInsertCommand(Command):
+    """
+    LINSERT command - Insert an element before or after the first
+    occurrence of a pivot.
+
+    Syntax: LINSERT key BEFORE|AFTER pivot element
+    """
+
+    name = "LINSERT"
+    arity = (4, 4)
+    denyoom = True
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> int | RESPError:
+        key, where, pivot, element = args
+        where = where.upper()
+        if where not in (b"BEFORE", b"AFTER"):
+            return RESPError("ERR syntax error")
+        return self.list_ops.linsert(key, pivot, element, before=where == b"BEFORE")
@@ -10,6 +10,6 @@ class LLenCommand(Command):
     def __init__(self, database: DataBase):
         self.list_ops = ListOps(database)
 
-    def execute(self, args: list[str]) -> int:
+    def execute(self, args: list[bytes]) -> int:
         key = args[0]
         return self.list_ops.llen(key)
@@ -0,0 +1,37 @@
+from app.commands.base import Command, UnblockEvent
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError
+
+SIDES = {b"LEFT": True, b"RIGHT": False}
+
+
+class LMoveCommand(Command):
+    """
+    LMOVE command - Pop an element from one list and push it onto another.
+
+    Syntax: LMOVE source destination LEFT|RIGHT LEFT|RIGHT
+
+    Source and destination may be the same key, which rotates the list.
+    """
+
+    name = "LMOVE"
+    arity = (4, 4)
+    denyoom = True
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(
+        self, args: list[bytes]
+    ) -> tuple[bytes, UnblockEvent] | RESPError | None:
+        source, destination = args[0], args[1]
+        from_left = SIDES.get(args[2].upper())
+        to_left = SIDES.get(args[3].upper())
+        if from_left is None or to_left is None:
+            return RESPError("ERR syntax error")
+
+        value = self.list_ops.lmove(source, destination, from_left, to_left)
+        if value is None:
+            return None
+        return value, UnblockEvent(key=destination)
@@ -0,0 +1,64 @@
+from app.commands.base import Command
+from app.commands.lmove import SIDES
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import NullArray, RESPError
+
+
+def parse_mpop_args(args: list[bytes]) -> tuple[list[bytes], bool, int] | RESPError:
+    """
+    Parse "numkeys key [key ...] LEFT|RIGHT [COUNT count]", shared by LMPOP
+    and BLMPOP.
+
+    Returns:
+        (keys, left, count)
+    """
+    try:
+        numkeys = int(args[0])
+    except ValueError:
+        return RESPError("numkeys should be greater than 0")
+    if numkeys <= 0:
+        return RESPError("numkeys should be greater than 0")
+    if len(args) < numkeys + 2:
+        return RESPError("ERR syntax error")
+
+    keys = args[1 : numkeys + 1]
+    left = SIDES.get(args[numkeys + 1].upper())
+    options = args[numkeys + 2 :]
+    if left is None:
+        return RESPError("ERR syntax error")
+
+    count = 1
+    if options:
+        if len(options) != 2 or options[0].upper() != b"COUNT":
+            return RESPError("ERR syntax error")
+        try:
+            count = int(options[1])
+        except ValueError:
+            count = 0
+        if count <= 0:
+            return RESPError("count should be greater than 0")
+    return keys, left, count
+
+
+class LMPopCommand(Command):
+    """
+    LMPOP command - Pop up to count elements from the first non-empty list.
+
+    Syntax: LMPOP numkeys key [key ...] LEFT|RIGHT [COUNT count]
+
+    Replies [key, [elements]], or a null array if every list is empty.
+    """
+
+    name = "LMPOP"
+    arity = (3, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> list | RESPError | NullArray:
+        parsed = parse_mpop_args(args)
+        if isinstance(parsed, RESPError):
+            return parsed
+        keys, left, count = parsed
+        return self.list_ops.mpop(keys, count, left) or NullArray()
@@ -2,19 +2,39 @@ from typing import Any
 from app.commands.base import Command
 from app.data.db import DataBase
 from app.data.list_helper import ListOps
+from app.types import RESPError
+
+
+def parse_pop_count(arg: bytes) -> int | RESPError:
+    """Parse the count of LPOP or RPOP."""
+    try:
+        count = int(arg)
+    except ValueError:
+        return RESPError("value is not an integer or out of range")
+    if count < 0:
+        return RESPError("value is out of range, must be positive")
+    return count
 
 
 class LPopCommand(Command):
+    """
+    LPOP command - Remove and return elements from the head of a list.
+
+    Syntax: LPOP key [count]
+    """
+
     name = "LPOP"
     arity = (1, 2)
 
     def __init__(self, database: DataBase):
         self.list_ops = ListOps(database)
 
-    def execute(self, args: list[str]) -> Any:
+    def execute(self, args: list[bytes]) -> Any:
         key = args[0]
         count = 1
         if len(args) > 1:
-            count = int(args[1])
+            count = parse_pop_count(args[1])
+            if isinstance(count, RESPError):
+                return count
 
         return self.list_ops.lpop(key, count)
@@ -1,6 +1,7 @@
 from app.commands.base import Command
 from app.data.db import DataBase
 from app.data.list_helper import ListOps
+from app.types import StreamingReply
 
 
 class LRangeCommand(Command):
@@ -10,8 +11,9 @@ class LRangeCommand(Command):
     def __init__(self, database: DataBase):
         self.list_ops = ListOps(database)
 
-    def execute(self, args: list[str]) -> list:
+    def execute(self, args: list[bytes]) -> StreamingReply:
         key = args[0]
         start = int(args[1])
         stop = int(args[2])
-        return self.list_ops.lrange(key, start, stop)
+        values = self.list_ops.lrange(key, start, stop)
+        return StreamingReply(count=len(values), items=iter(values))
@@ -0,0 +1,28 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError
+
+
+class LRemCommand(Command):
+    """
+    LREM command - Remove elements equal to a value.
+
+    Syntax: LREM key count element
+
+    count > 0 removes that many from the head, count < 0 that many from the
+    tail, and 0 removes every match.
+    """
+
+    name = "LREM"
+    arity = (3, 3)
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> int | RESPError:
+        try:
+            count = int(args[1])
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        return self.list_ops.lrem(args[0], count, args[2])
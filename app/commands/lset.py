@@ -0,0 +1,27 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError, SimpleString
+
+
+class LSetCommand(Command):
+    """
+    LSET command - Replace the element at an index.
+
+    Syntax: LSET key index element
+    """
+
+    name = "LSET"
+    arity = (3, 3)
+    denyoom = True
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> SimpleString | RESPError:
+        try:
+            index = int(args[1])
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        error = self.list_ops.lset(args[0], index, args[2])
+        return error or SimpleString("OK")
@@ -0,0 +1,28 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError, SimpleString
+
+
+class LTrimCommand(Command):
+    """
+    LTRIM command - Keep only the elements in a range (inclusive, negative
+    indexes count from the tail).
+
+    Syntax: LTRIM key start stop
+    """
+
+    name = "LTRIM"
+    arity = (3, 3)
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> SimpleString | RESPError:
+        try:
+            start = int(args[1])
+            stop = int(args[2])
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        self.list_ops.ltrim(args[0], start, stop)
+        return SimpleString("OK")
@@ -0,0 +1,72 @@
+from typing import Any
+
+from app.commands.base import Command
+from app.data.db import DataBase
+from app.data.memory import sizeof_key
+from app.types import RESPError
+
+
+class MemoryCommand(Command):
+    """
+    MEMORY command - Inspect memory use.
+
+    Syntax:
+        MEMORY USAGE key [SAMPLES count]
+        MEMORY STATS
+    """
+
+    name = "MEMORY"
+    arity = (1, 4)
+
+    def __init__(self, database: DataBase):
+        self.database = database
+
+    def execute(self, args: list[bytes]) -> Any:
+        subcommand = args[0].upper()
+        if subcommand == b"USAGE" and len(args) in (2, 4):
+            return self._usage(args[1], args[2:])
+        if subcommand == b"STATS" and len(args) == 1:
+            return self._stats()
+        return RESPError("ERR syntax error")
+
+    def _usage(self, key: bytes, options: list[bytes]) -> int | RESPError | None:
+        """
+        Bytes used by key and its value.
+
+        Without SAMPLES this is the size tracked as the value changed. With
+        SAMPLES the value is measured again from that many of its elements
+        (0 = all of them).
+        """
+        value = self.database.get(key)
+        if value is None:
+            return None
+        if not options:
+            return value.memory
+
+        if options[0].upper() != b"SAMPLES":
+            return RESPError("ERR syntax error")
+        try:
+            samples = int(options[1])
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        if samples < 0:
+            return RESPError("value is not an integer or out of range")
+        return sizeof_key(key, value.data, samples)
+
+    def _stats(self) -> list[Any]:
+        db = self.database
+        keys = len(db.store)
+        return [
+            b"peak.allocated",
+            db.peak_memory,
+            b"total.allocated",
+            db.used_memory,
+            b"dataset.bytes",
+            db.used_memory,
+            b"keys.count",
+            keys,
+            b"keys.bytes-per-key",
+            db.used_memory // keys if keys else 0,
+            b"expires.count",
+            len(db.expires),
+        ]
@@ -12,7 +12,7 @@ class PingCommand(Command):
     name = "PING"
     arity = (0, 1)
 
-    def execute(self, args: list[str]) -> SimpleString | str:
+    def execute(self, args: list[bytes]) -> SimpleString | bytes:
         if len(args) == 0:
             return SimpleString(string="PONG")
         return args[0]
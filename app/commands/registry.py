@@ -2,23 +2,30 @@ import inspect
 from typing import Any
 
 from app.commands.base import Command
-from app.data.db import DataBase
+from app.data.db import DataBase, WrongTypeError
 from app.types import RESPError, RESPValue
 
+OOM_ERROR = "OOM command not allowed when used memory > 'maxmemory'."
+
 
 class CommandRegistry:
     """Central registry for all commands."""
 
     def __init__(self):
-        self._commands: dict[str, Command] = {}
+        # Keyed by the upper-case command name as it arrives on the wire
+        self._commands: dict[bytes, Command] = {}
+        self._database: DataBase | None = None
 
     def register(self, command: Command) -> None:
         """Register a command instance"""
-        self._commands[command.name.upper()] = command
+        self._commands[command.name.upper().encode()] = command
 
-    def get(self, name: str) -> Command | None:
-        """Look up a command by name"""
-        return self._commands.get(name)
+    def get(self, name: bytes) -> Command | None:
+        """Look up a command by name, in any letter case"""
+        command = self._commands.get(name)
+        if command is None:
+            command = self._commands.get(name.upper())
+        return command
 
     def execute(self, command_input: RESPValue) -> Any:
         """Main entry point - parse input, validate, and execute."""
@@ -28,25 +35,40 @@ class CommandRegistry:
         if isinstance(command_input, RESPError):
             return command_input
 
-        if isinstance(command_input, (str, int)):
+        if isinstance(command_input, (bytes, str, int)):
             return RESPError("Invalid command format: expected array")
 
-        cmd_name = command_input[0].upper()
-        args = list(command_input[1:])
+        if not command_input or not isinstance(command_input[0], bytes):
+            return RESPError("empty command")
 
-        command = self._commands.get(cmd_name)
+        command = self.get(command_input[0])
         if command is None:
-            return RESPError(message=f"Unknown command '{command_input[0]}'")
+            name = command_input[0].decode("utf-8", errors="replace")
+            return RESPError(message=f"Unknown command '{name}'")
+
+        args = command_input[1:]
 
         # Check validation result
         error = command.validate(args)
         if error:
             return RESPError(message=error)
 
-        return command.execute(args)
+        # Make room before anything that may grow memory
+        if (
+            command.denyoom
+            and self._database is not None
+            and not self._database.evict_if_needed()
+        ):
+            return RESPError(message=OOM_ERROR)
+
+        try:
+            return command.execute(args)
+        except WrongTypeError as e:
+            return RESPError(message=str(e))
 
     def auto_discover(self, database: DataBase) -> None:
         """Find all Command subclasses and register them."""
+        self._database = database
         subclasses = Command.__subclasses__()
 
         for subclass in subclasses:
@@ -0,0 +1,30 @@
+from typing import Any
+from app.commands.base import Command
+from app.commands.lpop import parse_pop_count
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+from app.types import RESPError
+
+
+class RPopCommand(Command):
+    """
+    RPOP command - Remove and return elements from the tail of a list.
+
+    Syntax: RPOP key [count]
+    """
+
+    name = "RPOP"
+    arity = (1, 2)
+
+    def __init__(self, database: DataBase):
+        self.list_ops = ListOps(database)
+
+    def execute(self, args: list[bytes]) -> Any:
+        key = args[0]
+        count = 1
+        if len(args) > 1:
+            count = parse_pop_count(args[1])
+            if isinstance(count, RESPError):
+                return count
+
+        return self.list_ops.rpop(key, count)
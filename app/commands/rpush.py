@@ -6,11 +6,12 @@ from app.data.list_helper import ListOps
 class RPushCommand(Command):
     name = "RPUSH"
     arity = (2, float("inf"))
+    denyoom = True
 
     def __init__(self, database: DataBase):
         self.list_ops = ListOps(database)
 
-    def execute(self, args: list[str]) -> tuple[int, UnblockEvent]:
+    def execute(self, args: list[bytes]) -> tuple[int, UnblockEvent]:
         key = args[0]
         values = args[1:]
         length = self.list_ops.rpush(key, values)
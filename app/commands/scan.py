@@ -0,0 +1,60 @@
+from typing import Any
+
+from app.commands.base import Command
+from app.data.db import TYPE_NAMES, DataBase
+from app.types import RESPError
+
+
+class ScanCommand(Command):
+    """
+    SCAN command - Incrementally iterate the keyspace.
+
+    Syntax: SCAN cursor [MATCH pattern] [COUNT count] [TYPE type]
+
+    Each call does a bounded amount of work, so iterating a huge keyspace
+    never stalls other clients. Keys present for the whole iteration are
+    returned at least once, whatever is added or deleted meanwhile.
+    """
+
+    name = "SCAN"
+    arity = (1, 7)
+
+    def __init__(self, database: DataBase):
+        self.database = database
+
+    def execute(self, args: list[bytes]) -> list[Any] | RESPError:
+        try:
+            cursor = int(args[0])
+        except ValueError:
+            return RESPError("ERR invalid cursor")
+        if cursor < 0:
+            return RESPError("ERR invalid cursor")
+
+        options = args[1:]
+        if len(options) % 2:
+            return RESPError("ERR syntax error")
+
+        match: bytes | None = None
+        count = 10
+        type_name: str | None = None
+        for name, value in zip(options[::2], options[1::2]):
+            name = name.upper()
+            if name == b"MATCH":
+                match = value
+            elif name == b"COUNT":
+                try:
+                    count = int(value)
+                except ValueError:
+                    return RESPError("value is not an integer or out of range")
+                if count < 1:
+                    return RESPError("ERR syntax error")
+            elif name == b"TYPE":
+                type_name = value.decode("utf-8", errors="replace").lower()
+                if type_name not in TYPE_NAMES:
+                    # Nothing can match an unknown type; finish at once
+                    return [b"0", []]
+            else:
+                return RESPError("ERR syntax error")
+
+        next_cursor, keys = self.database.scan(cursor, count, match, type_name)
+        return [b"%d" % next_cursor, keys]
@@ -10,9 +10,6 @@ class TypeCommand(Command):
     def __init__(self, database: DataBase) -> None:
         self.database = database
 
-    def execute(self, args: list[str]) -> SimpleString:
+    def execute(self, args: list[bytes]) -> SimpleString:
         key = args[0]
-        value = self.database.get(key)
-        if value:
-            return SimpleString(value.dtype)
-        return SimpleString("none")
+        return SimpleString(self.database.get_type(key) or "none")
@@ -0,0 +1,23 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+
+
+class UnlinkCommand(Command):
+    """
+    UNLINK command - Remove keys, freeing large values in the background.
+
+    Syntax: UNLINK key [key ...]
+
+    Keys are gone from the keyspace as soon as this returns, but big lists
+    and streams are released on the lazyfree thread instead of stalling
+    the server.
+    """
+
+    name = "UNLINK"
+    arity = (1, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.database = database
+
+    def execute(self, args: list[bytes]) -> int:
+        return sum(self.database.delete(key, lazy=True) for key in args)
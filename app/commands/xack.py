@@ -0,0 +1,30 @@
+from app.commands.base import Command
+from app.commands.xtrim import INVALID_ID_ERROR
+from app.data.db import DataBase
+from app.data.stream.stream_id import StreamID
+from app.data.stream_helper import StreamOps
+from app.types import RESPError
+
+
+class XAckCommand(Command):
+    """
+    XACK command - Acknowledge entries, removing them from a group's
+    pending entries list.
+
+    Syntax: XACK key group id [id ...]
+
+    Replies the number of entries that were pending.
+    """
+
+    name = "XACK"
+    arity = (3, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.stream_ops = StreamOps(database)
+
+    def execute(self, args: list[bytes]) -> int | RESPError:
+        try:
+            ids = [StreamID.parse(id.decode()) for id in args[2:]]
+        except ValueError:
+            return RESPError(INVALID_ID_ERROR)
+        return self.stream_ops.ack(args[0], args[1], ids)
@@ -1,4 +1,5 @@
 from app.commands.base import Command, UnblockEvent
+from app.commands.xtrim import parse_trim_args
 from app.data.db import DataBase
 from app.data.stream_helper import StreamOps
 from app.types import RESPError
@@ -6,17 +7,39 @@ from app.utils.command_utils import parse_args
 
 
 class XaddCommand(Command):
+    """
+    XADD command - Append an entry to a stream.
+
+    Syntax: XADD key [MAXLEN|MINID [=|~] threshold [LIMIT count]] id
+        field value [field value ...]
+
+    With MAXLEN or MINID the stream is trimmed as by XTRIM once the entry
+    is added.
+    """
+
     name = "XADD"
     arity = (4, float("inf"))
+    denyoom = True
 
     def __init__(self, database: DataBase):
         self.stream_ops = StreamOps(database)
 
-    def execute(self, args: list[str]) -> tuple[str, UnblockEvent] | RESPError:
+    def execute(self, args: list[bytes]) -> tuple[str, UnblockEvent] | RESPError:
         key = args[0]
-        id = args[1]
-        fields = self._get_pairs(args[2:])
-        result = self.stream_ops.add(key, id, fields)
+        trim = None
+        pos = 1
+        if args[1].upper() in (b"MAXLEN", b"MINID"):
+            parsed = parse_trim_args(args[1:])
+            if isinstance(parsed, RESPError):
+                return parsed
+            trim, used = parsed
+            pos += used
+        if len(args) - pos < 3 or (len(args) - pos) % 2 == 0:
+            return RESPError("ERR wrong number of arguments for 'xadd' command")
+
+        id = args[pos].decode()
+        fields = self._get_pairs(args[pos + 1 :])
+        result = self.stream_ops.add(key, id, fields, trim)
         if isinstance(result, RESPError):
             return result
         return str(result), UnblockEvent(key=key)
@@ -0,0 +1,73 @@
+from typing import Any
+
+from app.commands.base import Command
+from app.commands.xclaim import parse_min_idle
+from app.commands.xreadgroup import format_group_entries
+from app.commands.xtrim import INVALID_ID_ERROR
+from app.data.db import DataBase
+from app.data.stream.stream_id import StreamID
+from app.data.stream_helper import StreamOps
+from app.types import RESPError
+
+DEFAULT_COUNT = 100
+
+
+class XAutoClaimCommand(Command):
+    """
+    XAUTOCLAIM command - Claim the pending entries idle for long enough,
+    scanning the group's pending entries list like SCAN.
+
+    Syntax: XAUTOCLAIM key group consumer min-idle-time start [COUNT count]
+        [JUSTID]
+
+    Replies [next start ID (0-0 once the scan is complete), claimed
+    entries, IDs of entries deleted from the stream and dropped].
+    """
+
+    name = "XAUTOCLAIM"
+    arity = (5, 8)
+
+    def __init__(self, database: DataBase):
+        self.stream_ops = StreamOps(database)
+
+    def execute(self, args: list[bytes]) -> list[Any] | RESPError:
+        key, group, consumer = args[0], args[1], args[2]
+        min_idle = parse_min_idle(args[3])
+        if isinstance(min_idle, RESPError):
+            return min_idle
+        try:
+            start = StreamID.parse(args[4].decode())
+        except ValueError:
+            return RESPError(INVALID_ID_ERROR)
+
+        count = DEFAULT_COUNT
+        just_id = False
+        options = args[5:]
+        pos = 0
+        while pos < len(options):
+            option = options[pos].upper()
+            if option == b"JUSTID":
+                just_id = True
+            elif option == b"COUNT" and pos + 1 < len(options):
+                try:
+                    count = int(options[pos + 1])
+                except ValueError:
+                    return RESPError("value is not an integer or out of range")
+                if count <= 0:
+                    return RESPError("ERR COUNT must be > 0")
+                pos += 1
+            else:
+                return RESPError("ERR syntax error")
+            pos += 1
+
+        result = self.stream_ops.autoclaim(
+            key, group, consumer, min_idle, start, count, just_id
+        )
+        if isinstance(result, RESPError):
+            return result
+        cursor, claimed, deleted = result
+        if just_id:
+            entries: list[Any] = [str(id) for id, _ in claimed]
+        else:
+            entries = format_group_entries(claimed)
+        return [str(cursor), entries, [str(id) for id in deleted]]
@@ -0,0 +1,98 @@
+from typing import Any
+
+from app.commands.base import Command
+from app.commands.xreadgroup import format_group_entries
+from app.commands.xtrim import INVALID_ID_ERROR
+from app.data.db import DataBase
+from app.data.stream.stream_id import StreamID
+from app.data.stream_helper import ClaimOptions, StreamOps
+from app.types import RESPError
+
+# XCLAIM options taking a value, by the ClaimOptions field they set
+VALUE_OPTIONS = {b"IDLE": "idle", b"TIME": "time", b"RETRYCOUNT": "retry_count"}
+
+
+def parse_min_idle(arg: bytes) -> int | RESPError:
+    """Parse XCLAIM/XAUTOCLAIM's min-idle-time; negative counts as 0."""
+    try:
+        return max(int(arg), 0)
+    except ValueError:
+        return RESPError("ERR Invalid min-idle-time argument for XCLAIM")
+
+
+class XClaimCommand(Command):
+    """
+    XCLAIM command - Take over pending entries from other consumers.
+
+    Syntax: XCLAIM key group consumer min-idle-time id [id ...] [IDLE ms]
+        [TIME unix-time-milliseconds] [RETRYCOUNT count] [FORCE] [JUSTID]
+        [LASTID id]
+
+    Entries pending for less than min-idle-time are left alone, so two
+    consumers claiming the same entry don't both get it.
+    """
+
+    name = "XCLAIM"
+    arity = (5, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.stream_ops = StreamOps(database)
+
+    def execute(self, args: list[bytes]) -> list[Any] | RESPError:
+        key, group, consumer = args[0], args[1], args[2]
+        min_idle = parse_min_idle(args[3])
+        if isinstance(min_idle, RESPError):
+            return min_idle
+
+        # IDs run up to the first argument that isn't one
+        ids: list[StreamID] = []
+        pos = 4
+        while pos < len(args):
+            try:
+                ids.append(StreamID.parse(args[pos].decode()))
+            except ValueError:
+                break
+            pos += 1
+        if not ids:
+            return RESPError(INVALID_ID_ERROR)
+
+        options = self._parse_options(args[pos:])
+        if isinstance(options, RESPError):
+            return options
+        claimed = self.stream_ops.claim(key, group, consumer, min_idle, ids, options)
+        if isinstance(claimed, RESPError):
+            return claimed
+        if options.just_id:
+            return [str(id) for id, _ in claimed]
+        return format_group_entries(claimed)
+
+    @staticmethod
+    def _parse_options(args: list[bytes]) -> ClaimOptions | RESPError:
+        values: dict[str, Any] = {}
+        pos = 0
+        while pos < len(args):
+            option = args[pos].upper()
+            if option == b"FORCE":
+                values["force"] = True
+            elif option == b"JUSTID":
+                values["just_id"] = True
+            elif option in VALUE_OPTIONS or option == b"LASTID":
+                if pos + 1 == len(args):
+                    return RESPError("ERR syntax error")
+                value = args[pos + 1]
+                pos += 1
+                if option == b"LASTID":
+                    try:
+                        values["last_id"] = StreamID.parse(value.decode())
+                    except ValueError:
+                        return RESPError(INVALID_ID_ERROR)
+                else:
+                    try:
+                        values[VALUE_OPTIONS[option]] = max(int(value), 0)
+                    except ValueError:
+                        return RESPError("value is not an integer or out of range")
+            else:
+                name = args[pos].decode(errors="replace")
+                return RESPError(f"ERR Unrecognized XCLAIM option '{name}'")
+            pos += 1
+        return ClaimOptions(**values)
@@ -0,0 +1,30 @@
+from app.commands.base import Command
+from app.commands.xtrim import INVALID_ID_ERROR
+from app.data.db import DataBase
+from app.data.stream.stream_id import StreamID
+from app.data.stream_helper import StreamOps
+from app.types import RESPError
+
+
+class XDelCommand(Command):
+    """
+    XDEL command - Delete entries from a stream by ID.
+
+    Syntax: XDEL key id [id ...]
+
+    Replies the number of entries deleted. The stream's top ID is kept, so
+    new entries still need greater IDs.
+    """
+
+    name = "XDEL"
+    arity = (2, float("inf"))
+
+    def __init__(self, database: DataBase):
+        self.stream_ops = StreamOps(database)
+
+    def execute(self, args: list[bytes]) -> int | RESPError:
+        try:
+            ids = [StreamID.parse(id.decode()) for id in args[1:]]
+        except ValueError:
+            return RESPError(INVALID_ID_ERROR)
+        return self.stream_ops.delete(args[0], ids)
@@ -0,0 +1,57 @@
+from app.commands.base import Command, UnblockEvent
+from app.commands.xtrim import INVALID_ID_ERROR
+from app.data.db import DataBase
+from app.data.stream_helper import StreamOps
+from app.types import RESPError, SimpleString
+
+
+class XGroupCommand(Command):
+    """
+    XGROUP command - Manage a stream's consumer groups.
+
+    Syntax:
+        XGROUP CREATE key group id|$ [MKSTREAM]
+        XGROUP SETID key group id|$
+        XGROUP DESTROY key group
+        XGROUP CREATECONSUMER key group consumer
+        XGROUP DELCONSUMER key group consumer
+
+    DESTROY wakes the clients blocked in XREADGROUP on the group, which
+    reply NOGROUP.
+    """
+
+    name = "XGROUP"
+    arity = (3, 5)
+    denyoom = True
+
+    def __init__(self, database: DataBase):
+        self.stream_ops = StreamOps(database)
+
+    def execute(
+        self, args: list[bytes]
+    ) -> SimpleString | int | RESPError | tuple[int, UnblockEvent]:
+        subcommand = args[0].upper()
+        key, group, rest = args[1], args[2], args[3:]
+        try:
+            if subcommand == b"CREATE" and rest:
+                if len(rest) == 2 and rest[1].upper() != b"MKSTREAM":
+                    return RESPError("ERR syntax error")
+                error = self.stream_ops.create_group(
+                    key, group, rest[0].decode(), mkstream=len(rest) == 2
+                )
+                return error or SimpleString("OK")
+            if subcommand == b"SETID" and len(rest) == 1:
+                error = self.stream_ops.set_group_id(key, group, rest[0].decode())
+                return error or SimpleString("OK")
+        except ValueError:
+            return RESPError(INVALID_ID_ERROR)
+        if subcommand == b"DESTROY" and not rest:
+            destroyed = self.stream_ops.destroy_group(key, group)
+            if destroyed == 1:
+                return destroyed, UnblockEvent(key=key)
+            return destroyed
+        if subcommand == b"CREATECONSUMER" and len(rest) == 1:
+            return self.stream_ops.create_consumer(key, group, rest[0])
+        if subcommand == b"DELCONSUMER" and len(rest) == 1:
+            return self.stream_ops.delete_consumer(key, group, rest[0])
+        return RESPError("ERR syntax error")
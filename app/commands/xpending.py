@@ -0,0 +1,51 @@
+from app.commands.base import Command
+from app.commands.xtrim import INVALID_ID_ERROR
+from app.data.db import DataBase
+from app.data.stream.stream_id import SEQUENCE_MASK, StreamID
+from app.data.stream_helper import StreamOps
+from app.types import RESPError
+
+
+class XPendingCommand(Command):
+    """
+    XPENDING command - Inspect a group's pending entries.
+
+    Syntax: XPENDING key group [[IDLE min-idle-time] start end count [consumer]]
+
+    Without a range it replies a summary: how many entries are pending,
+    the smallest and greatest of their IDs and how many each consumer has.
+    With one it replies [ID, consumer, idle ms, deliveries] per entry.
+    """
+
+    name = "XPENDING"
+    arity = (2, 7)
+
+    def __init__(self, database: DataBase):
+        self.stream_ops = StreamOps(database)
+
+    def execute(self, args: list[bytes]) -> list | RESPError:
+        key, group, rest = args[0], args[1], args[2:]
+        if not rest:
+            return self.stream_ops.pending_summary(key, group)
+
+        min_idle = 0
+        try:
+            if rest[0].upper() == b"IDLE":
+                if len(rest) < 2:
+                    return RESPError("ERR syntax error")
+                min_idle = int(rest[1])
+                rest = rest[2:]
+            if len(rest) not in (3, 4):
+                return RESPError("ERR syntax error")
+            count = int(rest[2])
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        try:
+            start = StreamID.parse(rest[0].decode())
+            end = StreamID.parse(rest[1].decode(), SEQUENCE_MASK)
+        except ValueError:
+            return RESPError(INVALID_ID_ERROR)
+        consumer = rest[3] if len(rest) == 4 else None
+        return self.stream_ops.pending_range(
+            key, group, start, end, count, consumer, min_idle
+        )
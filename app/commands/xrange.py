@@ -1,24 +1,47 @@
+from collections.abc import Iterator
 from typing import Any
 from app.commands.base import Command
+from app.commands.xtrim import INVALID_ID_ERROR
 from app.data.db import DataBase
 from app.data.stream.stream_entry import StreamEntry
 from app.data.stream_helper import StreamOps
+from app.types import RESPError, StreamingReply
 
 
 class XRangeCommand(Command):
+    """
+    XRANGE command - Entries with IDs between start and end (inclusive).
+
+    Syntax: XRANGE key start end [COUNT count]
+    """
+
     name = "XRANGE"
-    arity = (3, 3)
+    arity = (3, 5)
 
     def __init__(self, database: DataBase):
         self.stream_ops = StreamOps(database)
 
-    def execute(self, args: list[str]) -> list[StreamEntry | None]:
+    def execute(self, args: list[bytes]) -> StreamingReply | RESPError:
         key = args[0]
-        start_id = args[1]
-        end_id = args[2]
-        result = self.stream_ops.xrange(key, start_id, end_id)
-        return self._format(result)
+        start_id = args[1].decode()
+        end_id = args[2].decode()
+        count = None
+        if len(args) > 3:
+            if len(args) != 5 or args[3].upper() != b"COUNT":
+                return RESPError("ERR syntax error")
+            try:
+                count = max(int(args[4]), 0)
+            except ValueError:
+                return RESPError("value is not an integer or out of range")
+        try:
+            result = self.stream_ops.xrange(key, start_id, end_id, count)
+        except ValueError:
+            return RESPError(INVALID_ID_ERROR)
+        if isinstance(result, RESPError):
+            return result
+        return StreamingReply(count=len(result), items=self._format(result))
 
     @staticmethod
-    def _format(entries: list[StreamEntry]) -> list[Any]:
-        return [entry.format() for entry in entries]
+    def _format(entries: list[StreamEntry]) -> Iterator[list[Any]]:
+        """Format entries lazily, as the server encodes them."""
+        return (entry.format() for entry in entries)
@@ -1,8 +1,12 @@
+import weakref
 from typing import Any
 
 from app.commands.base import BlockingResponse, Command
+from app.commands.xtrim import INVALID_ID_ERROR
 from app.data.db import DataBase
+from app.data.stream.stream import Stream
 from app.data.stream.stream_entry import StreamEntry
+from app.data.stream.stream_id import StreamID
 from app.data.stream_helper import StreamOps
 from app.types import RESPError
 
@@ -11,7 +15,8 @@ class XReadCommand(Command):
     """
     XREAD command - Read data from streams.
 
-    Syntax: XREAD STREAMS key1 [key2 ...] id1 [id2 ...]
+    Syntax: XREAD [COUNT count] [BLOCK milliseconds] STREAMS key1 [key2 ...]
+        id1 [id2 ...]
     """
 
     name = "XREAD"
@@ -19,15 +24,19 @@ class XReadCommand(Command):
 
     def __init__(self, database: DataBase):
         self.stream_ops = StreamOps(database)
+        # Replies for blocked readers, by (ID, count), valid for one version
+        # of one stream (see _shared_reply)
+        self._shared: tuple[weakref.ref[Stream], int, dict] | None = None
 
     def execute(
-        self, args: list[str]
+        self, args: list[bytes]
     ) -> list[list[Any]] | RESPError | None | BlockingResponse:
         """
         Execute XREAD command.
 
         Args:
-            args: [BLOCK, timeout, STREAMS, key1, ..., keyN, id1, ..., idN]
+            args: [COUNT, count, BLOCK, timeout, STREAMS, key1, ..., keyN,
+                id1, ..., idN]
 
         Returns:
             List of [key, entries] pairs for streams with data,
@@ -39,15 +48,23 @@ class XReadCommand(Command):
         parsed_args = self._parse_streams_args(args)
         if isinstance(parsed_args, RESPError):
             return parsed_args
-        keys, ids, expiry = parsed_args
+        keys, ids, expiry, count = parsed_args
 
         # Read immediately
         responses = []
         for i, (key, stream_id) in enumerate(zip(keys, ids)):
             if ids[i] == "$":
-                ids[i] = str(self.stream_ops.top_id(key))
+                top_id = self.stream_ops.top_id(key)
+                if isinstance(top_id, RESPError):
+                    return top_id
+                ids[i] = str(top_id) if top_id else "0-0"
                 stream_id = ids[i]
-            entries = self.stream_ops.xread(key, stream_id)
+            try:
+                entries = self.stream_ops.xread(key, stream_id, count)
+            except ValueError:
+                return RESPError(INVALID_ID_ERROR)
+            if isinstance(entries, RESPError):
+                return entries
             if entries:
                 responses.append(self._format_stream(key, entries))
         if responses:
@@ -55,13 +72,8 @@ class XReadCommand(Command):
 
         ids_by_key = dict(zip(keys, ids))
 
-        def unblock_for_xread(key: str) -> list[Any] | None:
-            if not self.stream_ops.has_data(key):
-                return None
-            stream_id = ids_by_key[key]
-            entries = self.stream_ops.xread(key, stream_id)
-            if entries:
-                return [self._format_stream(key, entries)]
+        def unblock_for_xread(key: bytes) -> list[Any] | RESPError | None:
+            return self._shared_reply(key, ids_by_key[key], count)
 
         if expiry is not None:
             return BlockingResponse(
@@ -72,36 +84,74 @@ class XReadCommand(Command):
 
         return None
 
+    def _shared_reply(
+        self, key: bytes, stream_id: str, count: int | None
+    ) -> list[Any] | RESPError | None:
+        """
+        The reply for a reader blocked on key after stream_id, or None if
+        there is nothing after it yet.
+
+        An XADD wakes every reader blocked on the stream, and most wait
+        after the same ID (the top when they blocked with "$"), so they
+        get the same reply. It is read and formatted once per version of
+        the stream, and the server encodes that one object once for all
+        of them.
+        """
+        stream = self.stream_ops.get_stream(key)
+        if stream is None or isinstance(stream, RESPError):
+            return stream
+        shared = self._shared
+        if shared is None or shared[0]() is not stream or shared[1] != stream.version:
+            shared = self._shared = (weakref.ref(stream), stream.version, {})
+        replies = shared[2]
+        reply_key = (stream_id, count)
+        if reply_key not in replies:
+            entries = stream.read(StreamID.parse(stream_id), count)
+            replies[reply_key] = (
+                [self._format_stream(key, entries)] if entries else None
+            )
+        return replies[reply_key]
+
     @staticmethod
-    def _format_stream(key: str, entries: list[StreamEntry]) -> list[Any]:
+    def _format_stream(key: bytes, entries: list[StreamEntry]) -> list[Any]:
         """Format a single stream's response as [key, [entries]]."""
         return [key, [entry.format() for entry in entries]]
 
     @staticmethod
     def _parse_streams_args(
-        args: list[str],
-    ) -> tuple[list[str], list[str], float | None] | RESPError:
-        # if len(args) % 2 != 0:
-        #     return RESPError(
-        #         f"ERR unbalanced XREAD list of streams: {args}"
-        #     )
-        for arg_idx in range(len(args)):
-            if args[arg_idx].upper() == "STREAMS":
-                args[arg_idx] = args[arg_idx].upper()
-            if args[arg_idx].upper() == "BLOCK":
-                args[arg_idx] = args[arg_idx].upper()
-
-        stream_idx = args.index("STREAMS") if "STREAMS" in args else None
-        if stream_idx is None:
+        args: list[bytes],
+    ) -> tuple[list[bytes], list[str], float | None, int | None] | RESPError:
+        # Options come before STREAMS; everything after it is keys and IDs
+        expiry: float | None = None
+        count: int | None = None
+        stream_idx = 0
+        while stream_idx < len(args) and args[stream_idx].upper() != b"STREAMS":
+            option = args[stream_idx].upper()
+            if option not in (b"BLOCK", b"COUNT") or stream_idx + 1 >= len(args):
+                return RESPError("ERR syntax error")
+            try:
+                value = int(args[stream_idx + 1])
+            except ValueError:
+                return RESPError("value is not an integer or out of range")
+            if value < 0:
+                return RESPError("value is not an integer or out of range")
+            if option == b"BLOCK":
+                expiry = value
+            elif value:  # COUNT 0 means no limit
+                count = value
+            stream_idx += 2
+        if stream_idx == len(args):
             return RESPError("ERR syntax error")
 
-        block_idx = args.index("BLOCK") if "BLOCK" in args else None
-        expiry: float | None = (
-            float(args[block_idx + 1]) if block_idx is not None else None
-        )
         streams = args[stream_idx + 1 :]
+        if not streams or len(streams) % 2:
+            return RESPError(
+                "ERR Unbalanced 'xread' list of streams: for each stream key "
+                "an ID or '$' must be specified."
+            )
         mid = len(streams) // 2
 
-        keys: list[str] = streams[:mid]
-        ids: list[str] = streams[mid:]
-        return keys, ids, expiry
+        keys: list[bytes] = streams[:mid]
+        # Stream IDs are ASCII; decode them once for StreamID.parse
+        ids: list[str] = [stream_id.decode() for stream_id in streams[mid:]]
+        return keys, ids, expiry, count
@@ -0,0 +1,124 @@
+from typing import Any
+
+from app.commands.base import BlockingResponse, Command
+from app.commands.xtrim import INVALID_ID_ERROR
+from app.data.db import DataBase
+from app.data.stream_helper import GroupEntries, StreamOps
+from app.types import NullArray, RESPError
+
+
+def format_group_entries(entries: GroupEntries) -> list[list[Any]]:
+    """Format (ID, entry) pairs, a deleted entry as [ID, nil] as in Redis."""
+    return [
+        entry.format() if entry is not None else [str(id), None]
+        for id, entry in entries
+    ]
+
+
+class XReadGroupCommand(Command):
+    """
+    XREADGROUP command - Read from streams as a consumer of a group.
+
+    Syntax: XREADGROUP GROUP group consumer [COUNT count] [BLOCK milliseconds]
+        [NOACK] STREAMS key [key ...] id [id ...]
+
+    The ID ">" reads entries never delivered to the group; they become
+    pending for the consumer until XACKed, unless NOACK is given. Any other
+    ID reads back the consumer's own pending entries after it. Only a read
+    of new entries blocks.
+    """
+
+    name = "XREADGROUP"
+    arity = (6, float("inf"))
+    denyoom = True
+
+    def __init__(self, database: DataBase):
+        self.stream_ops = StreamOps(database)
+
+    def execute(
+        self, args: list[bytes]
+    ) -> list[list[Any]] | RESPError | NullArray | BlockingResponse:
+        parsed = self._parse_args(args)
+        if isinstance(parsed, RESPError):
+            return parsed
+        group, consumer, count, block, noack, keys, ids = parsed
+
+        responses = []
+        for key, id in zip(keys, ids):
+            try:
+                entries = self.stream_ops.read_group(
+                    key, group, consumer, id, count, noack
+                )
+            except ValueError:
+                return RESPError(INVALID_ID_ERROR)
+            if isinstance(entries, RESPError):
+                return entries
+            if entries or id != ">":
+                responses.append([key, format_group_entries(entries)])
+        if responses:
+            return responses
+        if block is None:
+            return NullArray()
+
+        def unblock_for_xreadgroup(key: bytes) -> list[Any] | RESPError | None:
+            entries = self.stream_ops.read_group(
+                key, group, consumer, ">", count, noack
+            )
+            if isinstance(entries, RESPError):
+                return entries  # The group was destroyed meanwhile
+            if entries:
+                return [[key, format_group_entries(entries)]]
+            return None
+
+        return BlockingResponse(
+            keys=keys,
+            timeout=block / 1000,
+            unblock_callback=unblock_for_xreadgroup,
+        )
+
+    @staticmethod
+    def _parse_args(
+        args: list[bytes],
+    ) -> (
+        tuple[bytes, bytes, int | None, int | None, bool, list[bytes], list[str]]
+        | RESPError
+    ):
+        if args[0].upper() != b"GROUP":
+            return RESPError("ERR syntax error")
+        group, consumer = args[1], args[2]
+
+        count: int | None = None
+        block: int | None = None
+        noack = False
+        pos = 3
+        while pos < len(args) and args[pos].upper() != b"STREAMS":
+            option = args[pos].upper()
+            if option == b"NOACK":
+                noack = True
+                pos += 1
+                continue
+            if option not in (b"BLOCK", b"COUNT") or pos + 1 >= len(args):
+                return RESPError("ERR syntax error")
+            try:
+                value = int(args[pos + 1])
+            except ValueError:
+                return RESPError("value is not an integer or out of range")
+            if value < 0:
+                return RESPError("value is not an integer or out of range")
+            if option == b"BLOCK":
+                block = value
+            elif value:  # COUNT 0 means no limit
+                count = value
+            pos += 2
+        if pos == len(args):
+            return RESPError("ERR syntax error")
+
+        streams = args[pos + 1 :]
+        if not streams or len(streams) % 2:
+            return RESPError(
+                "ERR Unbalanced 'xreadgroup' list of streams: for each stream "
+                "key an ID or '>' must be specified."
+            )
+        mid = len(streams) // 2
+        ids = [id.decode() for id in streams[mid:]]
+        return group, consumer, count, block, noack, streams[:mid], ids
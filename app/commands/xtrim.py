@@ -0,0 +1,92 @@
+from app.commands.base import Command
+from app.data.db import DataBase
+from app.data.stream.stream_id import StreamID
+from app.data.stream.stream_node import NODE_MAX_ENTRIES
+from app.data.stream_helper import StreamOps, TrimOptions
+from app.types import RESPError
+
+# Entries an approximate trim deletes at most when no LIMIT is given, as in
+# Redis: a hundred nodes' worth
+DEFAULT_TRIM_LIMIT = 100 * NODE_MAX_ENTRIES
+
+INVALID_ID_ERROR = "ERR Invalid stream ID specified as stream command argument"
+
+
+def parse_trim_args(args: list[bytes]) -> tuple[TrimOptions, int] | RESPError:
+    """
+    Parse "MAXLEN|MINID [=|~] threshold [LIMIT count]" at the start of args,
+    shared by XTRIM and XADD.
+
+    Returns:
+        (options, number of arguments parsed)
+    """
+    strategy = args[0].upper()
+    pos = 1
+    approximate = False
+    if pos < len(args) and args[pos] in (b"=", b"~"):
+        approximate = args[pos] == b"~"
+        pos += 1
+    if pos == len(args):
+        return RESPError("ERR syntax error")
+
+    maxlen = minid = None
+    if strategy == b"MAXLEN":
+        try:
+            maxlen = int(args[pos])
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        if maxlen < 0:
+            return RESPError("ERR The MAXLEN argument must be >= 0.")
+    else:
+        try:
+            minid = StreamID.parse(args[pos].decode())
+        except ValueError:
+            return RESPError(INVALID_ID_ERROR)
+    pos += 1
+
+    limit = DEFAULT_TRIM_LIMIT if approximate else None
+    if pos < len(args) and args[pos].upper() == b"LIMIT":
+        if pos + 1 == len(args):
+            return RESPError("ERR syntax error")
+        try:
+            limit = int(args[pos + 1])
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        if limit < 0:
+            return RESPError("ERR The LIMIT argument must be >= 0.")
+        if not approximate:
+            return RESPError(
+                "ERR syntax error, LIMIT cannot be used without the special ~ option"
+            )
+        limit = limit or None  # LIMIT 0 means no limit
+        pos += 2
+    return TrimOptions(maxlen, minid, approximate, limit), pos
+
+
+class XTrimCommand(Command):
+    """
+    XTRIM command - Delete a stream's oldest entries.
+
+    Syntax: XTRIM key MAXLEN|MINID [=|~] threshold [LIMIT count]
+
+    MAXLEN keeps the newest threshold entries; MINID deletes the entries
+    with IDs below threshold. With ~ only whole storage nodes are dropped,
+    which is cheaper but may leave some entries over the threshold.
+    """
+
+    name = "XTRIM"
+    arity = (3, 6)
+
+    def __init__(self, database: DataBase):
+        self.stream_ops = StreamOps(database)
+
+    def execute(self, args: list[bytes]) -> int | RESPError:
+        if args[1].upper() not in (b"MAXLEN", b"MINID"):
+            return RESPError("ERR syntax error")
+        parsed = parse_trim_args(args[1:])
+        if isinstance(parsed, RESPError):
+            return parsed
+        options, used = parsed
+        if used != len(args) - 1:
+            return RESPError("ERR syntax error")
+        return self.stream_ops.trim(args[0], options)
@@ -5,16 +5,67 @@ from dataclasses import dataclass
 class ServerConfig:
     host: str = "localhost"
     port: int = 6379
-    recv_buffer_size: int = 1024
-    socket_backlog: int = 5
+    # Reads start at recv_buffer_size and adapt up to max_recv_buffer_size
+    recv_buffer_size: int = 16 * 1024
+    max_recv_buffer_size: int = 1024 * 1024
+    # Streaming replies are encoded this many bytes at a time
+    reply_chunk_size: int = 64 * 1024
+    socket_backlog: int = 511
+    # Stop reading from a client while this many reply bytes are unsent
+    output_backpressure_bytes: int = 1024 * 1024  # 1MB
+    # client-output-buffer-limit: disconnect when pending output reaches the
+    # hard limit, or stays above the soft limit for soft_seconds (0 = off)
+    output_buffer_hard_limit: int = 256 * 1024 * 1024  # 256MB
+    output_buffer_soft_limit: int = 64 * 1024 * 1024  # 64MB
+    output_buffer_soft_seconds: int = 60
+    # Active expiry: a slow cycle hz times a second may use cpu_percent of
+    # the time between cycles; while it leaves expired keys behind, every
+    # loop iteration also runs a fast cycle of fast_budget seconds
+    active_expire_hz: int = 10
+    active_expire_cpu_percent: int = 25
+    active_expire_fast_budget: float = 0.001
 
 
 @dataclass(frozen=True)
 class ParserConfig:
     max_array_depth: int = 10
     max_bulk_string_length: int = 512 * 1024 * 1024  # 512MB
+    max_line_length: int = 64 * 1024  # Longest header line without \r\n
+    # Bulk strings this large are received straight into their own buffer
+    big_arg_threshold: int = 32 * 1024
+
+
+MAXMEMORY_POLICIES = (
+    "noeviction",
+    "allkeys-lru",
+    "allkeys-lfu",
+    "allkeys-random",
+    "volatile-lru",
+    "volatile-lfu",
+    "volatile-random",
+    "volatile-ttl",
+)
+
+
+@dataclass(frozen=True)
+class MemoryConfig:
+    maxmemory: int = 0  # Bytes; 0 = unlimited
+    maxmemory_policy: str = "noeviction"
+    # Keys sampled per eviction round by the approximate LRU/LFU policies
+    maxmemory_samples: int = 5
+    eviction_pool_size: int = 16
+    # LFU counters grow logarithmically: higher factors need more hits per step
+    lfu_log_factor: int = 10
+    lfu_decay_time: int = 1  # Minutes per counter decrement (0 = never)
+    # Free large values on a background thread when they are removed by
+    # expiry, eviction, being overwritten, or DEL (UNLINK always does)
+    lazyfree_lazy_expire: bool = False
+    lazyfree_lazy_eviction: bool = False
+    lazyfree_lazy_server_del: bool = False
+    lazyfree_lazy_user_del: bool = False
 
 
 # Default Configs
 DEFAULT_SERVER_CONFIG = ServerConfig()
 DEFAULT_PARSER_CONFIG = ParserConfig()
+DEFAULT_MEMORY_CONFIG = MemoryConfig()
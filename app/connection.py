@@ -0,0 +1,73 @@
+import asyncio
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from app.config import DEFAULT_SERVER_CONFIG
+from app.resp_parser import RequestParser
+from app.types import RESPProtocolError, RESPValue
+
+if TYPE_CHECKING:
+    from socket import socket as Socket
+
+    from app.blocking import WaitingClient
+
+
+@dataclass(eq=False)
+class ClientConnection:
+    """
+    Per-connection state kept by the server.
+
+    Bytes read from the socket go to the incremental parser until they form
+    complete commands, which are queued in pending_commands. read_size is
+    how much the next read asks for; it grows for clients streaming large
+    payloads and shrinks back once they go quiet. While the
+    client is blocked (BLPOP, XREAD BLOCK) queued commands wait their turn,
+    so pipelined requests are always answered in order. Replies collect in
+    write_buffer and are flushed once per event loop iteration; whatever the
+    socket does not accept stays queued until it becomes writable again.
+
+    A StreamingReply parks its item iterator in deferred; everything replied
+    after it queues behind it there, keeping replies in order while the
+    iterator is encoded one chunk at a time.
+
+    The selectors server talks to the raw socket; the asyncio server leaves
+    it unset and writes through transport instead.
+    """
+
+    socket: "Socket | None" = None
+    transport: asyncio.Transport | None = None
+    address: tuple | None = None
+    parser: RequestParser = field(default_factory=RequestParser)
+    read_size: int = DEFAULT_SERVER_CONFIG.recv_buffer_size
+    pending_commands: deque[RESPValue] = field(default_factory=deque)
+    write_buffer: bytearray = field(default_factory=bytearray)
+    deferred: deque[Iterator | bytes] = field(default_factory=deque)
+    deferred_bytes: int = 0
+    writing_paused: bool = False
+    waiter: "WaitingClient | None" = None
+    events: int = 0  # selectors.EVENT_* mask currently registered
+    close_after_reply: bool = False
+    close_asap: bool = False
+    closed: bool = False
+    soft_limit_reached_at: float | None = None
+
+    @property
+    def is_blocked(self) -> bool:
+        return self.waiter is not None
+
+    def parse(self) -> None:
+        """
+        Queue every command completed by the bytes received so far.
+
+        Raises:
+            RESPProtocolError: if the buffered data is malformed, once the
+                commands before the malformed data are queued
+        """
+        try:
+            commands = self.parser.parse()
+        except RESPProtocolError as e:
+            self.pending_commands.extend(e.commands)
+            raise
+        self.pending_commands.extend(commands)
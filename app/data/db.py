@@ -1,38 +1,324 @@
+import heapq
+import random
+import time
 from dataclasses import dataclass
 from typing import Any
-from datetime import datetime
 
+from app.config import DEFAULT_MEMORY_CONFIG, MemoryConfig
+from app.data.eviction import Evictor
+from app.data.keyspace import KeyLog, PrefixIndex
+from app.data.lazyfree import LazyFree
+from app.data.memory import sizeof_key
+from app.utils.clock import monotonic_ms
+from app.utils.pattern_utils import compile_glob, literal_prefix
 
-@dataclass
+# Type tags stored in RedisValue.dtype
+STRING = 0
+LIST = 1
+STREAM = 2
+TYPE_NAMES = ("string", "list", "stream")
+
+WRONGTYPE_ERROR = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+
+class WrongTypeError(TypeError):
+    """A command met a key holding another type; replied as WRONGTYPE."""
+
+    def __init__(self) -> None:
+        super().__init__(WRONGTYPE_ERROR)
+
+
+@dataclass(slots=True)
 class RedisValue:
-    dtype: str
+    dtype: int  # One of the type tags above
     data: Any
-    expiry: datetime | None = None
+    expiry: int | None = None  # monotonic_ms() deadline, set by DataBase.set
+    lru: int = 0  # Access clock or LFU counter, maintained by the Evictor
+    memory: int = 0  # Estimated bytes, kept current through DataBase.resize
 
 
 class DataBase:
-    def __init__(self):
-        self.store: dict[str, RedisValue] = {}
+    """
+    The keyspace.
 
-    def get(self, key: str) -> RedisValue | None:
-        val = self.store.get(key)
-        if val and val.expiry and val.expiry < datetime.now():
-            self.delete(key)
-            return None
+    Deadlines are integer monotonic_ms() values, so looking up a key without
+    a TTL never reads the clock. Keys with a TTL are also indexed in
+    expires and in a min-heap of (deadline, key), so expired keys can be
+    found without scanning the store. Heap entries are never removed in
+    place: an entry whose deadline no longer matches expires is stale (the
+    key was deleted or re-set) and is skipped when popped.
+
+    used_memory is an estimate of the bytes held by keys and values, also
+    broken down per type. A value is measured once when it is stored; the
+    type helpers then report every change in its size through resize(),
+    so accounting never walks a whole value. Once used_memory exceeds
+    maxmemory, evict_if_needed() makes room according to the
+    configured policy.
+
+    New keys are also appended to a KeyLog, which SCAN resumes from and
+    eviction samples from. It is cleaned up lazily like the expiry heap.
+    The first KEYS with a literal prefix builds a PrefixIndex, which is
+    kept up to date from then on.
+
+    Removed values can be handed to LazyFree instead of being freed in
+    place: always for UNLINK and FLUSHALL ASYNC, and for expiry, eviction,
+    overwrites and DEL when the matching lazyfree option is set.
+    """
+
+    # Check the clock every this many keys during an expire cycle
+    EXPIRE_CLOCK_CHECK_INTERVAL = 32
+
+    def __init__(self, config: MemoryConfig = DEFAULT_MEMORY_CONFIG):
+        self.config = config
+        self.store: dict[bytes, RedisValue] = {}
+        self.expires: dict[bytes, int] = {}
+        self._expiry_heap: list[tuple[int, bytes]] = []
+        self.expired_keys = 0  # Total keys removed because their TTL passed
+        self.used_memory = 0
+        self.peak_memory = 0
+        # Indexed by type tag
+        self.keys_by_type = [0] * len(TYPE_NAMES)
+        self.memory_by_type = [0] * len(TYPE_NAMES)
+        self.evictor = Evictor(self, config)
+        self.key_log = KeyLog()
+        self._prefix_index: PrefixIndex | None = None
+        self.lazyfree = LazyFree()
+        # Only policies that rank keys by access pay for tracking it
+        self._touch = self.evictor.touch if self.evictor.tracks_access else None
+
+    def get(self, key: bytes) -> RedisValue | None:
+        val = self._lookup(key)
+        if val is not None and self._touch is not None:
+            self._touch(val)
         return val
 
-    def set(self, key: str, value: RedisValue) -> None:
+    def set(self, key: bytes, value: RedisValue, expiry: int | None = None) -> None:
+        """
+        Store value under key, replacing any previous value and TTL.
+
+        Args:
+            expiry: monotonic_ms() deadline, or None to keep the key forever
+        """
+        old = self.store.get(key)
+        if old is not None:
+            self._untrack(old)
+        else:
+            self.key_log.append(key)
+            if self._prefix_index is not None:
+                self._prefix_index.add(key)
+        value.expiry = expiry
+        value.memory = sizeof_key(key, value.data)
+        self._track(value)
+        if self._touch is not None:
+            self.evictor.init_access(value)
         self.store[key] = value
+        # Compacted once key is in store, or its new entry would be dropped
+        if old is None and len(self.key_log) > 2 * len(self.store) + 1024:
+            self.key_log.compact(self.store)
+        if (
+            old is not None
+            and old.data is not value.data
+            and self.config.lazyfree_lazy_server_del
+        ):
+            self.lazyfree.free_data(old.data)
 
-    def exists(self, key: str) -> bool:
+        if expiry is not None:
+            self.expires[key] = expiry
+            heapq.heappush(self._expiry_heap, (expiry, key))
+            self._maybe_compact_expiry_heap()
+        elif self.expires:
+            self.expires.pop(key, None)
+
+    def exists(self, key: bytes) -> bool:
         return self.get(key) is not None
 
-    def delete(self, key: str) -> bool:
-        if key in self.store:
-            del self.store[key]
-            return True
-        return False
+    def delete(self, key: bytes, lazy: bool = False) -> bool:
+        """
+        Remove key.
+
+        Args:
+            lazy: free a large value on the lazyfree thread rather than here
+        """
+        val = self.store.pop(key, None)
+        if val is None:
+            return False
+        self._untrack(val)
+        self.expires.pop(key, None)
+        if self._prefix_index is not None:
+            self._prefix_index.discard(key)
+        if lazy:
+            self.lazyfree.free_data(val.data)
+        return True
 
-    def get_type(self, key: str) -> str | None:
+    def flush(self, lazy: bool = False) -> None:
+        """
+        Remove every key.
+
+        Args:
+            lazy: free the old keyspace on the lazyfree thread rather than here
+        """
+        store = self.store
+        self.store = {}
+        self.expires = {}
+        self._expiry_heap = []
+        self.key_log = KeyLog()
+        self._prefix_index = None
+        self.used_memory = 0
+        self.keys_by_type = [0] * len(TYPE_NAMES)
+        self.memory_by_type = [0] * len(TYPE_NAMES)
+        if lazy:
+            self.lazyfree.free_store(store)
+
+    def resize(self, value: RedisValue, delta: int) -> None:
+        """Account for value's data growing (or shrinking) by delta bytes."""
+        value.memory += delta
+        self.memory_by_type[value.dtype] += delta
+        self.used_memory += delta
+        self.peak_memory = max(self.peak_memory, self.used_memory)
+
+    def get_type(self, key: bytes) -> str | None:
         val = self.get(key)
-        return val.dtype if val else None
+        return TYPE_NAMES[val.dtype] if val else None
+
+    def scan(
+        self,
+        cursor: int,
+        count: int = 10,
+        match: bytes | None = None,
+        type_name: str | None = None,
+    ) -> tuple[int, list[bytes]]:
+        """
+        One SCAN step: look at count entries of the key log from cursor.
+
+        Returns:
+            (next_cursor, keys) - next_cursor is 0 when the scan is complete
+        """
+        next_cursor, candidates = self.key_log.scan(cursor, count)
+        regex = compile_glob(match) if match is not None else None
+        keys = []
+        for key in candidates:
+            if regex is not None and regex.fullmatch(key) is None:
+                continue
+            val = self._lookup(key)
+            if val is None:
+                continue
+            if type_name is not None and TYPE_NAMES[val.dtype] != type_name:
+                continue
+            keys.append(key)
+        return next_cursor, keys
+
+    def keys(self, pattern: bytes) -> list[bytes]:
+        """Every key matching the glob pattern."""
+        regex = compile_glob(pattern)
+        prefix = literal_prefix(pattern)
+        if prefix:
+            if self._prefix_index is None:
+                self._prefix_index = PrefixIndex(self.store)
+            candidates = list(self._prefix_index.candidates(prefix))
+        else:
+            candidates = list(self.store)
+        return [
+            key
+            for key in candidates
+            if regex.fullmatch(key) is not None and self._lookup(key) is not None
+        ]
+
+    def random_key(self) -> bytes | None:
+        """Pick a key at random, or None if the keyspace is empty."""
+        while self.store:
+            key = self.key_log.random()
+            if key in self.store:
+                return key
+        return None
+
+    def random_volatile_key(self) -> bytes | None:
+        """Pick a random key with a TTL, or None if there is none."""
+        heap = self._expiry_heap
+        for _ in range(len(heap)):
+            expiry, key = heap[random.randrange(len(heap))]
+            if self.expires.get(key) == expiry:
+                return key
+        return None
+
+    def soonest_expiring_key(self) -> bytes | None:
+        """The key with the nearest deadline, or None if no key has a TTL."""
+        heap = self._expiry_heap
+        while heap:
+            expiry, key = heap[0]
+            if self.expires.get(key) == expiry:
+                return key
+            heapq.heappop(heap)
+        return None
+
+    def evict_if_needed(self) -> bool:
+        """
+        Evict keys until used_memory is within maxmemory.
+
+        Returns:
+            False if memory is still over the limit, because the policy is
+            noeviction or no key qualifies for eviction
+        """
+        return self.evictor.evict_if_needed()
+
+    def active_expire_cycle(self, time_budget: float) -> bool:
+        """
+        Delete keys whose TTL has passed, soonest deadline first.
+
+        Stops once time_budget seconds have been spent, so a burst of
+        expirations is spread over several cycles instead of stalling the
+        event loop.
+
+        Args:
+            time_budget: seconds this cycle may run for
+
+        Returns:
+            True if expired keys are left over for the next cycle
+        """
+        heap = self._expiry_heap
+        now = monotonic_ms()
+        stop_at = time.monotonic() + time_budget
+        popped = 0
+
+        while heap and heap[0][0] < now:
+            expiry, key = heapq.heappop(heap)
+            if self.expires.get(key) == expiry:
+                self.delete(key, lazy=self.config.lazyfree_lazy_expire)
+                self.expired_keys += 1
+
+            popped += 1
+            if (
+                popped % self.EXPIRE_CLOCK_CHECK_INTERVAL == 0
+                and time.monotonic() >= stop_at
+            ):
+                return bool(heap) and heap[0][0] < now
+
+        return False
+
+    def _lookup(self, key: bytes) -> RedisValue | None:
+        """Get a value without counting it as an access."""
+        val = self.store.get(key)
+        if val is None:
+            return None
+        if val.expiry is not None and val.expiry < monotonic_ms():
+            self.delete(key, lazy=self.config.lazyfree_lazy_expire)
+            self.expired_keys += 1
+            return None
+        return val
+
+    def _track(self, value: RedisValue) -> None:
+        self.keys_by_type[value.dtype] += 1
+        self.memory_by_type[value.dtype] += value.memory
+        self.used_memory += value.memory
+        self.peak_memory = max(self.peak_memory, self.used_memory)
+
+    def _untrack(self, value: RedisValue) -> None:
+        self.keys_by_type[value.dtype] -= 1
+        self.memory_by_type[value.dtype] -= value.memory
+        self.used_memory -= value.memory
+
+    def _maybe_compact_expiry_heap(self) -> None:
+        """Rebuild the heap once stale entries outnumber live ones."""
+        heap = self._expiry_heap
+        if len(heap) > 2 * len(self.expires) + 1024:
+            self._expiry_heap = [(expiry, key) for key, expiry in self.expires.items()]
+            heapq.heapify(self._expiry_heap)
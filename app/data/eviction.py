@@ -0,0 +1,158 @@
+"""
+maxmemory eviction, after Redis's approximate LRU/LFU.
+
+Ranking every key exactly would need a global ordered structure updated on
+each read. Instead each value carries a cheap access stamp in its lru slot,
+and every eviction round samples a few keys, keeps the best candidates seen
+so far in a small pool sorted by score, and evicts the highest scored one.
+The pool persists across rounds, so good candidates found earlier are not
+forgotten and the result comes close to true LRU/LFU with tiny samples.
+"""
+
+import bisect
+import random
+from typing import TYPE_CHECKING
+
+from app.config import MAXMEMORY_POLICIES, MemoryConfig
+from app.utils.clock import monotonic_ms
+
+if TYPE_CHECKING:
+    from app.data.db import DataBase, RedisValue
+
+# LFU values pack the last decrement time (minutes, 16 bits) above an 8-bit
+# logarithmic access counter. New keys start above zero so they get a chance
+# to collect hits before being evicted.
+LFU_INIT_VAL = 5
+LFU_COUNTER_MAX = 255
+LFU_MINUTES_MASK = 0xFFFF
+
+
+class Evictor:
+    """Tracks key access and picks keys to evict for one DataBase."""
+
+    def __init__(self, database: "DataBase", config: MemoryConfig):
+        if config.maxmemory_policy not in MAXMEMORY_POLICIES:
+            raise ValueError(f"Unknown maxmemory policy {config.maxmemory_policy!r}")
+        self._db = database
+        self._config = config
+        policy = config.maxmemory_policy
+        self.policy = policy
+        self.lfu = policy.endswith("-lfu")
+        self.tracks_access = policy.endswith(("-lru", "-lfu"))
+        self.samples_all_keys = policy.startswith("allkeys-")
+        self.evicted_keys = 0
+        # (score, key) pairs, ascending; the best candidate is last
+        self._pool: list[tuple[int, bytes]] = []
+        self._clock = 0  # Last access stamp handed out, shared by every value
+
+    # Access tracking
+
+    def init_access(self, value: "RedisValue") -> None:
+        """Stamp a newly stored value."""
+        if self.lfu:
+            value.lru = (self._minutes() << 8) | LFU_INIT_VAL
+        else:
+            value.lru = self._lru_clock()
+
+    def touch(self, value: "RedisValue") -> None:
+        """Record a read or write of value."""
+        if not self.lfu:
+            value.lru = self._lru_clock()
+            return
+
+        counter = self._decayed_counter(value.lru)
+        if counter < LFU_COUNTER_MAX:
+            # Logarithmic increment: each step is less likely than the last
+            base = max(counter - LFU_INIT_VAL, 0)
+            if random.random() < 1.0 / (base * self._config.lfu_log_factor + 1):
+                counter += 1
+        value.lru = (self._minutes() << 8) | counter
+
+    def _lru_clock(self) -> int:
+        now = monotonic_ms()
+        if now != self._clock:
+            self._clock = now
+        # Reusing one int object per millisecond keeps stamps from costing
+        # an int per key
+        return self._clock
+
+    def _minutes(self) -> int:
+        return (monotonic_ms() // 60_000) & LFU_MINUTES_MASK
+
+    def _decayed_counter(self, lru: int) -> int:
+        """The LFU counter of lru after decaying it for the time since."""
+        counter = lru & 0xFF
+        decay_time = self._config.lfu_decay_time
+        if decay_time:
+            elapsed = (self._minutes() - (lru >> 8)) & LFU_MINUTES_MASK
+            counter = max(counter - elapsed // decay_time, 0)
+        return counter
+
+    # Eviction
+
+    def evict_if_needed(self) -> bool:
+        """
+        Evict keys until used_memory is within maxmemory.
+
+        Returns:
+            False if memory is still over the limit
+        """
+        maxmemory = self._config.maxmemory
+        db = self._db
+        if not maxmemory or db.used_memory <= maxmemory:
+            return True
+        if self.policy == "noeviction":
+            return False
+
+        while db.used_memory > maxmemory:
+            key = self._pick_victim()
+            if key is None:
+                return False
+            db.delete(key, lazy=self._config.lazyfree_lazy_eviction)
+            self.evicted_keys += 1
+        return True
+
+    def _pick_victim(self) -> bytes | None:
+        db = self._db
+        if self.policy == "volatile-ttl":
+            # The expiry heap already knows the exact answer
+            return db.soonest_expiring_key()
+        if self.policy == "allkeys-random":
+            return db.random_key()
+        if self.policy == "volatile-random":
+            return db.random_volatile_key()
+
+        self._populate_pool()
+        pool = self._pool
+        while pool:
+            _, key = pool.pop()
+            # Candidates may have been deleted, or lost their TTL, since
+            if key in db.store and (self.samples_all_keys or key in db.expires):
+                return key
+        return None
+
+    def _populate_pool(self) -> None:
+        """Sample keys and merge the best of them into the pool."""
+        db = self._db
+        pick = db.random_key if self.samples_all_keys else db.random_volatile_key
+        pool = self._pool
+        size = self._config.eviction_pool_size
+        pooled = {key for _, key in pool}
+        now = self._lru_clock()
+
+        for _ in range(self._config.maxmemory_samples):
+            key = pick()
+            if key is None:
+                return
+            if key in pooled:
+                continue
+            lru = db.store[key].lru
+            if self.lfu:
+                score = LFU_COUNTER_MAX - self._decayed_counter(lru)
+            else:
+                score = now - lru  # Idle time
+            if len(pool) < size or score > pool[0][0]:
+                bisect.insort(pool, (score, key))
+                pooled.add(key)
+                if len(pool) > size:
+                    pooled.discard(pool.pop(0)[1])
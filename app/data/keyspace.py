@@ -0,0 +1,106 @@
+"""
+Indexes over the keyspace for iteration and pattern lookups.
+
+A dict can neither be resumed from a position nor sampled at random, so
+DataBase keeps these alongside its store.
+"""
+
+import random
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+
+# KEYS candidates are bucketed by this many leading bytes
+PREFIX_INDEX_LENGTH = 4
+
+
+class KeyLog:
+    """
+    Every key in insertion order, each tagged with an increasing sequence
+    number.
+
+    Deleting a key leaves its entry behind, so nothing shifts and a
+    sequence number stays a valid place to resume from however the
+    keyspace changes. That makes it a SCAN cursor. A key that is present
+    for the whole scan is returned exactly once, as it keeps its entry and
+    sequence number. Keys deleted and added again get a second entry, so
+    they may show up twice, which SCAN allows. compact() drops stale
+    entries but keeps the sequence numbers of the live ones, so cursors
+    stay valid across it.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list[bytes] = []
+        self._seqs = array("Q")  # Ascending
+        self._next_seq = 1  # Cursor 0 means "start", as in Redis
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def append(self, key: bytes) -> None:
+        self._keys.append(key)
+        self._seqs.append(self._next_seq)
+        self._next_seq += 1
+
+    def random(self) -> bytes:
+        """A random entry, possibly stale. The log must not be empty."""
+        return self._keys[random.randrange(len(self._keys))]
+
+    def scan(self, cursor: int, count: int) -> tuple[int, list[bytes]]:
+        """
+        Return up to count entries starting at cursor, which may be stale.
+
+        Returns:
+            (next_cursor, keys) - next_cursor is 0 once the end is reached
+        """
+        start = bisect_left(self._seqs, cursor)
+        end = start + count
+        next_cursor = self._seqs[end] if end < len(self._seqs) else 0
+        return next_cursor, self._keys[start:end]
+
+    def compact(self, live: dict) -> None:
+        """Drop entries whose key is not in live, and all but the last of duplicates."""
+        keys = self._keys
+        seen: set[bytes] = set()
+        kept: list[int] = []
+        for i in range(len(keys) - 1, -1, -1):
+            key = keys[i]
+            if key in live and key not in seen:
+                seen.add(key)
+                kept.append(i)
+        kept.reverse()
+        self._keys = [keys[i] for i in kept]
+        self._seqs = array("Q", (self._seqs[i] for i in kept))
+
+
+class PrefixIndex:
+    """Keys bucketed by their first PREFIX_INDEX_LENGTH bytes."""
+
+    def __init__(self, keys: Iterable[bytes]) -> None:
+        self._buckets: dict[bytes, set[bytes]] = {}
+        for key in keys:
+            self.add(key)
+
+    def add(self, key: bytes) -> None:
+        prefix = key[:PREFIX_INDEX_LENGTH]
+        bucket = self._buckets.get(prefix)
+        if bucket is None:
+            bucket = self._buckets[prefix] = set()
+        bucket.add(key)
+
+    def discard(self, key: bytes) -> None:
+        prefix = key[:PREFIX_INDEX_LENGTH]
+        bucket = self._buckets.get(prefix)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[prefix]
+
+    def candidates(self, prefix: bytes) -> Iterator[bytes]:
+        """Keys that may start with prefix (a superset, to filter further)."""
+        if len(prefix) >= PREFIX_INDEX_LENGTH:
+            yield from self._buckets.get(prefix[:PREFIX_INDEX_LENGTH], ())
+            return
+        for bucket_prefix, bucket in self._buckets.items():
+            if bucket_prefix.startswith(prefix):
+                yield from bucket
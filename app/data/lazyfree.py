@@ -0,0 +1,112 @@
+"""
+Background freeing of large values.
+
+Dropping the last reference to a 5M-element list frees every element in one
+go, and the event loop stalls until it is done. Values detached from the
+keyspace by UNLINK, FLUSHALL ASYNC or the lazyfree-lazy-* options are
+handed to a worker thread instead. The worker drops them a chunk at a time
+and yields the GIL between chunks, so the event loop keeps running while
+memory is released.
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from app.data.quicklist import QuickList
+from app.data.stream.stream import Stream
+from app.logger import get_logger
+
+if TYPE_CHECKING:
+    from app.data.db import RedisValue
+
+logger = get_logger(__name__)
+
+# Values with no more elements than this are cheaper to free inline than to
+# hand over to the worker
+LAZYFREE_THRESHOLD = 64
+# Elements released between yields of the GIL
+FREE_CHUNK = 1024
+
+
+def free_effort(data: Any) -> int:
+    """Roughly how many objects freeing data releases."""
+    if isinstance(data, (list, dict, QuickList, Stream)):
+        return len(data)
+    return 1
+
+
+def release_data(data: Any) -> None:
+    """Drop the contents of a value a chunk at a time."""
+    if isinstance(data, QuickList):
+        chunks = data.detach()
+        while chunks:
+            freed = 0
+            while chunks and freed < FREE_CHUNK:
+                freed += len(chunks.pop())
+            time.sleep(0)
+        return
+    if isinstance(data, Stream):
+        data = data.detach()
+    if isinstance(data, list):
+        while data:
+            del data[-FREE_CHUNK:]
+            time.sleep(0)  # Let the event loop have the GIL
+
+
+def release_store(store: "dict[bytes, RedisValue]") -> None:
+    """Drop a whole detached keyspace, big values included."""
+    while store:
+        for _ in range(min(FREE_CHUNK, len(store))):
+            _, value = store.popitem()
+            if free_effort(value.data) > LAZYFREE_THRESHOLD:
+                release_data(value.data)
+        time.sleep(0)
+
+
+class LazyFree:
+    """Queue of detached objects and the worker thread that frees them."""
+
+    def __init__(self) -> None:
+        self._jobs: queue.SimpleQueue[tuple[Callable[[Any], None], Any]] = (
+            queue.SimpleQueue()
+        )
+        self._thread: threading.Thread | None = None
+        self._submitted = 0
+        self.freed_objects = 0
+
+    @property
+    def pending_objects(self) -> int:
+        """Objects handed over and not yet fully freed."""
+        return self._submitted - self.freed_objects
+
+    def free_data(self, data: Any) -> None:
+        """Free a value's data, in the background if it is large."""
+        if free_effort(data) > LAZYFREE_THRESHOLD:
+            self._submit(release_data, data)
+
+    def free_store(self, store: "dict[bytes, RedisValue]") -> None:
+        """Free a detached keyspace in the background."""
+        if store:
+            self._submit(release_store, store)
+
+    def _submit(self, release: Callable[[Any], None], obj: Any) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="lazyfree", daemon=True
+            )
+            self._thread.start()
+        self._submitted += 1
+        self._jobs.put((release, obj))
+
+    def _run(self) -> None:
+        while True:
+            release, obj = self._jobs.get()
+            try:
+                release(obj)
+            except Exception:
+                logger.exception("Lazy free failed")
+            del obj
+            self.freed_objects += 1
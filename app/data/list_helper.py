@@ -1,69 +1,195 @@
-from app.data.db import DataBase, RedisValue
+from app.data.db import LIST, DataBase, RedisValue, WrongTypeError
+from app.data.memory import sizeof_list_items
+from app.data.quicklist import QuickList
+from app.types import RESPError
+
+
+def normalize_range(start: int, stop: int, length: int) -> tuple[int, int]:
+    """
+    Turn an inclusive LRANGE-style range, where negative indexes count from
+    the end, into a slice (start, stop) with 0 <= start and stop <= length.
+    """
+    if start < 0:
+        start = max(start + length, 0)
+    if stop < 0:
+        stop += length
+    return start, min(stop + 1, length)
 
 
 class ListOps:
+    """
+    List commands on top of QuickList.
+
+    A list that becomes empty is deleted, as in Redis.
+    """
+
     def __init__(self, database: DataBase):
         self._db = database
 
-    def lpush(self, key: str, values: list) -> int:
+    def lpush(self, key: bytes, values: list) -> int:
         """Prepend values to list and return new length"""
         redis_val = self._get_or_create_list(key)
-        redis_val.data = values[::-1] + redis_val.data
+        redis_val.data.extendleft(values)
+        self._db.resize(redis_val, sizeof_list_items(values))
         return len(redis_val.data)
 
-    def rpush(self, key: str, values: list) -> int:
+    def rpush(self, key: bytes, values: list) -> int:
         """Append values to list and return new length"""
         redis_val = self._get_or_create_list(key)
         redis_val.data.extend(values)
+        self._db.resize(redis_val, sizeof_list_items(values))
         return len(redis_val.data)
 
-    def lpop(self, key: str, count: int = 1) -> str | list | None:
-        redis_val = self._get_list(key)
-        if redis_val is None or not redis_val.data:
-            return None
-        if count == 1:
-            return redis_val.data.pop(0)
-        result = redis_val.data[:count]
-        del redis_val.data[:count]
-        return result
+    def lpop(self, key: bytes, count: int = 1) -> bytes | list | None:
+        return self._pop(key, count, left=True)
+
+    def rpop(self, key: bytes, count: int = 1) -> bytes | list | None:
+        return self._pop(key, count, left=False)
 
-    def lrange(self, key: str, start: int, stop: int) -> list[str]:
+    def lrange(self, key: bytes, start: int, stop: int) -> list[bytes]:
         redis_val = self._get_list(key)
         if redis_val is None:
             return []
+        return redis_val.data.slice(*normalize_range(start, stop, len(redis_val.data)))
+
+    def llen(self, key: bytes) -> int:
+        redis_val = self._get_list(key)
+        return len(redis_val.data) if redis_val is not None else 0
 
-        # Negative indexes
+    def has_data(self, key: bytes) -> bool:
+        redis_val = self._get_list(key)
+        return redis_val is not None and len(redis_val.data) > 0
+
+    def lindex(self, key: bytes, index: int) -> bytes | None:
+        redis_val = self._get_list(key)
+        if redis_val is None:
+            return None
+        try:
+            return redis_val.data[index]
+        except IndexError:
+            return None
+
+    def lset(self, key: bytes, index: int, value: bytes) -> RESPError | None:
+        """Replace the element at index. Returns an error if there is none."""
+        redis_val = self._get_list(key)
+        if redis_val is None:
+            return RESPError("ERR no such key")
         data = redis_val.data
-        if start < 0:
-            start = max(0, start + len(data))
-        if stop < 0:
-            stop = max(0, stop + len(data))
+        try:
+            old = data[index]
+        except IndexError:
+            return RESPError("ERR index out of range")
+        data[index] = value
+        self._db.resize(
+            redis_val, sizeof_list_items([value]) - sizeof_list_items([old])
+        )
+        return None
 
-        return data[start : stop + 1]
+    def linsert(self, key: bytes, pivot: bytes, value: bytes, before: bool) -> int:
+        """
+        Insert value next to the first element equal to pivot.
 
-    def llen(self, key: str) -> int:
+        Returns:
+            The new length, -1 if pivot was not found, or 0 if key is missing
+        """
         redis_val = self._get_list(key)
-        return len(redis_val.data) if redis_val is not None else 0
+        if redis_val is None:
+            return 0
+        data = redis_val.data
+        index = data.index(pivot)
+        if index < 0:
+            return -1
+        data.insert(index if before else index + 1, value)
+        self._db.resize(redis_val, sizeof_list_items([value]))
+        return len(data)
 
-    def has_data(self, key: str) -> bool:
+    def ltrim(self, key: bytes, start: int, stop: int) -> None:
         redis_val = self._get_list(key)
-        return redis_val is not None and len(redis_val.data) > 0
+        if redis_val is None:
+            return
+        data = redis_val.data
+        dropped = data.trim(*normalize_range(start, stop, len(data)))
+        self._shrunk(key, redis_val, sizeof_list_items(dropped))
+
+    def lrem(self, key: bytes, count: int, value: bytes) -> int:
+        """Remove up to count elements equal to value (see QuickList.remove)."""
+        redis_val = self._get_list(key)
+        if redis_val is None:
+            return 0
+        removed = redis_val.data.remove(value, count)
+        if removed:
+            self._shrunk(key, redis_val, removed * sizeof_list_items([value]))
+        return removed
+
+    def mpop(self, keys: list[bytes], count: int, left: bool) -> list | None:
+        """
+        Pop up to count elements from the first non-empty list among keys.
+
+        Returns:
+            [key, elements], or None if every list is empty
+        """
+        for key in keys:
+            redis_val = self._get_list(key)
+            if redis_val is not None and redis_val.data:
+                return [key, self._take(key, redis_val, count, left)]
+        return None
+
+    def lmove(
+        self, source: bytes, destination: bytes, from_left: bool, to_left: bool
+    ) -> bytes | None:
+        """Pop an element from source and push it onto destination."""
+        redis_val = self._get_list(source)
+        if redis_val is None or not redis_val.data:
+            return None
+        # Check the destination's type before anything is popped
+        self._get_list(destination)
+
+        value = self._pop(source, 1, left=from_left)
+        if to_left:
+            self.lpush(destination, [value])
+        else:
+            self.rpush(destination, [value])
+        return value
 
     # Private methods
+    def _pop(self, key: bytes, count: int, left: bool) -> bytes | list | None:
+        redis_val = self._get_list(key)
+        if redis_val is None or not redis_val.data:
+            return None
+        popped = self._take(key, redis_val, count, left)
+        if count == 1:
+            return popped[0]
+        return popped
+
+    def _take(
+        self, key: bytes, redis_val: RedisValue, count: int, left: bool
+    ) -> list[bytes]:
+        data = redis_val.data
+        popped = data.popleft(count) if left else data.pop(count)
+        self._shrunk(key, redis_val, sizeof_list_items(popped))
+        return popped
+
+    def _shrunk(self, key: bytes, redis_val: RedisValue, freed: int) -> None:
+        """Account for elements removed from a list, deleting it once empty."""
+        if not redis_val.data:
+            self._db.delete(key)
+        else:
+            self._db.resize(redis_val, -freed)
+
     def _get_or_create_list(self, key):
         val = self._db.get(key)
         if val is None:
-            val = RedisValue(dtype="list", data=[])
+            val = RedisValue(dtype=LIST, data=QuickList())
             self._db.set(key, val)
             return val
-        if val.dtype != "list":
-            raise TypeError(f"WRONGTYPE {key} is not a list")
+        if val.dtype != LIST:
+            raise WrongTypeError()
         return val
 
-    def _get_list(self, key: str) -> RedisValue | None:
+    def _get_list(self, key: bytes) -> RedisValue | None:
         val = self._db.get(key)
         if val is None:
             return None
-        if val.dtype != "list":
-            raise TypeError(f"WRONGTYPE {key} is not a list")
+        if val.dtype != LIST:
+            raise WrongTypeError()
         return val
@@ -0,0 +1,58 @@
+"""
+Memory estimates for keys and values.
+
+sys.getsizeof only sees the outermost object, so containers are measured as
+the container plus their elements. These are estimates: allocator overhead,
+over-allocated list slots and objects shared between keys are not exact.
+Only whole values are measured from scratch; after that the type helpers
+report the size of what they add or remove, keeping accounting O(1) per
+write.
+"""
+
+import sys
+from itertools import islice
+from typing import Any
+
+from app.data.quicklist import QuickList
+from app.data.stream.stream import Stream
+
+# Cost of a key besides its bytes and data: the store's hash table entry
+# plus the RedisValue object itself
+KEY_OVERHEAD = 120
+# A list element costs its object plus one pointer in the list's array
+LIST_SLOT = 8
+EMPTY_LIST = sys.getsizeof([])
+
+
+def sizeof_list_items(items: list[bytes]) -> int:
+    return sum(map(sys.getsizeof, items)) + LIST_SLOT * len(items)
+
+
+def sizeof_value(data: Any, samples: int = 0) -> int:
+    """
+    Estimate the bytes held by a value's data.
+
+    Args:
+        samples: measure this many elements of a list and extrapolate to
+            the rest; 0 measures every element. Streams are always measured
+            whole, which only looks at their packed nodes.
+    """
+    if isinstance(data, (list, QuickList)):
+        return EMPTY_LIST + _extrapolate(sizeof_list_items, data, len(data), samples)
+    if isinstance(data, Stream):
+        return data.memory_usage()
+    return sys.getsizeof(data)
+
+
+def sizeof_key(key: bytes, data: Any, samples: int = 0) -> int:
+    """Estimate everything a key costs: overhead, key bytes and data."""
+    return KEY_OVERHEAD + sys.getsizeof(key) + sizeof_value(data, samples)
+
+
+def _extrapolate(measure, elements, count: int, samples: int) -> int:
+    if not count:
+        return 0
+    if not samples or samples >= count:
+        return measure(list(elements))
+    sampled = list(islice(elements, samples))
+    return measure(sampled) * count // len(sampled)
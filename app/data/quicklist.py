@@ -0,0 +1,266 @@
+"""
+The list type's storage, after Redis's quicklist.
+
+A plain Python list is O(n) at its head: inserting or deleting element 0
+shifts every other element. A QuickList is a deque of small chunks instead.
+Pushes and pops at either end touch only the first or last chunk, so they
+cost the same at 10 elements or 10M. Indexed access walks chunks rather than
+elements, from whichever end is nearer.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import chain
+
+# Elements per chunk. Middle inserts may grow a chunk up to twice this
+# before it is split.
+CHUNK_SIZE = 512
+
+
+class QuickList:
+    """A sequence of bytes with O(1) operations at both ends."""
+
+    __slots__ = ("_chunks", "_len")
+
+    def __init__(self, items: Iterable[bytes] = ()):
+        self._chunks: deque[list[bytes]] = deque()
+        self._len = 0
+        self.extend(list(items))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[bytes]:
+        return chain.from_iterable(self._chunks)
+
+    def __getitem__(self, index: int) -> bytes:
+        chunk, offset = self._locate(index)[1:]
+        return chunk[offset]
+
+    def __setitem__(self, index: int, item: bytes) -> None:
+        chunk, offset = self._locate(index)[1:]
+        chunk[offset] = item
+
+    # Ends
+
+    def append(self, item: bytes) -> None:
+        chunks = self._chunks
+        if chunks and len(chunks[-1]) < CHUNK_SIZE:
+            chunks[-1].append(item)
+        else:
+            chunks.append([item])
+        self._len += 1
+
+    def appendleft(self, item: bytes) -> None:
+        chunks = self._chunks
+        if chunks and len(chunks[0]) < CHUNK_SIZE:
+            chunks[0].insert(0, item)
+        else:
+            chunks.appendleft([item])
+        self._len += 1
+
+    def extend(self, items: list[bytes]) -> None:
+        """Append items in order."""
+        chunks = self._chunks
+        pos = 0
+        if chunks and len(chunks[-1]) < CHUNK_SIZE:
+            pos = CHUNK_SIZE - len(chunks[-1])
+            chunks[-1].extend(items[:pos])
+        for start in range(pos, len(items), CHUNK_SIZE):
+            chunks.append(items[start : start + CHUNK_SIZE])
+        self._len += len(items)
+
+    def extendleft(self, items: list[bytes]) -> None:
+        """Prepend items one by one, so the last of them ends up first."""
+        chunks = self._chunks
+        reverse = items[::-1]
+        end = len(reverse)
+        if chunks and len(chunks[0]) < CHUNK_SIZE:
+            room = min(CHUNK_SIZE - len(chunks[0]), end)
+            chunks[0][0:0] = reverse[end - room :]
+            end -= room
+        while end > 0:
+            start = max(end - CHUNK_SIZE, 0)
+            chunks.appendleft(reverse[start:end])
+            end = start
+        self._len += len(items)
+
+    def popleft(self, count: int = 1) -> list[bytes]:
+        """Remove and return up to count elements from the head."""
+        chunks = self._chunks
+        popped: list[bytes] = []
+        while count > 0 and chunks:
+            head = chunks[0]
+            if len(head) <= count:
+                chunks.popleft()
+                popped.extend(head)
+                count -= len(head)
+            else:
+                popped.extend(head[:count])
+                del head[:count]
+                count = 0
+        self._len -= len(popped)
+        return popped
+
+    def pop(self, count: int = 1) -> list[bytes]:
+        """Remove and return up to count elements from the tail, last first."""
+        chunks = self._chunks
+        popped: list[bytes] = []
+        while count > 0 and chunks:
+            tail = chunks[-1]
+            if len(tail) <= count:
+                chunks.pop()
+                count -= len(tail)
+            else:
+                part = tail[-count:]
+                del tail[-count:]
+                tail = part
+                count = 0
+            tail.reverse()
+            popped.extend(tail)
+        self._len -= len(popped)
+        return popped
+
+    # Middle
+
+    def slice(self, start: int, stop: int) -> list[bytes]:
+        """Elements start to stop (exclusive), for 0 <= start and stop <= len."""
+        if start >= stop:
+            return []
+        if start <= self._len - stop:
+            # Nearer the head
+            result: list[bytes] = []
+            for chunk in self._chunks:
+                size = len(chunk)
+                if start < size:
+                    result.extend(chunk[start:stop])
+                    if stop <= size:
+                        break
+                    start = 0
+                else:
+                    start -= size
+                stop -= size
+            return result
+
+        # Nearer the tail: the same walk with positions counted from the end
+        from_end, to_end = self._len - stop, self._len - start
+        parts: list[list[bytes]] = []
+        for chunk in reversed(self._chunks):
+            size = len(chunk)
+            if from_end < size:
+                parts.append(chunk[max(size - to_end, 0) : size - from_end])
+                if to_end <= size:
+                    break
+                from_end = 0
+            else:
+                from_end -= size
+            to_end -= size
+        parts.reverse()
+        return list(chain.from_iterable(parts))
+
+    def index(self, item: bytes) -> int:
+        """Position of the first element equal to item, or -1."""
+        position = 0
+        for chunk in self._chunks:
+            if item in chunk:
+                return position + chunk.index(item)
+            position += len(chunk)
+        return -1
+
+    def insert(self, index: int, item: bytes) -> None:
+        """Insert item before position index, like list.insert."""
+        if index <= 0:
+            self.appendleft(item)
+            return
+        if index >= self._len:
+            self.append(item)
+            return
+        i, chunk, offset = self._locate(index)
+        chunk.insert(offset, item)
+        self._len += 1
+        if len(chunk) > 2 * CHUNK_SIZE:
+            self._chunks.insert(i + 1, chunk[CHUNK_SIZE:])
+            del chunk[CHUNK_SIZE:]
+
+    def remove(self, item: bytes, count: int = 0) -> int:
+        """
+        Remove elements equal to item.
+
+        Args:
+            count: remove at most this many, scanning from the head if
+                positive or from the tail if negative; 0 removes them all
+
+        Returns:
+            Number of elements removed
+        """
+        limit = abs(count) or self._len
+        from_tail = count < 0
+        removed = 0
+        kept_chunks: list[list[bytes]] = []
+        for chunk in reversed(self._chunks) if from_tail else self._chunks:
+            if removed < limit and item in chunk:
+                kept: list[bytes] = []
+                for element in reversed(chunk) if from_tail else chunk:
+                    if removed < limit and element == item:
+                        removed += 1
+                    else:
+                        kept.append(element)
+                if from_tail:
+                    kept.reverse()
+                chunk = kept
+            if chunk:
+                kept_chunks.append(chunk)
+        if removed:
+            if from_tail:
+                kept_chunks.reverse()
+            self._chunks = deque(kept_chunks)
+            self._len -= removed
+        return removed
+
+    def trim(self, start: int, stop: int) -> list[bytes]:
+        """
+        Keep only elements start to stop (exclusive).
+
+        Returns:
+            The elements dropped
+        """
+        stop = min(stop, self._len)
+        if start >= stop:
+            return self.popleft(self._len)
+        return self.pop(self._len - stop) + self.popleft(start)
+
+    def detach(self) -> deque[list[bytes]]:
+        """Empty the list, handing its chunks to the caller."""
+        chunks, self._chunks = self._chunks, deque()
+        self._len = 0
+        return chunks
+
+    def _locate(self, index: int) -> tuple[int, list[bytes], int]:
+        """
+        Find the element at index (negative counts from the end).
+
+        Returns:
+            (chunk position, chunk, offset within the chunk)
+
+        Raises:
+            IndexError: if index is out of range
+        """
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("QuickList index out of range")
+
+        chunks = self._chunks
+        if index < self._len // 2:
+            for i, chunk in enumerate(chunks):
+                if index < len(chunk):
+                    return i, chunk, index
+                index -= len(chunk)
+        else:
+            index = self._len - 1 - index  # Position counted from the tail
+            last = len(chunks) - 1
+            for i, chunk in enumerate(reversed(chunks)):
+                if index < len(chunk):
+                    return last - i, chunk, len(chunk) - 1 - index
+                index -= len(chunk)
+        raise AssertionError("QuickList length out of sync with its chunks")
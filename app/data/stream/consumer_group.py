@@ -0,0 +1,158 @@
+"""
+Consumer groups, after Redis's stream cgroups.
+
+A group remembers the last ID it delivered, so each new entry goes to one
+consumer only, and keeps every delivered entry in its pending entries list
+(PEL) until a consumer acknowledges it. The PEL is indexed both by entry ID,
+group-wide, and per consumer, and records when each entry was last
+delivered so that entries idle for too long can be claimed by another
+consumer. IDs are packed ints (StreamID.to_int), like the stream's own.
+"""
+
+import sys
+from bisect import bisect_left
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from app.data.stream.stream_id import StreamID
+
+# Estimated bytes per pending entry: the PendingEntry, its packed ID and its
+# slots in the group's and the consumer's dicts and in the sorted index
+PENDING_ENTRY_BYTES = 64 + 36 + 2 * 40 + 8
+# Estimated bytes per consumer besides its name
+CONSUMER_BYTES = 64 + 64 + 40
+GROUP_BYTES = 64 + 3 * 64 + 56
+
+# Acknowledged IDs are left in the sorted index and skipped; it is rebuilt
+# once there are at least this many, and more than there are live ones
+COMPACT_THRESHOLD = 1024
+
+
+@dataclass(slots=True, eq=False)
+class Consumer:
+    name: bytes
+    # The entries delivered to it and not acknowledged yet, by packed ID
+    pending: dict[int, "PendingEntry"] = field(default_factory=dict)
+
+
+@dataclass(slots=True, eq=False)
+class PendingEntry:
+    consumer: Consumer
+    delivery_time: int  # unix_ms() of the last delivery
+    delivery_count: int
+
+
+class ConsumerGroup:
+    """A stream's consumer group: its consumers and pending entries."""
+
+    def __init__(self, last_id: StreamID):
+        self.last_id = last_id  # Entries after it have not been delivered
+        self.consumers: dict[bytes, Consumer] = {}
+        self.pending: dict[int, PendingEntry] = {}
+        # Packed IDs of the pending entries in ascending order, plus
+        # acknowledged ones not swept out yet. Entries are mostly delivered
+        # in ID order, so this is mostly appended to.
+        self._sorted: list[int] = []
+        self._stale = 0
+
+    def consumer(self, name: bytes) -> Consumer:
+        """The consumer called name, created if it doesn't exist."""
+        consumer = self.consumers.get(name)
+        if consumer is None:
+            consumer = self.consumers[name] = Consumer(name)
+        return consumer
+
+    def delete_consumer(self, name: bytes) -> int | None:
+        """
+        Delete a consumer and its pending entries.
+
+        Returns:
+            The number of pending entries deleted, or None if there was no
+            such consumer
+        """
+        consumer = self.consumers.pop(name, None)
+        if consumer is None:
+            return None
+        for id in consumer.pending:
+            self._remove(id)
+        return len(consumer.pending)
+
+    def deliver(
+        self, consumer: Consumer, id: int, now: int, counted: bool = True
+    ) -> PendingEntry:
+        """
+        Record entry id as delivered to consumer at now, taking it over from
+        the consumer it was pending for, if any.
+
+        Args:
+            counted: Count this as a delivery attempt (XCLAIM JUSTID doesn't)
+        """
+        entry = self.pending.get(id)
+        if entry is None:
+            entry = self.pending[id] = PendingEntry(consumer, now, 0)
+            self._index(id)
+        elif entry.consumer is not consumer:
+            del entry.consumer.pending[id]
+            entry.consumer = consumer
+        consumer.pending[id] = entry
+        entry.delivery_time = now
+        if counted:
+            entry.delivery_count += 1
+        return entry
+
+    def ack(self, id: int) -> bool:
+        """Acknowledge entry id. Returns False if it wasn't pending."""
+        entry = self.pending.get(id)
+        if entry is None:
+            return False
+        del entry.consumer.pending[id]
+        self._remove(id)
+        return True
+
+    def pending_ids(self, start: int, end: int) -> Iterator[int]:
+        """Pending IDs between start and end (inclusive), in ascending order."""
+        sorted_ids = self._sorted
+        pending = self.pending
+        i = bisect_left(sorted_ids, start)
+        while i < len(sorted_ids):
+            id = sorted_ids[i]
+            if id > end:
+                return
+            if id in pending:
+                yield id
+            i += 1
+
+    def pending_bounds(self) -> tuple[int, int]:
+        """The smallest and greatest pending IDs; there must be some."""
+        sorted_ids = self._sorted
+        pending = self.pending
+        first = next(id for id in sorted_ids if id in pending)
+        last = next(id for id in reversed(sorted_ids) if id in pending)
+        return first, last
+
+    def memory(self) -> int:
+        """Estimated bytes held by the group."""
+        return (
+            GROUP_BYTES
+            + len(self.pending) * PENDING_ENTRY_BYTES
+            + sum(CONSUMER_BYTES + sys.getsizeof(name) for name in self.consumers)
+        )
+
+    def _index(self, id: int) -> None:
+        sorted_ids = self._sorted
+        if not sorted_ids or id > sorted_ids[-1]:
+            sorted_ids.append(id)
+            return
+        i = bisect_left(sorted_ids, id)
+        if i < len(sorted_ids) and sorted_ids[i] == id:
+            self._stale -= 1  # Acknowledged before, pending again
+        else:
+            sorted_ids.insert(i, id)
+
+    def _remove(self, id: int) -> None:
+        del self.pending[id]
+        self._stale += 1
+        if self._stale >= COMPACT_THRESHOLD and self._stale > len(self.pending):
+            pending = self.pending
+            self._sorted = [id for id in self._sorted if id in pending]
+            self._stale = 0
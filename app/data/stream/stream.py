@@ -1,5 +1,19 @@
+import sys
+from bisect import bisect_right
+from collections.abc import Iterator
+
+from app.data.stream.consumer_group import ConsumerGroup
 from app.data.stream.stream_id import StreamID
 from app.data.stream.stream_entry import StreamEntry
+from app.data.stream.stream_node import StreamNode
+
+# Bytes a new node adds to the stream besides its own: its slot in _nodes
+# and its first ID in _first_ids
+NODE_DIRECTORY_BYTES = 8 + 8 + 36
+
+# Nodes dropped from the front leave empty slots behind; the lists are
+# compacted once there are at least this many, and as many as nodes left
+COMPACT_THRESHOLD = 64
 
 
 class Stream:
@@ -11,66 +25,315 @@ class Stream:
     - Provide range queries
     - Track the top (latest) entry
     - Enforce ordering invariant (IDs must be monotonically increasing)
+    - Hold its consumer groups
 
     This is a domain object - it knows nothing about storage or commands.
+
+    Entries are packed into StreamNodes of up to a hundred entries each,
+    which store IDs as deltas and share field names between entries, so
+    an entry costs tens of bytes instead of a StreamEntry, a StreamID and
+    a dict. The packed ID (StreamID.to_int) of every node's first entry
+    is kept in a sorted directory: a lookup by ID bisects it to find the
+    node, then bisects within the node. Reading from a position costs
+    O(log n) plus the entries returned, however long the stream is.
+
+    Trimming drops whole nodes from the front. Their slots are set to None
+    and skipped (the first _head of them), and only cut out of the lists
+    once they outnumber the nodes left, so capping a stream on every XADD
+    is O(1) amortized rather than a shift of the whole directory.
     """
 
     def __init__(self) -> None:
-        self._entries: list[StreamEntry] = []
+        # Nodes before _head have been trimmed away
+        self._nodes: list[StreamNode | None] = []
+        self._first_ids: list[int] = []  # Packed ID of each node's first entry
+        self._head = 0
+        self._length = 0  # Entries not deleted
+        self._top_id: StreamID | None = None
+        # Bytes reported for the last node while it grows. They are estimates
+        # until the node is sealed and measured; every other node has been,
+        # so what is freed when a node goes matches what was reported.
+        self._tail_memory = 0
+        self.groups: dict[bytes, ConsumerGroup] = {}
+        # Bumped whenever entries are added or deleted, so a reply read
+        # from the stream can be reused for as long as it is unchanged
+        self.version = 0
 
-    def add(self, entry: StreamEntry) -> None:
+    def add(self, entry: StreamEntry) -> int:
         """
         Append an entry to the stream.
 
         Args:
             entry: The entry to add
 
+        Returns:
+            Estimated bytes the stream grew by
+
         Raises:
             ValueError: If entry.id is not greater than current top ID
 
         Invariant: Entries are always in ascending ID order.
         """
-        if entry.id.is_valid_successor_to(self.top_id()):
-            self._entries.append(entry)
+        entry.id.is_valid_successor_to(self._top_id)
+        tail = self._nodes[-1] if self._head < len(self._nodes) else None
+        grown = tail.append(entry.id, entry.fields) if tail is not None else None
+        if grown is None:
+            grown = 0
+            if tail is not None:
+                tail.seal()
+                grown = tail.memory() - self._tail_memory
+            node = StreamNode(entry.id, entry.fields)
+            self._nodes.append(node)
+            self._first_ids.append(entry.id.to_int())
+            self._tail_memory = node.memory() + node.append(entry.id, entry.fields)
+            grown += self._tail_memory + NODE_DIRECTORY_BYTES
+        else:
+            self._tail_memory += grown
+        self._length += 1
+        self._top_id = entry.id
+        self.version += 1
+        return grown
 
     def top(self) -> StreamEntry | None:
         """Return the most recent entry, or None if stream is empty."""
-        return self._entries[-1] if not self.is_empty() else None
+        if self._head == len(self._nodes):
+            return None
+        node = self._nodes[-1]
+        return node.entry(node.positions(0, len(node))[-1])
 
     def top_id(self) -> StreamID | None:
-        """Return the ID of the most recent entry, or None if empty."""
-        return self._entries[-1].id if not self.is_empty() else None
+        """
+        Return the ID of the most recent entry ever added, or None if none
+        was. It stays the top ID after the entry is deleted, as new IDs
+        must still be greater than it.
+        """
+        return self._top_id
 
-    def range(self, start: StreamID, end: StreamID) -> list[StreamEntry]:
+    def range(
+        self, start: StreamID, end: StreamID, count: int | None = None
+    ) -> list[StreamEntry]:
         """
-        Return all entries with IDs in the range [start, end] (inclusive).
+        Return entries with IDs in the range [start, end] (inclusive).
 
         Args:
             start: Minimum ID (inclusive)
             end: Maximum ID (inclusive)
+            count: Return at most this many entries (None = no limit)
 
         Returns:
             List of entries in ascending order
+        """
+        start_id = start.to_int()
+        index = self._find_node(start_id)
+        if index < self._head:
+            index, pos = self._head, 0
+        else:
+            pos = self._nodes[index].bisect_left(start_id)
+        return self._collect(index, pos, end.to_int(), count)
 
-        Note: For efficiency with large streams, consider binary search
-        since entries are sorted. For now, linear scan is fine.
+    def read(self, id: StreamID, count: int | None = None) -> list[StreamEntry]:
+        """Return entries with IDs greater than id, at most count of them."""
+        after = id.to_int()
+        index = self._find_node(after)
+        if index < self._head:
+            index, pos = self._head, 0
+        else:
+            pos = self._nodes[index].bisect_right(after)
+        return self._collect(index, pos, None, count)
+
+    def get(self, id: StreamID) -> StreamEntry | None:
+        """Return the entry with the given ID, or None if there is none."""
+        entries = self.range(id, id)
+        return entries[0] if entries else None
+
+    def delete(self, ids: list[StreamID]) -> tuple[int, int]:
         """
-        if start > end or self.is_empty():
-            return []
+        Delete the entries with the given IDs, ignoring IDs not present.
 
-        # TODO: I'll get back here to implement binary serach
-        # Need to think how to find the inclusive start and end or the nearest
-        # in the range
-        return [ent for ent in self._entries if start <= ent.id <= end]
+        Returns:
+            (entries deleted, estimated bytes the stream shrank by)
+        """
+        deleted = freed = 0
+        for id in ids:
+            packed = id.to_int()
+            index = self._find_node(packed)
+            if index < self._head:
+                continue
+            node = self._nodes[index]
+            pos = node.bisect_left(packed)
+            if pos == len(node) or node.id_at(pos) != packed:
+                continue
+            before = node.memory()
+            if not node.delete(pos):
+                continue
+            deleted += 1
+            self._length -= 1
+            freed += self._deleted_from(index, before)
+        if deleted:
+            self.version += 1
+        return deleted, freed
 
-    def read(self, id: StreamID) -> list[StreamEntry]:
-        """Get IDs for a specific id"""
-        return [entry for entry in self._entries if entry.id > id]
+    def trim(
+        self,
+        maxlen: int | None = None,
+        minid: StreamID | None = None,
+        approximate: bool = False,
+        limit: int | None = None,
+    ) -> tuple[int, int]:
+        """
+        Delete the oldest entries, down to maxlen entries or up to the first
+        ID >= minid (give one of the two).
+
+        Args:
+            approximate: Only drop whole nodes, so a few more entries than
+                asked for may be left
+            limit: With approximate, delete at most this many entries
+                (None = no limit)
+
+        Returns:
+            (entries deleted, estimated bytes the stream shrank by)
+        """
+        min_packed = minid.to_int() if minid is not None else None
+        deleted = freed = 0
+        while self._head < len(self._nodes):
+            node = self._nodes[self._head]
+            live = node.live_count()
+            if min_packed is not None:
+                whole = node.id_at(len(node) - 1) < min_packed
+            else:
+                excess = self._length - maxlen
+                if excess <= 0:
+                    break
+                whole = excess >= live
+            if whole:
+                if limit is not None and deleted + live > limit:
+                    break
+                deleted += live
+                self._length -= live
+                freed += self._remove_node(self._head, node.memory())
+                continue
+            if approximate:
+                break
+
+            if min_packed is not None:
+                positions = node.positions(0, node.bisect_left(min_packed))
+            else:
+                positions = node.positions(0, len(node))[:excess]
+            if not positions:
+                break
+            before = node.memory()
+            for pos in positions:
+                node.delete(pos)
+            deleted += len(positions)
+            self._length -= len(positions)
+            freed += self._deleted_from(self._head, before)
+            break
+        if deleted:
+            self.version += 1
+        return deleted, freed
+
+    def detach(self) -> list[StreamNode]:
+        """Empty the stream, handing its nodes to the caller."""
+        nodes = self._nodes[self._head :]
+        self._nodes = []
+        self._first_ids = []
+        self._head = 0
+        self._length = 0
+        self._top_id = None
+        self._tail_memory = 0
+        self.groups = {}
+        self.version += 1
+        return nodes
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by the stream, measured node by node."""
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self._nodes)
+            + sys.getsizeof(self._first_ids)
+            + sum(map(sys.getsizeof, self._first_ids[self._head :]))
+            + sum(node.memory() for node in self._nodes[self._head :])
+            + sum(group.memory() for group in self.groups.values())
+        )
+
+    def __iter__(self) -> Iterator[StreamEntry]:
+        """Iterate over all entries in ascending ID order."""
+        for node in self._nodes[self._head :]:
+            for i in node.positions(0, len(node)):
+                yield node.entry(i)
 
     def __len__(self) -> int:
         """Return number of entries in the stream."""
-        return len(self._entries)
+        return self._length
 
     def is_empty(self) -> bool:
         """Return True if stream has no entries."""
-        return len(self._entries) == 0
+        return self._length == 0
+
+    def _collect(
+        self, index: int, pos: int, end: int | None, count: int | None
+    ) -> list[StreamEntry]:
+        """Decode entries from node index, position pos, up to ID end."""
+        entries: list[StreamEntry] = []
+        nodes = self._nodes
+        while index < len(nodes):
+            node = nodes[index]
+            stop = len(node)
+            if end is not None and node.id_at(stop - 1) > end:
+                stop = node.bisect_right(end)
+            positions = node.positions(pos, stop)
+            if count is not None:
+                positions = positions[: count - len(entries)]
+            entries.extend(node.entry(i) for i in positions)
+            if stop < len(node) or (count is not None and len(entries) == count):
+                break
+            index += 1
+            pos = 0
+        return entries
+
+    def _find_node(self, packed_id: int) -> int:
+        """Index of the last node whose first ID is <= packed_id."""
+        return bisect_right(self._first_ids, packed_id, self._head) - 1
+
+    def _deleted_from(self, index: int, before: int) -> int:
+        """
+        Account for entries just deleted from a node, given its memory()
+        before, removing the node if none are left.
+
+        Returns:
+            Estimated bytes the stream shrank by
+        """
+        node = self._nodes[index]
+        if not node.live_count():
+            return self._remove_node(index, before)
+        freed = before - node.memory()
+        if index == len(self._nodes) - 1:
+            self._tail_memory -= freed
+        return freed
+
+    def _remove_node(self, index: int, memory: int) -> int:
+        """
+        Remove a node with no entries left, given its memory() before its
+        last entries were deleted.
+
+        Returns:
+            Estimated bytes the stream shrank by
+        """
+        if index == len(self._nodes) - 1:
+            memory = self._tail_memory
+            if index > self._head:
+                self._tail_memory = self._nodes[index - 1].memory()
+
+        if index == self._head:
+            self._nodes[index] = None
+            self._head += 1
+            if self._head == len(self._nodes) or (
+                self._head >= COMPACT_THRESHOLD and 2 * self._head >= len(self._nodes)
+            ):
+                del self._nodes[: self._head]
+                del self._first_ids[: self._head]
+                self._head = 0
+        else:
+            del self._nodes[index]
+            del self._first_ids[index]
+        return memory + NODE_DIRECTORY_BYTES
@@ -13,7 +13,7 @@ class StreamEntry:
     """
 
     id: StreamID
-    fields: dict[str, str]
+    fields: dict[bytes, bytes]
 
     def format(self) -> list:
         """Format for RESP response."""
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
 
+# Sequences fit in 64 bits, as in Redis
+SEQUENCE_MASK = (1 << 64) - 1
+
 
 @dataclass(frozen=True, order=False)
 class StreamID:
@@ -24,12 +27,14 @@ class StreamID:
 
     # Factory Methods
     @classmethod
-    def parse(cls, id_string: str) -> "StreamID":
+    def parse(cls, id_string: str, default_sequence: int = 0) -> "StreamID":
         """
         Parse a stream ID string into a StreamID object.
 
         Args:
-            id_string: String like "135-5"
+            id_string: String like "135-5", or "135" for the whole millisecond
+            default_sequence: Sequence of an ID given as a millisecond time
+                alone: 0 for a start bound, SEQUENCE_MASK for an end bound
 
         Returns:
             StreamID instance
@@ -43,7 +48,7 @@ class StreamID:
             return cls.maximum()
 
         if "-" not in id_string:
-            raise ValueError(f"Invalid stream ID format: {id_string}")
+            return cls(timestamp=int(id_string), sequence=default_sequence)
 
         parts = id_string.split("-")
         if len(parts) != 2:
@@ -51,6 +56,11 @@ class StreamID:
         ts, seq = map(int, id_string.split("-"))
         return cls(timestamp=ts, sequence=seq)
 
+    @classmethod
+    def from_int(cls, value: int) -> "StreamID":
+        """Inverse of to_int()."""
+        return cls(timestamp=value >> 64, sequence=value & SEQUENCE_MASK)
+
     @classmethod
     def minimum(cls) -> "StreamID":
         """
@@ -90,6 +100,15 @@ class StreamID:
     def __ge__(self, other: "StreamID") -> bool:
         return not self < other
 
+    def to_int(self) -> int:
+        """
+        The ID packed into one int, timestamp in the high 64 bits.
+
+        Packed IDs order the same as StreamIDs but compare in C, so sorted
+        lists of them can be searched with bisect.
+        """
+        return (self.timestamp << 64) | self.sequence
+
     def __str__(self) -> str:
         """Return the canonical string representation: '<timestamp>-<sequence>'"""
         return f"{self.timestamp}-{self.sequence}"
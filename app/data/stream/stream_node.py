@@ -0,0 +1,228 @@
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from app.data.stream.stream_entry import StreamEntry
+from app.data.stream.stream_id import SEQUENCE_MASK, StreamID
+
+# A node takes no more entries once it holds this many, or this many bytes
+# of packed fields (Redis's stream-node-max-entries / stream-node-max-bytes)
+NODE_MAX_ENTRIES = 100
+NODE_MAX_BYTES = 4096
+
+# ID deltas are stored as unsigned 32-bit ints; an entry whose delta does
+# not fit starts a new node
+MAX_DELTA = 0xFFFFFFFF
+# Bytes per entry outside the packed fields: ms delta, seq delta, offset
+ENTRY_INDEX_BYTES = 12
+
+# Record flags, the first byte of each entry's record
+SAME_FIELDS = 1  # Only values follow, one per master field
+OWN_FIELDS = 2  # A field count follows, then names and values interleaved
+
+# Items shorter than LONG_ITEM are prefixed with their length as one byte;
+# longer ones with LONG_ITEM and then a 4-byte length
+LONG_ITEM = 0xFF
+_SHORT_LENGTHS = [bytes((n,)) for n in range(LONG_ITEM)]
+_LONG_LENGTH = struct.Struct("<I")
+_SAME_FIELDS = bytes((SAME_FIELDS,))
+_OWN_FIELDS = bytes((OWN_FIELDS,))
+
+
+def _pack_items(parts: list[bytes], items) -> None:
+    for item in items:
+        size = len(item)
+        if size < LONG_ITEM:
+            parts.append(_SHORT_LENGTHS[size])
+        else:
+            parts.append(b"\xff" + _LONG_LENGTH.pack(size))
+        parts.append(item)
+
+
+def _unpack_item(data: bytes | bytearray, pos: int) -> tuple[bytes, int]:
+    """Read one length-prefixed item at pos; returns (item, next_pos)."""
+    size = data[pos]
+    pos += 1
+    if size == LONG_ITEM:
+        (size,) = _LONG_LENGTH.unpack_from(data, pos)
+        pos += 4
+    return bytes(data[pos : pos + size]), pos + size
+
+
+class StreamNode:
+    """
+    A run of consecutive stream entries packed together, after Redis's
+    listpack nodes.
+
+    The first entry's ID is the node's master ID and its field names are
+    the master fields. Every entry's ID is stored as two 32-bit deltas
+    against the master ID (the sequence is stored as is once the
+    millisecond part differs). Its fields are packed into one buffer as a
+    record: when they have the master field names, only the values are
+    stored. Entries are decoded back into StreamEntry objects when read.
+
+    Deleting an entry (XDEL, exact trimming) only marks its position; the
+    node is dropped as a whole once none of its entries are left.
+    """
+
+    __slots__ = (
+        "data",
+        "deleted",
+        "master_fields",
+        "master_ms",
+        "master_seq",
+        "ms_deltas",
+        "offsets",
+        "seq_deltas",
+    )
+
+    def __init__(self, master_id: StreamID, master_fields: dict[bytes, bytes]):
+        self.master_ms = master_id.timestamp
+        self.master_seq = master_id.sequence
+        self.master_fields = tuple(master_fields)
+        self.ms_deltas = array("I")
+        self.seq_deltas = array("I")
+        self.offsets = array("I")  # Where each entry's record starts in data
+        self.data: bytes | bytearray = bytearray()
+        self.deleted: set[int] | None = None  # Positions of deleted entries
+
+    def __len__(self) -> int:
+        """Number of entries packed, deleted ones included."""
+        return len(self.offsets)
+
+    def live_count(self) -> int:
+        """Number of entries not deleted."""
+        return len(self.offsets) - len(self.deleted or ())
+
+    def positions(self, start: int, stop: int) -> range | list[int]:
+        """Positions start to stop (exclusive) of the entries not deleted."""
+        deleted = self.deleted
+        if not deleted:
+            return range(start, stop)
+        return [i for i in range(start, stop) if i not in deleted]
+
+    def delete(self, i: int) -> bool:
+        """Mark entry i deleted. Returns False if it already was."""
+        if self.deleted is None:
+            self.deleted = set()
+        elif i in self.deleted:
+            return False
+        self.deleted.add(i)
+        return True
+
+    def append(self, id: StreamID, fields: dict[bytes, bytes]) -> int | None:
+        """
+        Pack an entry at the end of the node.
+
+        Returns:
+            The bytes it takes up, or None if the node has no room for it
+        """
+        ms_delta = id.timestamp - self.master_ms
+        seq_delta = id.sequence - self.master_seq if ms_delta == 0 else id.sequence
+        if (
+            len(self.offsets) >= NODE_MAX_ENTRIES
+            or len(self.data) >= NODE_MAX_BYTES
+            or ms_delta > MAX_DELTA
+            or seq_delta > MAX_DELTA
+        ):
+            return None
+
+        parts: list[bytes] = []
+        if tuple(fields) == self.master_fields:
+            parts.append(_SAME_FIELDS)
+            _pack_items(parts, fields.values())
+        else:
+            parts.append(_OWN_FIELDS)
+            parts.append(_LONG_LENGTH.pack(len(fields)))
+            _pack_items(parts, (item for pair in fields.items() for item in pair))
+        record = b"".join(parts)
+
+        self.ms_deltas.append(ms_delta)
+        self.seq_deltas.append(seq_delta)
+        self.offsets.append(len(self.data))
+        self.data += record
+        return len(record) + ENTRY_INDEX_BYTES
+
+    def seal(self) -> None:
+        """Drop the spare capacity of the buffer once nothing more is added."""
+        self.data = bytes(self.data)
+
+    def id_at(self, i: int) -> int:
+        """The packed ID (StreamID.to_int) of entry i."""
+        ms_delta = self.ms_deltas[i]
+        seq = self.seq_deltas[i]
+        if ms_delta == 0:
+            seq += self.master_seq
+        return ((self.master_ms + ms_delta) << 64) | seq
+
+    def entry(self, i: int) -> StreamEntry:
+        """Decode entry i."""
+        ms_delta = self.ms_deltas[i]
+        seq = self.seq_deltas[i]
+        if ms_delta == 0:
+            seq += self.master_seq
+        id = StreamID(self.master_ms + ms_delta, seq)
+
+        data = self.data
+        pos = self.offsets[i]
+        if data[pos] == SAME_FIELDS:
+            pos += 1
+            values = []
+            for _ in self.master_fields:
+                size = data[pos]
+                pos += 1
+                if size == LONG_ITEM:
+                    (size,) = _LONG_LENGTH.unpack_from(data, pos)
+                    pos += 4
+                values.append(bytes(data[pos : pos + size]))
+                pos += size
+            fields = dict(zip(self.master_fields, values))
+        else:
+            (count,) = _LONG_LENGTH.unpack_from(data, pos + 1)
+            pos += 5
+            fields = {}
+            for _ in range(count):
+                name, pos = _unpack_item(data, pos)
+                fields[name], pos = _unpack_item(data, pos)
+        return StreamEntry(id=id, fields=fields)
+
+    def bisect_left(self, packed_id: int) -> int:
+        """Position of the first entry with an ID >= packed_id."""
+        lo, hi, seq = self._same_ms(packed_id)
+        return bisect_left(self.seq_deltas, seq, lo, hi)
+
+    def bisect_right(self, packed_id: int) -> int:
+        """Position of the first entry with an ID > packed_id."""
+        lo, hi, seq = self._same_ms(packed_id)
+        return bisect_right(self.seq_deltas, seq, lo, hi)
+
+    def _same_ms(self, packed_id: int) -> tuple[int, int, int]:
+        """
+        The run of entries sharing packed_id's millisecond part, and its
+        sequence as stored for them.
+
+        The ms deltas never decrease and the sequences increase within a
+        run, so both searches run on the arrays themselves.
+        """
+        ms_delta = (packed_id >> 64) - self.master_ms
+        seq = packed_id & SEQUENCE_MASK
+        if ms_delta == 0:
+            seq -= self.master_seq
+        lo = bisect_left(self.ms_deltas, ms_delta)
+        hi = bisect_right(self.ms_deltas, ms_delta, lo)
+        return lo, hi, seq
+
+    def memory(self) -> int:
+        """Estimated bytes held by the node, master field names included."""
+        deleted = self.deleted
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.ms_deltas)
+            + sys.getsizeof(self.seq_deltas)
+            + sys.getsizeof(self.offsets)
+            + sys.getsizeof(self.data)
+            + sys.getsizeof(self.master_fields)
+            + sum(map(sys.getsizeof, self.master_fields))
+            + (sys.getsizeof(deleted) if deleted is not None else 0)
+        )
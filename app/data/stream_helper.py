@@ -1,8 +1,44 @@
-from app.data.db import DataBase, RedisValue
+from dataclasses import dataclass
+
+from app.data.db import STREAM, WRONGTYPE_ERROR, DataBase, RedisValue
+from app.data.stream.consumer_group import PENDING_ENTRY_BYTES, ConsumerGroup
 from app.data.stream.stream_entry import StreamEntry
-from app.data.stream.stream_id import StreamID, StreamIDGenerator
+from app.data.stream.stream_id import SEQUENCE_MASK, StreamID, StreamIDGenerator
 from app.types import RESPError
 from app.data.stream.stream import Stream
+from app.utils.clock import unix_ms
+
+
+@dataclass(frozen=True)
+class TrimOptions:
+    """How to trim a stream (XTRIM, or XADD's MAXLEN/MINID). See Stream.trim."""
+
+    maxlen: int | None = None
+    minid: StreamID | None = None
+    approximate: bool = False
+    limit: int | None = None  # Only with approximate; None = no limit
+
+
+@dataclass(frozen=True)
+class ClaimOptions:
+    """XCLAIM's options. idle and time set the delivery time (time wins)."""
+
+    idle: int | None = None  # Milliseconds since the delivery
+    time: int | None = None  # unix_ms() of the delivery
+    retry_count: int | None = None  # Delivery count to set
+    force: bool = False  # Claim IDs not pending yet, if in the stream
+    just_id: bool = False  # Don't count a delivery; reply IDs only
+    last_id: StreamID | None = None  # Move the group's last ID up to this
+
+
+# Greater than any packed stream ID
+MAX_PACKED_ID = StreamID.maximum().to_int()
+# XAUTOCLAIM looks at up to this many times COUNT pending entries, as Redis
+AUTOCLAIM_ATTEMPTS_FACTOR = 10
+
+# (ID, entry) pairs read through a group. The entry is None when it was
+# deleted from the stream while pending.
+GroupEntries = list[tuple[StreamID, StreamEntry | None]]
 
 
 class StreamOps:
@@ -20,7 +56,11 @@ class StreamOps:
         self._id_gen = StreamIDGenerator()
 
     def add(
-        self, key: str, id_pattern: str, fields: dict[str, str]
+        self,
+        key: bytes,
+        id_pattern: str,
+        fields: dict[bytes, bytes],
+        trim: TrimOptions | None = None,
     ) -> StreamID | RESPError:
         """
         Add an entry to a stream.
@@ -29,20 +69,49 @@ class StreamOps:
             key: The stream key
             id_pattern: ID pattern ("*", "1234-*", or "1234-5")
             fields: Key-value pairs for the entry
+            trim: Trim the stream once the entry is added
 
         Returns:
             The generated StreamID on success, or RESPError on failure
         """
-        stream = self._get_or_create_stream(key)
+        redis_val = self._get_or_create_stream(key)
+        if isinstance(redis_val, RESPError):
+            return redis_val
+        stream = redis_val.data
         id = self._id_gen.generate(id_pattern, stream.top_id())
         entry = StreamEntry(id=id, fields=fields)
         try:
-            stream.add(entry)
+            grown = stream.add(entry)
         except ValueError as e:
             return RESPError(str(e))  # Domain error -> RESP error
+        self._db.resize(redis_val, grown)
+        if trim is not None:
+            self._trim(redis_val, trim)
         return id
 
-    def xrange(self, key: str, start_id: str, end_id: str) -> list[StreamEntry]:
+    def trim(self, key: bytes, options: TrimOptions) -> int | RESPError:
+        """Trim a stream; returns the number of entries deleted."""
+        redis_val = self._get(key)
+        if isinstance(redis_val, RESPError):
+            return redis_val
+        if not redis_val:
+            return 0
+        return self._trim(redis_val, options)
+
+    def delete(self, key: bytes, ids: list[StreamID]) -> int | RESPError:
+        """Delete entries by ID; returns the number of entries deleted."""
+        redis_val = self._get(key)
+        if isinstance(redis_val, RESPError):
+            return redis_val
+        if not redis_val:
+            return 0
+        deleted, freed = redis_val.data.delete(ids)
+        self._db.resize(redis_val, -freed)
+        return deleted
+
+    def xrange(
+        self, key: bytes, start_id: str, end_id: str, count: int | None = None
+    ) -> list[StreamEntry] | RESPError:
         """
         Get entries in a range.
 
@@ -50,49 +119,390 @@ class StreamOps:
             key: The stream key
             start_id: Start ID or "-" for minimum
             end_id: End ID or "+" for maximum
+            count: Return at most this many entries (None = no limit)
 
         Returns:
             List of entries in the range (empty if stream doesn't exist)
-        """
-        stream = self._get_stream(key)
-
-        return (
-            stream.range(
-                start=StreamID.parse(start_id),
-                end=StreamID.parse(end_id),
-            )
-            if stream
-            else []
-        )
 
-    def xread(self, key: str, id: str) -> list[StreamEntry] | None:
-        """Get entry for an id"""
-        stream = self._get_stream(key)
+        Raises:
+            ValueError: If an ID is invalid, whether the stream exists or not
+        """
+        start = StreamID.parse(start_id)
+        end = StreamID.parse(end_id, SEQUENCE_MASK)
+        stream = self.get_stream(key)
+        if isinstance(stream, RESPError):
+            return stream
+
+        return stream.range(start=start, end=end, count=count) if stream else []
+
+    def xread(
+        self, key: bytes, id: str, count: int | None = None
+    ) -> list[StreamEntry] | RESPError | None:
+        """Get entries after an id, at most count of them"""
+        after = StreamID.parse(id)  # Raises ValueError even without a stream
+        stream = self.get_stream(key)
+        if isinstance(stream, RESPError):
+            return stream
         if not stream:
             return None
-        return stream.read(StreamID.parse(id))
+        return stream.read(after, count)
 
-    def has_data(self, key: str) -> bool:
-        return self._get_stream(key) is not None
+    def has_data(self, key: bytes) -> bool:
+        return isinstance(self.get_stream(key), Stream)
 
-    def top_id(self, key: str) -> StreamID | None:
-        stream = self._get_stream(key)
+    def top_id(self, key: bytes) -> StreamID | RESPError | None:
+        stream = self.get_stream(key)
+        if isinstance(stream, RESPError):
+            return stream
         if stream:
             return stream.top_id()
 
-    # Private Methods
-    def _get_stream(self, key: str) -> Stream | None:
+    def get_stream(self, key: bytes) -> Stream | RESPError | None:
         """Get a stream from the database, or None if it doesn't exist."""
-        redis_val = self._db.get(key)
+        redis_val = self._get(key)
+        if isinstance(redis_val, RESPError):
+            return redis_val
         return redis_val.data if redis_val else None
 
-    def _get_or_create_stream(self, key: str) -> Stream:
-        """Get existing stream or create a new empty one."""
+    # Consumer groups
+    def create_group(
+        self, key: bytes, name: bytes, id: str, mkstream: bool
+    ) -> RESPError | None:
+        """Create a consumer group that delivers entries after id ("$" = top)."""
+        redis_val = self._get(key)
+        if isinstance(redis_val, RESPError):
+            return redis_val
+        # Parsed first, so that an invalid ID doesn't create the stream
+        last_id = None if id == "$" else StreamID.parse(id)
+        if not redis_val:
+            if not mkstream:
+                return RESPError(
+                    "ERR The XGROUP subcommand requires the key to exist. Note "
+                    "that for CREATE you may want to use the MKSTREAM option to "
+                    "create an empty stream automatically."
+                )
+            redis_val = RedisValue(dtype=STREAM, data=Stream())
+            self._db.set(key, redis_val)
+        stream = redis_val.data
+        if name in stream.groups:
+            return RESPError("BUSYGROUP Consumer Group name already exists")
+        group = stream.groups[name] = ConsumerGroup(
+            last_id or self._group_id(stream, id)
+        )
+        self._db.resize(redis_val, group.memory())
+        return None
+
+    def destroy_group(self, key: bytes, name: bytes) -> int | RESPError:
+        redis_val = self._get(key)
+        if isinstance(redis_val, RESPError):
+            return redis_val
+        if not redis_val:
+            return 0
+        group = redis_val.data.groups.pop(name, None)
+        if group is None:
+            return 0
+        self._db.resize(redis_val, -group.memory())
+        return 1
+
+    def set_group_id(self, key: bytes, name: bytes, id: str) -> RESPError | None:
+        found = self._get_group(key, name)
+        if isinstance(found, RESPError):
+            return found
+        redis_val, group = found
+        group.last_id = self._group_id(redis_val.data, id)
+        return None
+
+    def create_consumer(
+        self, key: bytes, name: bytes, consumer: bytes
+    ) -> int | RESPError:
+        """Returns 1 if the consumer was created, 0 if it existed."""
+        found = self._get_group(key, name)
+        if isinstance(found, RESPError):
+            return found
+        redis_val, group = found
+        if consumer in group.consumers:
+            return 0
+        before = group.memory()
+        group.consumer(consumer)
+        self._db.resize(redis_val, group.memory() - before)
+        return 1
+
+    def delete_consumer(
+        self, key: bytes, name: bytes, consumer: bytes
+    ) -> int | RESPError:
+        """Returns the number of pending entries the consumer had."""
+        found = self._get_group(key, name)
+        if isinstance(found, RESPError):
+            return found
+        redis_val, group = found
+        before = group.memory()
+        deleted = group.delete_consumer(consumer)
+        self._db.resize(redis_val, group.memory() - before)
+        return deleted or 0
+
+    def read_group(
+        self,
+        key: bytes,
+        name: bytes,
+        consumer: bytes,
+        id: str,
+        count: int | None = None,
+        noack: bool = False,
+    ) -> GroupEntries | RESPError:
+        """
+        Read entries as consumer of a group.
+
+        With id ">" these are entries never delivered to the group, which
+        become pending for consumer (unless noack). Otherwise they are the
+        consumer's own pending entries with IDs greater than id.
+        """
+        found = self._get_group(key, name, " in XREADGROUP with GROUP option")
+        if isinstance(found, RESPError):
+            return found
+        redis_val, group = found
+        stream = redis_val.data
+        before = group.memory()
+        owner = group.consumer(consumer)
+        if id == ">":
+            entries = stream.read(group.last_id, count)
+            if entries:
+                group.last_id = entries[-1].id
+                if not noack:
+                    now = unix_ms()
+                    for entry in entries:
+                        group.deliver(owner, entry.id.to_int(), now)
+            result = [(entry.id, entry) for entry in entries]
+        else:
+            after = StreamID.parse(id).to_int()
+            ids = sorted(pending for pending in owner.pending if pending > after)
+            result = [self._lookup(stream, pending) for pending in ids[:count]]
+        self._db.resize(redis_val, group.memory() - before)
+        return result
+
+    def ack(self, key: bytes, name: bytes, ids: list[StreamID]) -> int | RESPError:
+        redis_val = self._get(key)
+        if isinstance(redis_val, RESPError):
+            return redis_val
+        group = redis_val.data.groups.get(name) if redis_val else None
+        if group is None:
+            return 0
+        acked = sum(group.ack(id.to_int()) for id in ids)
+        self._db.resize(redis_val, -acked * PENDING_ENTRY_BYTES)
+        return acked
+
+    def pending_summary(self, key: bytes, name: bytes) -> list | RESPError:
+        """
+        XPENDING's summary: [count, smallest ID, greatest ID, [[consumer,
+        count], ...]], or [0, None, None, None] if nothing is pending.
+        """
+        found = self._get_group(key, name)
+        if isinstance(found, RESPError):
+            return found
+        group = found[1]
+        if not group.pending:
+            return [0, None, None, None]
+        first, last = group.pending_bounds()
+        consumers = [
+            [consumer.name, str(len(consumer.pending))]
+            for name, consumer in sorted(group.consumers.items())
+            if consumer.pending
+        ]
+        return [
+            len(group.pending),
+            str(StreamID.from_int(first)),
+            str(StreamID.from_int(last)),
+            consumers,
+        ]
+
+    def pending_range(
+        self,
+        key: bytes,
+        name: bytes,
+        start: StreamID,
+        end: StreamID,
+        count: int,
+        consumer: bytes | None = None,
+        min_idle: int = 0,
+    ) -> list | RESPError:
+        """
+        XPENDING's extended form: [[ID, consumer, idle ms, deliveries], ...]
+        for up to count pending entries between start and end.
+        """
+        found = self._get_group(key, name)
+        if isinstance(found, RESPError):
+            return found
+        group = found[1]
+        now = unix_ms()
+        result = []
+        if count <= 0:
+            return result
+        for id in group.pending_ids(start.to_int(), end.to_int()):
+            entry = group.pending[id]
+            if consumer is not None and entry.consumer.name != consumer:
+                continue
+            idle = max(now - entry.delivery_time, 0)
+            if idle < min_idle:
+                continue
+            result.append(
+                [
+                    str(StreamID.from_int(id)),
+                    entry.consumer.name,
+                    idle,
+                    entry.delivery_count,
+                ]
+            )
+            if len(result) == count:
+                break
+        return result
+
+    def claim(
+        self,
+        key: bytes,
+        name: bytes,
+        consumer: bytes,
+        min_idle: int,
+        ids: list[StreamID],
+        options: ClaimOptions,
+    ) -> GroupEntries | RESPError:
+        """
+        Take over pending entries idle for at least min_idle ms. Entries
+        deleted from the stream are dropped from the PEL instead.
+        """
+        found = self._get_group(key, name)
+        if isinstance(found, RESPError):
+            return found
+        redis_val, group = found
+        stream = redis_val.data
+        before = group.memory()
+        now = unix_ms()
+        delivery_time = now
+        if options.time is not None:
+            delivery_time = options.time
+        elif options.idle is not None:
+            delivery_time = now - options.idle
+        if options.last_id is not None and group.last_id < options.last_id:
+            group.last_id = options.last_id
+
+        owner = group.consumer(consumer)
+        claimed: GroupEntries = []
+        for id in ids:
+            packed = id.to_int()
+            pending = group.pending.get(packed)
+            if pending is None and not options.force:
+                continue
+            if pending is not None and now - pending.delivery_time < min_idle:
+                continue
+            entry = stream.get(id)
+            if entry is None:
+                if pending is not None:
+                    group.ack(packed)
+                continue
+            pending = group.deliver(
+                owner, packed, delivery_time, counted=not options.just_id
+            )
+            if options.retry_count is not None:
+                pending.delivery_count = options.retry_count
+            claimed.append((id, entry))
+        self._db.resize(redis_val, group.memory() - before)
+        return claimed
+
+    def autoclaim(
+        self,
+        key: bytes,
+        name: bytes,
+        consumer: bytes,
+        min_idle: int,
+        start: StreamID,
+        count: int,
+        just_id: bool = False,
+    ) -> tuple[StreamID, GroupEntries, list[StreamID]] | RESPError:
+        """
+        Claim up to count pending entries idle for at least min_idle ms,
+        scanning the PEL from start and looking at no more than ten times
+        count of them.
+
+        Returns:
+            (ID to continue the scan from, or 0-0 once it is complete,
+            entries claimed, IDs dropped as deleted from the stream)
+        """
+        found = self._get_group(key, name)
+        if isinstance(found, RESPError):
+            return found
+        redis_val, group = found
+        stream = redis_val.data
+        before = group.memory()
+        now = unix_ms()
+        owner = group.consumer(consumer)
+        claimed: GroupEntries = []
+        deleted: list[StreamID] = []
+        attempts = count * AUTOCLAIM_ATTEMPTS_FACTOR
+        cursor = StreamID(0, 0)
+        for packed in group.pending_ids(start.to_int(), MAX_PACKED_ID):
+            if attempts == 0 or len(claimed) == count:
+                cursor = StreamID.from_int(packed)
+                break
+            attempts -= 1
+            id = StreamID.from_int(packed)
+            entry = stream.get(id)
+            if entry is None:
+                group.ack(packed)
+                deleted.append(id)
+                continue
+            if now - group.pending[packed].delivery_time < min_idle:
+                continue
+            group.deliver(owner, packed, now, counted=not just_id)
+            claimed.append((id, entry))
+        self._db.resize(redis_val, group.memory() - before)
+        return cursor, claimed, deleted
+
+    # Private Methods
+    def _group_id(self, stream: Stream, id: str) -> StreamID:
+        if id == "$":
+            return stream.top_id() or StreamID(0, 0)
+        return StreamID.parse(id)
+
+    @staticmethod
+    def _lookup(stream: Stream, packed: int) -> tuple[StreamID, StreamEntry | None]:
+        id = StreamID.from_int(packed)
+        return id, stream.get(id)
+
+    def _get_group(
+        self, key: bytes, name: bytes, context: str = ""
+    ) -> tuple[RedisValue, ConsumerGroup] | RESPError:
+        redis_val = self._get(key)
+        if isinstance(redis_val, RESPError):
+            return redis_val
+        group = redis_val.data.groups.get(name) if redis_val else None
+        if group is None:
+            return RESPError(
+                f"NOGROUP No such key '{key.decode(errors='replace')}' or "
+                f"consumer group '{name.decode(errors='replace')}'{context}"
+            )
+        return redis_val, group
+
+    def _trim(self, redis_val: RedisValue, options: TrimOptions) -> int:
+        deleted, freed = redis_val.data.trim(
+            maxlen=options.maxlen,
+            minid=options.minid,
+            approximate=options.approximate,
+            limit=options.limit,
+        )
+        self._db.resize(redis_val, -freed)
+        return deleted
+
+    def _get(self, key: bytes) -> RedisValue | RESPError | None:
         redis_val = self._db.get(key)
+        if redis_val and redis_val.dtype != STREAM:
+            return RESPError(WRONGTYPE_ERROR)
+        return redis_val
+
+    def _get_or_create_stream(self, key: bytes) -> RedisValue | RESPError:
+        """Get existing stream or create a new empty one."""
+        redis_val = self._get(key)
         if not redis_val:
-            redis_val = RedisValue(dtype="stream", data=Stream())
+            redis_val = RedisValue(dtype=STREAM, data=Stream())
             self._db.set(key, redis_val)
-        return redis_val.data
+        return redis_val
 
 
 # I'm gonna keep it here if some issues rises later on.
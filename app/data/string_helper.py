@@ -1,44 +1,66 @@
-from datetime import datetime
-from app.data.db import DataBase, RedisValue
+import sys
+
+from app.data.db import STRING, WRONGTYPE_ERROR, DataBase, RedisValue
 from app.types import RESPError
 
+# Values of small integers are stored as one shared bytes object each, like
+# Redis's shared integers, instead of a fresh copy per key
+SHARED_INTEGERS = 10000
+_SHARED_INTEGERS = [b"%d" % n for n in range(SHARED_INTEGERS)]
+
+
+def shared_integer(value: bytes) -> bytes:
+    """Return the shared object equal to value, or value itself."""
+    if len(value) <= 4 and value.isdigit():
+        shared = _SHARED_INTEGERS[int(value)]
+        if shared == value:  # Leading zeros must be kept as written
+            return shared
+    return value
+
 
 class StringOps:
     def __init__(self, database: DataBase):
         self._db = database
 
-    def get(self, key: str) -> RedisValue | RESPError | None:
+    def get(self, key: bytes) -> RedisValue | RESPError | None:
         redis_val = self._db.get(key)
 
         if not redis_val:
             return None
-        if redis_val.dtype != "string":
-            return RESPError(
-                "WRONGTYPE Operation against a key holding the wrong kind of value"
-            )
+        if redis_val.dtype != STRING:
+            return RESPError(WRONGTYPE_ERROR)
 
         return redis_val
 
-    def set(self, key: str, value: str, expiry: datetime | None):
-        redis_val = RedisValue(dtype="string", data=value, expiry=expiry)
-        self._db.set(key, redis_val)
+    def set(self, key: bytes, value: bytes, expiry: int | None):
+        """Store a string, with an optional monotonic_ms() deadline."""
+        self._db.set(key, RedisValue(dtype=STRING, data=shared_integer(value)), expiry)
 
-    def has_data(self, key: str) -> bool:
+    def has_data(self, key: bytes) -> bool:
         return self._db.exists(key)
 
-    def incr(self, key: str) -> int | RESPError:
+    def incr(self, key: bytes) -> int | RESPError:
         value = self._get_or_create_string(key)
+        if isinstance(value, RESPError):
+            return value
         try:
-            value.data = int(value.data) + 1
-        except TypeError:
-            return RESPError(
-                f"key does not contain numerical value: {type(value.data)}"
-            )
-        return value.data
+            number = int(value.data) + 1
+        except ValueError:
+            return RESPError("value is not an integer or out of range")
+        # Stored as its decimal bytes so GET stays binary-safe
+        data = (
+            _SHARED_INTEGERS[number]
+            if 0 <= number < SHARED_INTEGERS
+            else b"%d" % number
+        )
+        self._db.resize(value, sys.getsizeof(data) - sys.getsizeof(value.data))
+        value.data = data
+        return number
 
     # Private methods
-    def _get_or_create_string(self, key: str) -> RedisValue:
-        value = self._db.get(key)
-        if not value:
-            value = RedisValue(dtype="string", data=0)
+    def _get_or_create_string(self, key: bytes) -> RedisValue | RESPError:
+        value = self.get(key)
+        if value is None:
+            value = RedisValue(dtype=STRING, data=b"0")
+            self._db.set(key, value)
         return value
@@ -1,22 +1,84 @@
-from app.commands.registry import CommandRegistry
-from app.config import ServerConfig
+import argparse
 
+from app.commands.registry import CommandRegistry
+from app.config import MAXMEMORY_POLICIES, MemoryConfig, ServerConfig
 from app.data.db import DataBase
 from app.logger import setup_logging
-from app.server import RedisServer
+from app.server import AsyncRedisServer, RedisServer
+
+SERVERS = {
+    "selectors": RedisServer,
+    "asyncio": AsyncRedisServer,
+}
+
+
+LAZYFREE_OPTIONS = (
+    "lazyfree_lazy_expire",
+    "lazyfree_lazy_eviction",
+    "lazyfree_lazy_server_del",
+    "lazyfree_lazy_user_del",
+)
+
+
+MEMORY_UNITS = {"kb": 1024, "mb": 1024**2, "gb": 1024**3, "b": 1}
+
+
+def parse_memory(value: str) -> int:
+    """Parse a byte count such as 1048576, 100mb or 2gb."""
+    text = value.strip().lower()
+    for unit, factor in MEMORY_UNITS.items():
+        if text.endswith(unit):
+            return int(text[: -len(unit)]) * factor
+    return int(text)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Redis server")
+    parser.add_argument(
+        "--server",
+        choices=SERVERS,
+        default="selectors",
+        help="Event loop implementation to run (default: selectors)",
+    )
+    parser.add_argument(
+        "--maxmemory",
+        type=parse_memory,
+        default=0,
+        help="Memory limit for keys and values, e.g. 100mb (default: unlimited)",
+    )
+    parser.add_argument(
+        "--maxmemory-policy",
+        choices=MAXMEMORY_POLICIES,
+        default="noeviction",
+        help="What to evict once maxmemory is reached (default: noeviction)",
+    )
+    for option in LAZYFREE_OPTIONS:
+        parser.add_argument(
+            "--" + option.replace("_", "-"),
+            action="store_true",
+            help="Free large values removed this way in the background",
+        )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
     setup_logging()
     config = ServerConfig()
 
     # Dependencies
-    database = DataBase()
+    database = DataBase(
+        MemoryConfig(
+            maxmemory=args.maxmemory,
+            maxmemory_policy=args.maxmemory_policy,
+            **{option: getattr(args, option) for option in LAZYFREE_OPTIONS},
+        )
+    )
     registry = CommandRegistry()
     registry.auto_discover(database)
 
     # Create and start server
-    server = RedisServer(registry, config)
+    server = SERVERS[args.server](registry, database, config)
     server.start()
 
 
@@ -1,41 +1,123 @@
 from typing import assert_never
 
-from app.types import EncodeableValue, NullArray, RESPError, SimpleString
+from app.types import (
+    EncodeableValue,
+    NullArray,
+    RESPError,
+    SimpleString,
+    StreamingReply,
+)
+
+# Shared, pre-encoded replies. Building these per reply was pure overhead.
+OK = b"+OK\r\n"
+PONG = b"+PONG\r\n"
+NULL_BULK_STRING = b"$-1\r\n"
+NULL_ARRAY = b"*-1\r\n"
+EMPTY_ARRAY = b"*0\r\n"
+
+SHARED_INTEGERS = 10000
+_INTEGERS = [b":%d\r\n" % n for n in range(SHARED_INTEGERS)]
+
+# Headers for short bulk strings and arrays ($<len>\r\n and *<len>\r\n)
+SHARED_HEADERS = 32
+_BULK_HEADERS = [b"$%d\r\n" % n for n in range(SHARED_HEADERS)]
+_ARRAY_HEADERS = [b"*%d\r\n" % n for n in range(SHARED_HEADERS)]
+
+_SIMPLE_STRINGS = {
+    s: b"+%s\r\n" % s.encode("utf-8")
+    for s in ("OK", "PONG", "string", "list", "stream", "none")
+}
+
+# Messages starting with one of these already carry their error code;
+# anything else is reported as a generic ERR.
+ERROR_CODES = ("ERR ", "WRONGTYPE ", "OOM ", "BUSYGROUP ", "NOGROUP ")
+
+_ERRORS = {
+    message: b"-%s\r\n" % message.encode("utf-8")
+    for message in (
+        "ERR syntax error",
+        "ERR value is not an integer or out of range",
+        "ERR protocol error",
+        "WRONGTYPE Operation against a key holding the wrong kind of value",
+    )
+}
 
 
 def encode_simple_string(s: str) -> bytes:
     """Encodes as +OK\r\n"""
-    return f"+{s}\r\n".encode("utf-8")
+    shared = _SIMPLE_STRINGS.get(s)
+    if shared is not None:
+        return shared
+    return b"+%s\r\n" % s.encode("utf-8")
 
 
 def encode_error(message: str) -> bytes:
     """Encode as -ERR message\r\n"""
-    return f"-ERR {message}\r\n".encode("utf-8")
+    if not message.startswith(ERROR_CODES):
+        message = f"ERR {message}"
+    shared = _ERRORS.get(message)
+    if shared is not None:
+        return shared
+    return b"-%s\r\n" % message.encode("utf-8")
 
 
 def encode_integer(n: int) -> bytes:
     """Encode as :42\r\n"""
-    return f":{n}\r\n".encode("utf-8")
+    if 0 <= n < SHARED_INTEGERS:
+        return _INTEGERS[n]
+    return b":%d\r\n" % n
 
 
-def encode_bulk_string(s: str | None) -> bytes:
+def encode_bulk_string(s: bytes | str | None) -> bytes:
     """Encode as $3\r\nhey\r\n or $-1\r\n for None"""
     if s is None:
-        return "$-1\r\n".encode("utf-8")
-    return f"${len(s)}\r\n{s}\r\n".encode("utf-8")
+        return NULL_BULK_STRING
+    if isinstance(s, str):
+        s = s.encode("utf-8")
+    return b"$%d\r\n%b\r\n" % (len(s), s)
 
 
 def encode_array(items: list) -> bytes:
-    """Encode as *2\r\n..., recursively calling encode_resp()"""
-    count = len(items)
-    parts = [f"*{count}\r\n".encode("utf-8")]
-    for item in items:
-        parts.append(encode_resp(item))
-    return b"".join(parts)
+    """Encode as *2\r\n..., appending every nested item into one buffer"""
+    if not items:
+        return EMPTY_ARRAY
+    buffer = bytearray()
+    encode_into(buffer, items)
+    return bytes(buffer)
 
 
 def encode_null_array() -> bytes:
-    return b"*-1\r\n"
+    return NULL_ARRAY
+
+
+def encode_array_header(count: int) -> bytes:
+    """Encode as *<count>\r\n"""
+    return _ARRAY_HEADERS[count] if count < SHARED_HEADERS else b"*%d\r\n" % count
+
+
+def encode_into(buffer: bytearray, value: EncodeableValue) -> None:
+    """
+    Append the RESP encoding of value to buffer.
+
+    Nested arrays are written straight into the same buffer, so a large
+    XRANGE/LRANGE reply allocates no intermediate bytes per element.
+    """
+    kind = type(value)
+    if kind is bytes:
+        size = len(value)
+        buffer += _BULK_HEADERS[size] if size < SHARED_HEADERS else b"$%d\r\n" % size
+        buffer += value
+        buffer += b"\r\n"
+    elif kind is list:
+        buffer += encode_array_header(len(value))
+        for item in value:
+            encode_into(buffer, item)
+    elif kind is int:
+        buffer += encode_integer(value)
+    elif kind is str:
+        buffer += encode_bulk_string(value)
+    else:
+        buffer += encode_resp(value)
 
 
 def encode_resp(value: EncodeableValue) -> bytes:
@@ -47,12 +129,16 @@ def encode_resp(value: EncodeableValue) -> bytes:
             return encode_error(value.message)
         case NullArray():
             return encode_null_array()
-        case str():
+        case bytes() | str():
             return encode_bulk_string(value)
         case int():
             return encode_integer(value)
         case list():
             return encode_array(value)
+        case StreamingReply():
+            # Only for callers that want everything at once; the server
+            # streams these chunk by chunk instead
+            return encode_array(list(value.items))
         case None:
             return encode_bulk_string(None)
         case _:
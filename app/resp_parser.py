@@ -1,36 +1,72 @@
-from app.types import ParseResult, RESPError, RESPProtocolError
+"""
+Offset-based RESP parser.
+
+Every parser takes the buffer and an integer cursor, and returns the parsed
+value together with the cursor just past it. Nothing but the value itself is
+ever copied, so parsing an N-element array costs O(N + payload) instead of
+re-slicing the remaining tail after every element.
+
+Buffers may be bytes or a bytearray that keeps growing as data arrives.
+"""
+
 from app.config import DEFAULT_PARSER_CONFIG
+from app.types import (
+    ParseResult,
+    RESPError,
+    RESPIncompleteError,
+    RESPProtocolError,
+    RESPValue,
+)
+
+Buffer = bytes | bytearray
+
+
+def _protocol_error(message: str, data: Buffer, pos: int) -> RESPProtocolError:
+    return RESPProtocolError(message, data=bytes(data[pos : pos + 51]), position=pos)
 
 
-def parse_bulk_string(data: bytes) -> tuple[str | None, bytes]:
+def _read_line(data: Buffer, pos: int, what: str) -> tuple[int, int]:
     """
-    Parse a bulk string from RESP format.
+    Locate the header line starting at pos (type byte included).
 
-    Format: $<length>\r\n<data>\r\n
-    Example: $5\r\nhello\r\n
+    Returns:
+        (line_end, next_pos) - index of the \r\n and the index after it
 
-    Returns: (parsed string, remaining_bytes)
+    Raises:
+        RESPIncompleteError: if the terminator has not arrived yet
+        RESPProtocolError: if the line is longer than any valid header
     """
+    end = data.find(b"\r\n", pos)
+    if end == -1:
+        if len(data) - pos > DEFAULT_PARSER_CONFIG.max_line_length:
+            raise _protocol_error(f"{what}: line too long", data, pos)
+        raise RESPIncompleteError()
+    return end, end + 2
 
-    if not data.startswith(b"$"):
-        raise RESPProtocolError(
-            "Invalid bulk string: must start with '$'", data=data, position=0
-        )
 
+def _read_int(data: Buffer, start: int, end: int, what: str) -> int:
     try:
-        length_end_idx = data.index(b"\r\n")
+        return int(data[start:end])
     except ValueError:
-        raise RESPProtocolError(
-            "Invalid bulk string: missing \\r\\n after length", data=data
-        )
+        raise _protocol_error(f"{what}: could not parse number", data, start)
 
-    # Parse the length
-    try:
-        length = int(data[1:length_end_idx].decode("utf-8"))
-    except ValueError:
-        raise RESPProtocolError(
-            "Invalid bulk string: could not parse length", data=data, position=1
-        )
+
+def parse_bulk_string(data: Buffer, pos: int = 0) -> tuple[bytes | None, int]:
+    """
+    Parse a bulk string from RESP format.
+
+    Bulk strings are binary safe, so the payload is returned as raw bytes.
+
+    Format: $<length>\r\n<data>\r\n
+    Example: $5\r\nhello\r\n
+
+    Returns: (parsed bytes, next_pos)
+    """
+    if data[pos] != 0x24:  # "$"
+        raise _protocol_error("Invalid bulk string: must start with '$'", data, pos)
+
+    line_end, data_start = _read_line(data, pos, "Invalid bulk string")
+    length = _read_int(data, pos + 1, line_end, "Invalid bulk string")
 
     if length > DEFAULT_PARSER_CONFIG.max_bulk_string_length:
         raise RESPProtocolError(
@@ -39,144 +75,74 @@ def parse_bulk_string(data: bytes) -> tuple[str | None, bytes]:
 
     # Handle null bulk string
     if length == -1:
-        remaining = data[length_end_idx + 2 :]
-        return None, remaining
-    # Handle emptry string
-    if length == 0:
-        # Emptry string: $0\r\n\r\n
-        data_start = length_end_idx + 2
-        if not data[data_start:].startswith(b"\r\n"):
-            raise RESPProtocolError(
-                "Invalid bulk string: missing \\r\\n after empty data",
-                data=data,
-                position=data_start,
-            )
-        remaining = data[data_start + 2 :]
-        return "", remaining
+        return None, data_start
 
-    # Parse the actual string data
-    data_start = length_end_idx + 2
     data_end = data_start + length
-
     if len(data) < data_end + 2:
-        raise RESPProtocolError(
-            f"Bulk string complete: expected {length} bytes...",
-            data=data,
-            position=data_start,
-        )
+        raise RESPIncompleteError()
 
     if data[data_end : data_end + 2] != b"\r\n":
-        raise RESPProtocolError(
-            "Invalid bulk string: missing \\r\\n after data",
-            data=data,
-            position=data_end,
+        raise _protocol_error(
+            "Invalid bulk string: missing \\r\\n after data", data, data_end
         )
 
-    string_data = data[data_start:data_end].decode("utf-8")
-    remaining = data[data_end + 2 :]
-    return string_data, remaining
+    return bytes(data[data_start:data_end]), data_end + 2
 
 
-def parse_simple_string(data: bytes) -> tuple[str, bytes]:
+def parse_simple_string(data: Buffer, pos: int = 0) -> tuple[str, int]:
     """
     Parse a RESP simple string.
 
     Format: +<string>\r\n
     Example: +OK\r\n
 
-    Returns: (parsed_string, remaining_bytes)
+    Returns: (parsed_string, next_pos)
     """
-    if not data.startswith(b"+"):
-        raise RESPProtocolError(
-            "Invalid simple string: must start with '+'",
-            data=data,
-            position=0,
-        )
+    if data[pos] != 0x2B:  # "+"
+        raise _protocol_error("Invalid simple string: must start with '+'", data, pos)
 
-    try:
-        end_idx = data.index(b"\r\n")
-    except ValueError:
-        raise RESPProtocolError(
-            "Invalid simple string: missing \\r\\n terminator", data=data
-        )
-
-    # Extract string
-    string_value = data[1:end_idx].decode("utf-8")
-    remaining = data[end_idx + 2 :]
-
-    return string_value, remaining
+    line_end, next_pos = _read_line(data, pos, "Invalid simple string")
+    return data[pos + 1 : line_end].decode("utf-8"), next_pos
 
 
-def parse_error(data: bytes) -> tuple[RESPError, bytes]:
+def parse_error(data: Buffer, pos: int = 0) -> tuple[RESPError, int]:
     """
     Parse a RESP error.
 
     Format: -<error message>\r\n
     Example: -ERR unknown command\r\n
 
-    Returns: (RESPError)
+    Returns: (RESPError, next_pos)
     """
+    if data[pos] != 0x2D:  # "-"
+        raise _protocol_error("Invalid error: must start with '-'", data, pos)
 
-    if not data.startswith(b"-"):
-        raise RESPProtocolError(
-            "Invalid error: must start with '-'",
-            data=data,
-            position=0,
-        )
+    line_end, next_pos = _read_line(data, pos, "Invalid error")
+    return RESPError(message=data[pos + 1 : line_end].decode("utf-8")), next_pos
 
-    try:
-        # Find the \r\n terminator
-        end_idx = data.index(b"\r\n")
-    except ValueError:
-        raise RESPProtocolError(
-            "Invalid error: missing \\r\\n terminator",
-            data=data,
-        )
-
-    error_message = data[1:end_idx].decode("utf-8")
-    remaining = data[end_idx + 2 :]
-
-    return RESPError(message=error_message), remaining
 
-
-def parse_integer(data: bytes) -> tuple[int, bytes]:
+def parse_integer(data: Buffer, pos: int = 0) -> tuple[int, int]:
     """
     Parse a RESP integer.
 
     Format: :<number>\r\n
     Example: :42\r\n or :-1\r\n
 
-    Returns: parsed_integer
+    Returns: (parsed_integer, next_pos)
     """
+    if data[pos] != 0x3A:  # ":"
+        raise _protocol_error("Invalid integer: must start with ':'", data, pos)
 
-    if not data.startswith(b":"):
-        raise RESPProtocolError(
-            "Invalid integer: must start with ':'", data=data, position=0
-        )
-
-    try:
-        end_idx = data.index(b"\r\n")
-    except ValueError:
-        raise RESPProtocolError(
-            "Invalid integer: missing \r\n terminator",
-            data=data,
-        )
-
-    try:
-        int_value = int(data[1:end_idx].decode("utf-8"))
-    except ValueError:
-        raise RESPProtocolError(
-            "Invalid integer: could not parse number",
-            data=data,
-            position=1,
-        )
-    remaining = data[end_idx + 2 :]
-    return int_value, remaining
+    line_end, next_pos = _read_line(data, pos, "Invalid integer")
+    return _read_int(data, pos + 1, line_end, "Invalid integer"), next_pos
 
 
 def parse_array(
-    data: bytes, depth: int = 0, max_depth: int = 10
-) -> tuple[list | None, bytes]:
+    data: Buffer,
+    pos: int = 0,
+    depth: int = 0,
+    max_depth: int = DEFAULT_PARSER_CONFIG.max_array_depth,
+) -> tuple[list | None, int]:
     """
     Parse a RESP array (recursively)
 
@@ -184,107 +150,222 @@ def parse_array(
     Example: *2\r\n$5\r\nhello\r\n$5world\r\n
     Special: *-1\r\n (null array)
 
-    Returns parsed_array_or_none
+    Returns: (parsed_array_or_none, next_pos)
     """
     if depth > max_depth:
-        raise RESPProtocolError(
-            f"Array nesting too deep (max depth: {max_depth}",
-            data=data,
-            position=0,
+        raise _protocol_error(
+            f"Array nesting too deep (max depth: {max_depth})", data, pos
         )
 
-    if not data.startswith(b"*"):
-        raise RESPProtocolError(
-            "Invalid array: must start with '*'",
-            data=data,
-            position=0,
-        )
+    if data[pos] != 0x2A:  # "*"
+        raise _protocol_error("Invalid array: must start with '*'", data, pos)
 
-    try:
-        # Finding the first \r\n which is the end of count specification
-        count_end_idx = data.index(b"\r\n")
-    except ValueError:
-        raise RESPProtocolError(
-            "Invalid array: missing \\r\\n after count",
-            data=data,
-        )
-
-    # Parse the count
-    try:
-        count = int(data[1:count_end_idx].decode("utf-8"))
-    except ValueError:
-        raise RESPProtocolError(
-            "Invalid array: could not parse count",
-            data=data,
-            position=1,
-        )
+    line_end, next_pos = _read_line(data, pos, "Invalid array")
+    count = _read_int(data, pos + 1, line_end, "Invalid array")
+    pos = next_pos
 
     # Handle null array
     if count == -1:
-        remaining = data[count_end_idx + 2 :]
-        return None, remaining
+        return None, pos
 
-    # Handle empty array
-    if count == 0:
-        remaining = data[count_end_idx + 2 :]
-        return [], remaining
-
-    # Parse array elements recursively
-    remaining = data[count_end_idx + 2 :]
+    size = len(data)
     elements = []
-
-    for i in range(count):
-        if not remaining:
-            raise RESPProtocolError(
-                f"Array incomplete: expected {count} elements, got {i}",
-                data=data,
-                position=len(data),
-            )
-        # Recursively parse each element
-        element, remaining = parse_resp(remaining, depth=depth + 1, max_depth=max_depth)
+    for _ in range(count):
+        if pos >= size:
+            raise RESPIncompleteError()
+        if data[pos] == 0x24:
+            # Fast path: commands are arrays of bulk strings
+            element, pos = parse_bulk_string(data, pos)
+        else:
+            element, pos = parse_resp(data, pos, depth=depth + 1, max_depth=max_depth)
         elements.append(element)
 
-    return elements, remaining
+    return elements, pos
 
 
 def parse_resp(
-    data: bytes, depth: int = 0, max_depth: int = DEFAULT_PARSER_CONFIG.max_array_depth
+    data: Buffer,
+    pos: int = 0,
+    depth: int = 0,
+    max_depth: int = DEFAULT_PARSER_CONFIG.max_array_depth,
 ) -> ParseResult:
     """
-    Parse one RESP value from data.
+    Parse one RESP value from data, starting at pos.
 
     Dispatcher function that routes to the appropriate parser based on the first byte.
 
     Returns:
-        (parsed_value, remaining_bytes)
+        (parsed_value, next_pos)
 
     Return types by RESP type:
         Simple String (+) → str
         Error (-)         → RESPError
         Integer (:)       → int
-        Bulk String ($)   → str | None (None for null bulk strings)
+        Bulk String ($)   → bytes | None (None for null bulk strings)
         Array (*)         → list | None (None for null arrays)
 
     Raises:
         RESPProtocolError: if data is malformed or empty
+        RESPIncompleteError: if data ends in the middle of a value
     """
 
-    if not data:
+    if pos >= len(data):
         raise RESPProtocolError("Cannot parse empty data")
 
-    first_byte = data[0:1]
-
-    if first_byte == b"+":
-        return parse_simple_string(data)
-    elif first_byte == b"-":
-        return parse_error(data)
-    elif first_byte == b":":
-        return parse_integer(data)
-    elif first_byte == b"$":
-        return parse_bulk_string(data)
-    elif first_byte == b"*":
-        return parse_array(data, depth=depth, max_depth=max_depth)
+    first_byte = data[pos]
+
+    if first_byte == 0x24:  # "$"
+        return parse_bulk_string(data, pos)
+    elif first_byte == 0x2A:  # "*"
+        return parse_array(data, pos, depth=depth, max_depth=max_depth)
+    elif first_byte == 0x2B:  # "+"
+        return parse_simple_string(data, pos)
+    elif first_byte == 0x2D:  # "-"
+        return parse_error(data, pos)
+    elif first_byte == 0x3A:  # ":"
+        return parse_integer(data, pos)
     else:
-        raise RESPProtocolError(
-            f"Unknown RESP type indicator: {first_byte!r}", data=data, position=0
+        raise _protocol_error(
+            f"Unknown RESP type indicator: {bytes([first_byte])!r}", data, pos
         )
+
+
+class RequestParser:
+    """
+    Incremental parser for the command stream of one client connection.
+
+    Client requests are arrays of bulk strings. Progress through the current
+    array is kept between reads, so a command that arrives over many reads
+    is never re-parsed from its start. Each call to parse() pulls every
+    complete command out of the buffer in one pass.
+
+    Once the header of a bulk string of at least big_arg_threshold bytes
+    has been read, an exactly sized buffer is allocated for it. The server
+    can then recv_into big_arg_buffer() directly instead of growing and
+    re-scanning the general input buffer.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self._args: list[RESPValue] = []
+        self._args_left = 0  # Elements still expected in the current array
+        self._big_arg: bytearray | None = None  # Payload plus trailing \r\n
+        self._big_arg_filled = 0
+
+    def feed(self, data: Buffer) -> None:
+        """Append bytes received from the client."""
+        if self._big_arg is not None:
+            view = memoryview(data)
+            taken = min(len(view), len(self._big_arg) - self._big_arg_filled)
+            end = self._big_arg_filled + taken
+            self._big_arg[self._big_arg_filled : end] = view[:taken]
+            self._big_arg_filled = end
+            data = view[taken:]
+        self.buffer += data
+
+    def big_arg_buffer(self) -> memoryview | None:
+        """Writable view of the big argument still being received, if any."""
+        if self._big_arg is None:
+            return None
+        return memoryview(self._big_arg)[self._big_arg_filled :]
+
+    def big_arg_received(self, nbytes: int) -> None:
+        """Record nbytes written into big_arg_buffer() by the caller."""
+        self._big_arg_filled += nbytes
+
+    def parse(self) -> list[RESPValue]:
+        """
+        Return every command completed since the last call.
+
+        Raises:
+            RESPProtocolError: if the input is malformed; the commands
+                completed before the error are in its commands
+        """
+        commands: list[RESPValue] = []
+        buffer = self.buffer
+        pos = 0
+        try:
+            while True:
+                if self._big_arg is not None:
+                    if not self._finish_big_arg():
+                        break
+                elif not self._args_left:
+                    if pos >= len(buffer):
+                        break
+                    if buffer[pos] != 0x2A:  # "*"
+                        # Not a command array; hand it over as a plain value
+                        value, pos = parse_resp(buffer, pos)
+                        commands.append(value)
+                        continue
+                    line_end, next_pos = _read_line(buffer, pos, "Invalid array")
+                    count = _read_int(buffer, pos + 1, line_end, "Invalid array")
+                    pos = next_pos
+                    if count <= 0:
+                        commands.append(None if count == -1 else [])
+                        continue
+                    self._args_left = count
+                else:
+                    pos = self._parse_arg(buffer, pos)
+
+                if self._big_arg is None and not self._args_left and self._args:
+                    commands.append(self._args)
+                    self._args = []
+        except RESPIncompleteError:
+            pass
+        except RESPProtocolError as e:
+            e.commands = commands
+            raise
+        finally:
+            if pos:
+                del buffer[:pos]
+
+        return commands
+
+    def _parse_arg(self, buffer: bytearray, pos: int) -> int:
+        """Parse the next array element and return the position after it."""
+        if pos >= len(buffer):
+            raise RESPIncompleteError()
+
+        if buffer[pos] != 0x24:  # "$"
+            value, pos = parse_resp(buffer, pos, depth=1)
+        else:
+            line_end, data_start = _read_line(buffer, pos, "Invalid bulk string")
+            length = _read_int(buffer, pos + 1, line_end, "Invalid bulk string")
+            if length > DEFAULT_PARSER_CONFIG.max_bulk_string_length:
+                raise RESPProtocolError(
+                    f"Bulk string length {length} exceeds maximum allowed {DEFAULT_PARSER_CONFIG.max_bulk_string_length}"
+                )
+
+            available = len(buffer) - data_start
+            if (
+                length >= DEFAULT_PARSER_CONFIG.big_arg_threshold
+                and available < length + 2
+            ):
+                # Large value still in flight: receive the rest in place
+                self._big_arg = bytearray(length + 2)
+                self._big_arg[:available] = memoryview(buffer)[data_start:]
+                self._big_arg_filled = available
+                return len(buffer)
+
+            value, pos = parse_bulk_string(buffer, pos)
+
+        self._args.append(value)
+        self._args_left -= 1
+        return pos
+
+    def _finish_big_arg(self) -> bool:
+        """Turn a fully received big argument into a value, if it is done."""
+        assert self._big_arg is not None
+        if self._big_arg_filled < len(self._big_arg):
+            return False
+        if self._big_arg[-2:] != b"\r\n":
+            raise _protocol_error(
+                "Invalid bulk string: missing \\r\\n after data",
+                self._big_arg,
+                len(self._big_arg) - 2,
+            )
+        self._args.append(bytes(memoryview(self._big_arg)[:-2]))
+        self._args_left -= 1
+        self._big_arg = None
+        self._big_arg_filled = 0
+        return True
@@ -1,15 +1,25 @@
-import select
+import asyncio
+import selectors
 import socket
-from datetime import datetime, timedelta
+import time
+from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
 from app.blocking import BlockingState, WaitingClient
 from app.commands.base import BlockingResponse, UnblockEvent
 from app.config import DEFAULT_SERVER_CONFIG, ServerConfig
+from app.connection import ClientConnection
+from app.data.db import DataBase, WrongTypeError
 from app.logger import get_logger
-from app.resp_encoder import encode_resp
-from app.resp_parser import parse_resp
-from app.types import NullArray, RESPError, RESPProtocolError
+from app.resp_encoder import encode_array_header, encode_into, encode_resp
+from app.types import (
+    EncodeableValue,
+    NullArray,
+    RESPError,
+    RESPProtocolError,
+    RESPValue,
+    StreamingReply,
+)
 
 if TYPE_CHECKING:
     from app.commands.registry import CommandRegistry
@@ -17,24 +27,301 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
-class RedisServer:
+class BaseRedisServer(ABC):
+    """
+    Connection-agnostic request handling shared by the server implementations.
+
+    Subclasses own the I/O: they feed received bytes into a ClientConnection,
+    decide how blocked clients wait and time out, and write out whatever
+    _reply queued in write_buffer. They also drive the active expire cycle:
+    a slow cycle active_expire_hz times a second, followed by fast cycles on
+    every loop iteration while expired keys are still left over.
+    """
+
     def __init__(
         self,
         registry: "CommandRegistry",
+        database: DataBase,
         config: ServerConfig = DEFAULT_SERVER_CONFIG,
     ):
         self._config = config
         self._registry = registry
-        self._server_socket: socket.socket | None = None
-        self._connections: list[socket.socket] = []
+        self._database = database
+        self._pending_writes: set[ClientConnection] = set()
         self._blocking_state = BlockingState()
+        # Keys written since blocked clients were last served, in order.
+        # A dict is used as an ordered set.
+        self._ready_keys: dict[bytes, None] = {}
+        self._serving_ready_keys = False
+
+    @abstractmethod
+    def start(self) -> None:
+        """Bind the listening socket and serve until interrupted."""
+
+    @abstractmethod
+    def _add_blocker(
+        self, response: BlockingResponse, client: ClientConnection
+    ) -> None:
+        """Register a client as blocked waiting for keys."""
+
+    @abstractmethod
+    def _wake(self, waiter: WaitingClient, reply: bytes) -> None:
+        """Deliver the reply to a woken blocked client."""
+
+    @abstractmethod
+    def _remove_client(self, client: ClientConnection) -> None:
+        """Clean up a disconnected client."""
+
+    def _handle_data(self, client: ClientConnection, data: bytes | memoryview) -> None:
+        """Buffer received bytes and run every complete command."""
+        client.parser.feed(data)
+        self._handle_input(client)
+
+    def _handle_input(self, client: ClientConnection) -> None:
+        """Run every command completed by the input received so far."""
+        try:
+            client.parse()
+        except RESPProtocolError as e:
+            # The stream can't be resynchronised after garbage, so answer
+            # the commands we did understand and then drop the connection.
+            logger.warning("Protocol error: %s", e)
+            self._process_pending(client)
+            self._reply(client, encode_resp(RESPError("ERR protocol error")))
+            client.close_after_reply = True
+            return
+
+        self._process_pending(client)
+
+    def _adapt_read_size(self, client: ClientConnection, nbytes: int) -> None:
+        """
+        Grow the next read after one that filled the buffer, shrink it after
+        a mostly empty one, within the configured bounds.
+        """
+        config = self._config
+        if nbytes >= client.read_size:
+            client.read_size = min(client.read_size * 2, config.max_recv_buffer_size)
+        elif nbytes < client.read_size // 8:
+            client.read_size = max(client.read_size // 2, config.recv_buffer_size)
+
+    def _active_expire(self, fast: bool) -> bool:
+        """
+        Run one expire cycle.
+
+        Returns:
+            True if expired keys remain once its time budget ran out
+        """
+        config = self._config
+        if fast:
+            budget = config.active_expire_fast_budget
+        else:
+            budget = config.active_expire_cpu_percent / 100 / config.active_expire_hz
+        return self._database.active_expire_cycle(budget)
+
+    def _process_pending(self, client: ClientConnection) -> None:
+        """Execute queued commands in order until the client blocks."""
+        while (
+            client.pending_commands and not client.is_blocked and not client.close_asap
+        ):
+            command = client.pending_commands.popleft()
+            self._process_request(command, client)
+
+    def _process_request(self, command: RESPValue, client: ClientConnection) -> None:
+        """Execute a single parsed request and queue its reply."""
+        result = self._registry.execute(command)
+
+        event = None
+        if isinstance(result, tuple):
+            result, event = result
+
+        if isinstance(result, BlockingResponse):
+            self._add_blocker(result, client)
+            return
+
+        # Command produced data - check for waiters
+        if isinstance(event, UnblockEvent) and self._blocking_state.has_waiters(
+            event.key
+        ):
+            self._ready_keys[event.key] = None
+
+        self._reply_value(client, result)
+        if self._ready_keys:
+            self._serve_ready_keys()
+
+    def _serve_ready_keys(self) -> None:
+        """
+        Serve clients blocked on the keys written by the last command.
+
+        Like Redis's ready keys: each key serves its waiters in the order
+        they blocked, for as long as there is data, so one RPUSH of four
+        elements wakes four BLPOPs. Woken clients run their pipelined
+        commands straight away; keys those write are served by this same
+        loop rather than recursively.
+        """
+        if self._serving_ready_keys:
+            return
+        self._serving_ready_keys = True
+        try:
+            while self._ready_keys:
+                ready, self._ready_keys = self._ready_keys, {}
+                for key in ready:
+                    self._serve_key(key)
+        finally:
+            self._serving_ready_keys = False
+
+    def _serve_key(self, key: bytes) -> None:
+        # Callbacks may hand the same reply object to several waiters (XREAD
+        # fan-out); it is encoded once. Keeping the object alive here keeps
+        # its id from being reused.
+        encoded: dict[int, tuple[object, bytes]] = {}
+        for waiter in self._blocking_state.waiters(key):
+            if not self._database.exists(key):
+                # Emptied lists are deleted, so nobody else can be served
+                return
+            if not waiter.active:
+                continue  # Already woken through another key
+            try:
+                result = waiter.callback(key)
+            except WrongTypeError as e:
+                # E.g. BLMOVE's destination was set to a string meanwhile
+                result = RESPError(str(e))
+            if result is None:
+                # Nothing for this one (e.g. XREAD waiting for a later ID);
+                # it stays queued in its place
+                continue
+            self._blocking_state.remove(waiter)
+            if isinstance(result, tuple):
+                result, event = result
+                if self._blocking_state.has_waiters(event.key):
+                    self._ready_keys[event.key] = None
+            shared = encoded.get(id(result))
+            if shared is None:
+                shared = encoded[id(result)] = (result, encode_resp(result))
+            self._wake(waiter, shared[1])
+
+    def _resume(self, client: ClientConnection) -> None:
+        """Unblock a client and run the commands it pipelined meanwhile."""
+        client.waiter = None
+        if not client.closed:
+            self._process_pending(client)
+
+    def _reply(self, client: ClientConnection, data: bytes) -> None:
+        """Queue reply bytes; they are written out by _flush_pending_writes."""
+        if client.close_asap:
+            return
+        if client.deferred:
+            # Queue behind a streaming reply that is still being produced
+            client.deferred.append(data)
+            client.deferred_bytes += len(data)
+        else:
+            client.write_buffer += data
+        self._pending_writes.add(client)
+        self._check_output_limits(client)
+
+    def _reply_value(self, client: ClientConnection, value: EncodeableValue) -> None:
+        """Encode a reply straight into the client's write buffer."""
+        if client.close_asap:
+            return
+        if isinstance(value, StreamingReply):
+            self._reply(client, encode_array_header(value.count))
+            client.deferred.append(value.items)
+            self._fill_write_buffer(client)
+            return
+        if client.deferred:
+            self._reply(client, encode_resp(value))
+            return
+        encode_into(client.write_buffer, value)
+        self._pending_writes.add(client)
+        self._check_output_limits(client)
+
+    def _fill_write_buffer(self, client: ClientConnection) -> None:
+        """
+        Move deferred output into write_buffer, encoding streaming replies
+        until the buffer holds about one chunk.
+        """
+        chunk_size = self._config.reply_chunk_size
+        buffer = client.write_buffer
+        deferred = client.deferred
+        while deferred and len(buffer) < chunk_size:
+            head = deferred[0]
+            if isinstance(head, bytes):
+                buffer += head
+                client.deferred_bytes -= len(head)
+                deferred.popleft()
+                continue
+            for item in head:
+                encode_into(buffer, item)
+                if len(buffer) >= chunk_size:
+                    break
+            else:
+                deferred.popleft()
+
+    def _pending_output(self, client: ClientConnection) -> int:
+        """Number of reply bytes not yet accepted by the kernel."""
+        return len(client.write_buffer) + client.deferred_bytes
+
+    def _check_output_limits(self, client: ClientConnection) -> None:
+        """Schedule a disconnect for clients that don't read their replies."""
+        pending = self._pending_output(client)
+        hard = self._config.output_buffer_hard_limit
+        soft = self._config.output_buffer_soft_limit
+
+        if hard and pending >= hard:
+            self._close_asap(client, "hard")
+            return
+
+        if not soft or pending < soft:
+            client.soft_limit_reached_at = None
+            return
+
+        now = time.monotonic()
+        if client.soft_limit_reached_at is None:
+            client.soft_limit_reached_at = now
+        elif now - client.soft_limit_reached_at >= (
+            self._config.output_buffer_soft_seconds
+        ):
+            self._close_asap(client, "soft")
+
+    def _close_asap(self, client: ClientConnection, limit: str) -> None:
+        logger.warning(
+            "Closing client %s: output buffer of %d bytes over %s limit",
+            client.address,
+            self._pending_output(client),
+            limit,
+        )
+        client.close_asap = True
+        client.write_buffer.clear()
+        client.deferred.clear()
+        client.deferred_bytes = 0
+        client.pending_commands.clear()
+        self._pending_writes.add(client)
+
+
+class RedisServer(BaseRedisServer):
+    """Single-threaded server driven by a hand-rolled selectors event loop."""
+
+    def __init__(
+        self,
+        registry: "CommandRegistry",
+        database: DataBase,
+        config: ServerConfig = DEFAULT_SERVER_CONFIG,
+    ):
+        super().__init__(registry, database, config)
+        self._server_socket: socket.socket | None = None
+        self._selector = selectors.DefaultSelector()
+        self._clients: dict[int, ClientConnection] = {}
+        self._next_expire_cycle = 0.0
+        self._expire_backlog = False
 
     def start(self) -> None:
         logger.info("Starting server on %s:%d", self._config.host, self._config.port)
         self._server_socket = socket.create_server(
-            (self._config.host, self._config.port), reuse_port=True
+            (self._config.host, self._config.port),
+            backlog=self._config.socket_backlog,
+            reuse_port=True,
         )
         self._server_socket.setblocking(False)
+        # Listening socket is registered without data; clients carry theirs
+        self._selector.register(self._server_socket, selectors.EVENT_READ)
 
         try:
             self._run_event_loop()
@@ -45,111 +332,444 @@ class RedisServer:
         assert self._server_socket is not None
 
         while True:
-            all_sockets: list[socket.socket] = [self._server_socket] + self._connections
-            ready_to_read, _, _ = select.select(all_sockets, [], [], 0.1)
-
-            for ready_socket in ready_to_read:
-                if ready_socket == self._server_socket:
-                    self._accept_connection()
-                else:
-                    self._handle_client(ready_socket)
+            for key, mask in self._selector.select(timeout=self._select_timeout()):
+                client: ClientConnection | None = key.data
+                if client is None:
+                    self._accept_connections()
+                    continue
+                if mask & selectors.EVENT_WRITE and not client.closed:
+                    self._write_to_client(client)
+                if mask & selectors.EVENT_READ and not client.closed:
+                    self._handle_client(client)
 
             self._handle_expired_blockers()
+            self._run_expire_cycles()
+            self._flush_pending_writes()
 
-    def _accept_connection(self) -> None:
+    def _accept_connections(self) -> None:
+        """Accept every connection waiting in the backlog."""
         assert self._server_socket is not None
-        connection, address = self._server_socket.accept()
-        logger.info("Connection received from %s", address)
-        self._connections.append(connection)
+        while True:
+            try:
+                connection, address = self._server_socket.accept()
+            except BlockingIOError:
+                return
+            connection.setblocking(False)
+            logger.info("Connection received from %s", address)
+            client = ClientConnection(
+                socket=connection,
+                address=address,
+                read_size=self._config.recv_buffer_size,
+                events=selectors.EVENT_READ,
+            )
+            self._selector.register(connection, client.events, client)
+            self._clients[connection.fileno()] = client
 
-    def _handle_client(self, client: socket.socket) -> None:
-        data = client.recv(self._config.recv_buffer_size)
+    def _handle_client(self, client: ClientConnection) -> None:
+        assert client.socket is not None
+        # A large argument whose header has been parsed is received straight
+        # into its own buffer, skipping the general input buffer entirely.
+        big_arg = client.parser.big_arg_buffer()
+        try:
+            if big_arg is not None:
+                nbytes = client.socket.recv_into(big_arg)
+            else:
+                data = client.socket.recv(client.read_size)
+                nbytes = len(data)
+        except BlockingIOError:
+            return
+        except ConnectionError:
+            nbytes = 0
 
-        if data == b"":
+        if nbytes == 0:
             self._remove_client(client)
             return
 
-        response = self._process_request(data, client)
-
-        if response:
-            client.sendall(response)
-
-    def _process_request(self, data: bytes, client: socket.socket) -> bytes | None:
-        """Parse, execute, and encode a request."""
-        try:
-            parsed_data = parse_resp(data)[0]
-            result = self._registry.execute(parsed_data)
-
-            event = None
-            if isinstance(result, tuple):
-                result, event = result
-
-            if isinstance(result, BlockingResponse):
-                self._add_blocker(result, client)
-                return None
-
-            # Command produced data - check for waiters
-            if isinstance(event, UnblockEvent):
-                self._try_unblock(event.key)
-
-            return encode_resp(result)
-
-        except RESPProtocolError as e:
-            logger.warning("Protocol error: %s", e)
-            return encode_resp(RESPError("ERR protocol error"))
+        if big_arg is not None:
+            client.parser.big_arg_received(nbytes)
+            self._handle_input(client)
+        else:
+            self._adapt_read_size(client, nbytes)
+            self._handle_data(client, data)
 
-    def _add_blocker(self, response: BlockingResponse, client: socket.socket) -> None:
+    def _add_blocker(
+        self, response: BlockingResponse, client: ClientConnection
+    ) -> None:
         """Register a client as blocked waiting for keys."""
         timeout_at = (
-            datetime.now() + timedelta(seconds=response.timeout)
+            time.monotonic() + response.timeout
             if response.timeout != 0
             else None  # Wait forever
         )
         waiter = WaitingClient(
-            socket=client,
+            client=client,
             keys=response.keys,
             timeout_at=timeout_at,
             callback=response.unblock_callback,
         )
+        client.waiter = waiter
         self._blocking_state.add(waiter)
 
-    def _try_unblock(self, key: str) -> None:
-        """Wake the first waiter for a key if data exists."""
-        waiter = self._blocking_state.pop(key)
-        if waiter is None:
-            return
+    def _wake(self, waiter: WaitingClient, reply: bytes) -> None:
+        self._reply(waiter.client, reply)
+        self._resume(waiter.client)
 
-        result = waiter.callback(key)
-        if result is None:
-            return
+    def _handle_expired_blockers(self) -> None:
+        """Send null array to clients whose timeout has passed."""
+        for waiter in self._blocking_state.pop_expired(time.monotonic()):
+            self._reply(waiter.client, encode_resp(NullArray()))
+            self._resume(waiter.client)
 
-        if isinstance(result, tuple):
-            key, value = result
-            waiter.socket.sendall(encode_resp([key, value]))
+    def _select_timeout(self) -> float | None:
+        """
+        How long select may sleep: until the nearest blocked client times
+        out or the next expire cycle is due, whichever comes first. With
+        neither pending it sleeps until a socket is ready.
+        """
+        if self._expire_backlog:
+            # Expired keys are waiting for a fast cycle
+            return 0
+        wake_at = self._blocking_state.next_deadline()
+        if self._database.expires and (
+            wake_at is None or self._next_expire_cycle < wake_at
+        ):
+            wake_at = self._next_expire_cycle
+        if wake_at is None:
+            return None
+        return max(wake_at - time.monotonic(), 0)
 
-        if isinstance(result, list):
-            waiter.socket.sendall(encode_resp(result))
+    def _run_expire_cycles(self) -> None:
+        now = time.monotonic()
+        if now >= self._next_expire_cycle:
+            self._next_expire_cycle = now + 1 / self._config.active_expire_hz
+            self._expire_backlog = self._active_expire(fast=False)
+        elif self._expire_backlog:
+            self._expire_backlog = self._active_expire(fast=True)
 
-    def _handle_expired_blockers(self) -> None:
-        """Send null array to clients whose timeout has passed."""
-        now = datetime.now()
-        for client in self._blocking_state.get_expired(now):
-            client.socket.sendall(encode_resp(NullArray()))
-            self._blocking_state.remove(client)
+    def _update_events(self, client: ClientConnection) -> None:
+        """
+        Register interest in writability while output is queued, and stop
+        reading from clients that are not draining their replies.
+        """
+        events = 0
+        if (
+            not client.deferred
+            and len(client.write_buffer) < self._config.output_backpressure_bytes
+        ):
+            events |= selectors.EVENT_READ
+        if client.write_buffer or client.deferred:
+            events |= selectors.EVENT_WRITE
+        if events != client.events:
+            self._selector.modify(client.socket, events, client)
+            client.events = events
+
+    def _flush_pending_writes(self) -> None:
+        """Try to send each client's accumulated replies with a single write."""
+        pending, self._pending_writes = self._pending_writes, set()
+        for client in pending:
+            if client.close_asap:
+                self._remove_client(client)
+            elif client.events & selectors.EVENT_WRITE:
+                # Already waiting for the socket to drain
+                self._update_events(client)
+            else:
+                self._write_to_client(client)
+
+    def _write_to_client(self, client: ClientConnection) -> None:
+        """
+        Write as much queued output as the socket accepts without blocking.
+
+        Leftover bytes keep the client registered for write readiness.
+        Streaming replies are encoded one chunk per write, so they only
+        occupy as much memory as the socket is ready to take.
+        """
+        assert client.socket is not None
+        self._fill_write_buffer(client)
+        try:
+            sent = client.socket.send(client.write_buffer)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._remove_client(client)
+            return
+
+        del client.write_buffer[:sent]
+        if client.write_buffer or client.deferred:
+            self._check_output_limits(client)
+            if client.close_asap:
+                self._remove_client(client)
+                return
+        elif client.close_after_reply:
+            self._remove_client(client)
+            return
+
+        self._update_events(client)
 
-    def _remove_client(self, client: socket.socket) -> None:
+    def _remove_client(self, client: ClientConnection) -> None:
         """Clean up a disconnected client."""
-        logger.info("Client disconnected: %s", client.getpeername())
-        self._connections.remove(client)
-        client.close()
+        assert client.socket is not None
+        if client.closed:
+            return
+        logger.info("Client disconnected: %s", client.address)
+        if client.waiter is not None:
+            self._blocking_state.remove(client.waiter)
+            client.waiter = None
+        self._pending_writes.discard(client)
+        self._selector.unregister(client.socket)
+        del self._clients[client.socket.fileno()]
+        client.socket.close()
+        client.closed = True
 
     def _shutdown(self) -> None:
         """Clean up all connections and server socket."""
         logger.info("Shutting down server")
-        for connection in self._connections:
-            connection.close()
-        self._connections.clear()
+        for client in self._clients.values():
+            assert client.socket is not None
+            client.socket.close()
+            client.closed = True
+        self._clients.clear()
+        self._selector.close()
 
         if self._server_socket:
             self._server_socket.close()
             self._server_socket = None
+
+
+class RedisProtocol(asyncio.BufferedProtocol):
+    """
+    asyncio protocol bridging one transport to an AsyncRedisServer.
+
+    Reads land in a reusable scratch buffer, or directly in the buffer of a
+    large argument once its header has been parsed.
+    """
+
+    def __init__(self, server: "AsyncRedisServer"):
+        self._server = server
+        self._client = ClientConnection(read_size=server.recv_buffer_size)
+        self._scratch = bytearray(self._client.read_size)
+        self._reading_big_arg = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        assert isinstance(transport, asyncio.Transport)
+        self._client.transport = transport
+        self._client.address = transport.get_extra_info("peername")
+        transport.set_write_buffer_limits(high=self._server.output_backpressure_bytes)
+        self._server._add_client(self._client)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        big_arg = self._client.parser.big_arg_buffer()
+        self._reading_big_arg = big_arg is not None
+        if big_arg is not None:
+            return big_arg
+        if len(self._scratch) != self._client.read_size:
+            self._scratch = bytearray(self._client.read_size)
+        return memoryview(self._scratch)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        if self._reading_big_arg:
+            self._client.parser.big_arg_received(nbytes)
+            self._server._handle_input(self._client)
+        else:
+            self._server._adapt_read_size(self._client, nbytes)
+            self._server._handle_data(self._client, memoryview(self._scratch)[:nbytes])
+        self._server._schedule_flush()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._server._remove_client(self._client)
+
+    def pause_writing(self) -> None:
+        # Backpressure: stop reading until the client drains its replies
+        assert self._client.transport is not None
+        self._client.writing_paused = True
+        self._client.transport.pause_reading()
+
+    def resume_writing(self) -> None:
+        assert self._client.transport is not None
+        self._client.writing_paused = False
+        if not self._client.closed:
+            self._client.transport.resume_reading()
+            self._server._write_to_transport(self._client)
+
+
+class AsyncRedisServer(BaseRedisServer):
+    """
+    Server built on asyncio transports and protocols.
+
+    Runs on uvloop when it is installed. Blocked clients wait on futures that
+    are resolved by a write to one of their keys or by a loop.call_at timer,
+    so nothing is polled.
+    """
+
+    def __init__(
+        self,
+        registry: "CommandRegistry",
+        database: DataBase,
+        config: ServerConfig = DEFAULT_SERVER_CONFIG,
+    ):
+        super().__init__(registry, database, config)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._clients: set[ClientConnection] = set()
+        self._flush_scheduled = False
+
+    @property
+    def recv_buffer_size(self) -> int:
+        return self._config.recv_buffer_size
+
+    @property
+    def output_backpressure_bytes(self) -> int:
+        return self._config.output_backpressure_bytes
+
+    def start(self) -> None:
+        try:
+            import uvloop
+
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            loop_factory = None
+
+        logger.info("Starting server on %s:%d", self._config.host, self._config.port)
+        asyncio.run(self._serve(), loop_factory=loop_factory)
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        server = await self._loop.create_server(
+            lambda: RedisProtocol(self),
+            self._config.host,
+            self._config.port,
+            backlog=self._config.socket_backlog,
+            reuse_port=True,
+        )
+        self._loop.call_later(1 / self._config.active_expire_hz, self._expire_tick)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._shutdown()
+
+    def _add_client(self, client: ClientConnection) -> None:
+        logger.info("Connection received from %s", client.address)
+        self._clients.add(client)
+
+    def _expire_tick(self) -> None:
+        """Slow expire cycle, rescheduled active_expire_hz times a second."""
+        assert self._loop is not None
+        self._loop.call_later(1 / self._config.active_expire_hz, self._expire_tick)
+        if self._active_expire(fast=False):
+            self._loop.call_soon(self._fast_expire)
+
+    def _fast_expire(self) -> None:
+        """Keep running fast cycles, yielding to I/O between them."""
+        assert self._loop is not None
+        if self._active_expire(fast=True):
+            self._loop.call_soon(self._fast_expire)
+
+    def _add_blocker(
+        self, response: BlockingResponse, client: ClientConnection
+    ) -> None:
+        """Park the client on a future, with a timer for finite timeouts."""
+        assert self._loop is not None
+        waiter = WaitingClient(
+            client=client,
+            keys=response.keys,
+            timeout_at=None,
+            callback=response.unblock_callback,
+            future=self._loop.create_future(),
+        )
+        if response.timeout != 0:
+            waiter.timer = self._loop.call_at(
+                self._loop.time() + response.timeout, self._expire_waiter, waiter
+            )
+        waiter.future.add_done_callback(
+            lambda future: self._on_waiter_done(waiter, future)
+        )
+        client.waiter = waiter
+        self._blocking_state.add(waiter)
+
+    def _wake(self, waiter: WaitingClient, reply: bytes) -> None:
+        assert waiter.future is not None
+        if waiter.timer is not None:
+            waiter.timer.cancel()
+        waiter.future.set_result(reply)
+
+    def _expire_waiter(self, waiter: WaitingClient) -> None:
+        assert waiter.future is not None
+        if waiter.future.done():
+            return
+        self._blocking_state.remove(waiter)
+        waiter.future.set_result(encode_resp(NullArray()))
+
+    def _on_waiter_done(self, waiter: WaitingClient, future: asyncio.Future) -> None:
+        if waiter.timer is not None:
+            waiter.timer.cancel()
+        if future.cancelled() or waiter.client.closed:
+            return
+        self._reply(waiter.client, future.result())
+        self._resume(waiter.client)
+        self._schedule_flush()
+
+    def _pending_output(self, client: ClientConnection) -> int:
+        assert client.transport is not None
+        return (
+            len(client.write_buffer)
+            + client.deferred_bytes
+            + client.transport.get_write_buffer_size()
+        )
+
+    def _schedule_flush(self) -> None:
+        """Write out all queued replies once the current callbacks finish."""
+        if not self._flush_scheduled and self._loop is not None:
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush_pending_writes)
+
+    def _flush_pending_writes(self) -> None:
+        """Hand each client's accumulated replies to its transport in one write."""
+        self._flush_scheduled = False
+        pending, self._pending_writes = self._pending_writes, set()
+        for client in pending:
+            if client.closed:
+                continue
+            assert client.transport is not None
+            if client.close_asap:
+                client.transport.abort()
+                continue
+            self._write_to_transport(client)
+
+    def _write_to_transport(self, client: ClientConnection) -> None:
+        """
+        Write queued output until the transport asks us to pause.
+
+        Streaming replies are encoded a chunk at a time; once the transport
+        buffer passes its high-water mark the rest waits for resume_writing.
+        """
+        assert client.transport is not None
+        while not client.writing_paused:
+            self._fill_write_buffer(client)
+            if not client.write_buffer:
+                break
+            client.transport.write(bytes(client.write_buffer))
+            client.write_buffer.clear()
+
+        if client.close_after_reply and not (client.write_buffer or client.deferred):
+            client.transport.close()
+
+    def _remove_client(self, client: ClientConnection) -> None:
+        """Clean up a disconnected client."""
+        if client.closed:
+            return
+        logger.info("Client disconnected: %s", client.address)
+        client.closed = True
+        if client.waiter is not None:
+            self._blocking_state.remove(client.waiter)
+            if client.waiter.future is not None:
+                client.waiter.future.cancel()
+            client.waiter = None
+        self._pending_writes.discard(client)
+        self._clients.discard(client)
+
+    def _shutdown(self) -> None:
+        """Close every client transport."""
+        logger.info("Shutting down server")
+        for client in list(self._clients):
+            assert client.transport is not None
+            client.transport.abort()
+        self._clients.clear()
@@ -5,13 +5,16 @@ This module contains all types used for RESP protocol encoding/decoding:
 - SimpleString: RESP simple string type (+)
 - RESPError: RESP error type (-)
 - RESPProtocolError: Exception for protocol violations
+- RESPIncompleteError: Signal that more bytes are needed to finish a value
+- StreamingReply: Array reply whose items are produced lazily
 
 Type aliases:
-- RESPValue: Union of all possible RESP values (str, int, list, None, RESPError)
-- ParseResult: Tuple of parsed RESP value and remaining bytes
+- RESPValue: Union of all possible RESP values (bytes, str, int, list, None, RESPError)
+- ParseResult: Tuple of parsed RESP value and the offset just past it
 - EncodeableValue: Union of all values that can be encoded to RESP format
 """
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 
 
@@ -29,8 +32,26 @@ class NullArray:
     pass
 
 
+@dataclass
+class StreamingReply:
+    """
+    RESP array of a known length whose items are produced on demand.
+
+    The server encodes items in bounded chunks as the client's socket
+    accepts data, so a huge LRANGE/XRANGE never exists fully encoded.
+    """
+
+    count: int
+    items: Iterator
+
+
 class RESPProtocolError(Exception):
-    """Exception raised when RESP protocol is violated."""
+    """
+    Exception raised when RESP protocol is violated.
+
+    commands holds the commands RequestParser.parse() completed before the
+    error in the same pass, so that they can still be run.
+    """
 
     def __init__(self, message: str, data=None, position: int | None = None):
         """
@@ -43,6 +64,7 @@ class RESPProtocolError(Exception):
         self.message = message
         self.data = data
         self.position = position
+        self.commands: list[RESPValue] = []
 
         full_message = f"RESP Protocol Error: {message}"
 
@@ -58,6 +80,25 @@ class RESPProtocolError(Exception):
         super().__init__(full_message)
 
 
-RESPValue = str | int | list | None | RESPError
-ParseResult = tuple[RESPValue, bytes]
-EncodeableValue = str | int | list | None | RESPError | SimpleString | NullArray
+class RESPIncompleteError(Exception):
+    """
+    Raised when the data ends before a complete RESP value was read.
+
+    This is not a protocol violation: the caller should keep the bytes and
+    retry once more data has arrived from the socket.
+    """
+
+
+RESPValue = bytes | str | int | list | None | RESPError
+ParseResult = tuple[RESPValue, int]
+EncodeableValue = (
+    bytes
+    | str
+    | int
+    | list
+    | None
+    | RESPError
+    | SimpleString
+    | NullArray
+    | StreamingReply
+)
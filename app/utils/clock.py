@@ -0,0 +1,11 @@
+import time
+
+
+def monotonic_ms() -> int:
+    """Milliseconds on the monotonic clock, the unit of every key deadline."""
+    return time.monotonic_ns() // 1_000_000
+
+
+def unix_ms() -> int:
+    """Milliseconds since the epoch, the unit of stream delivery times."""
+    return time.time_ns() // 1_000_000
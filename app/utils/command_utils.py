@@ -1,5 +1,18 @@
+import math
+
+
 def parse_args(pairs: list) -> dict:
     pair_map = {}
     for i in range(0, len(pairs), 2):
         pair_map[pairs[i]] = pairs[i + 1]
     return pair_map
+
+
+def parse_timeout(arg: bytes) -> float | None:
+    """Parse a blocking command's timeout in seconds, or None if invalid."""
+    try:
+        timeout = float(arg)
+    except ValueError:
+        return None
+    # "inf" and "nan" parse as floats but make no deadline
+    return timeout if math.isfinite(timeout) and timeout >= 0 else None
@@ -0,0 +1,80 @@
+import re
+from functools import lru_cache
+
+_SPECIAL = b"*?["
+
+
+@lru_cache(maxsize=256)
+def compile_glob(pattern: bytes) -> re.Pattern[bytes]:
+    """
+    Compile a Redis glob pattern (as used by KEYS and SCAN MATCH) to a regex.
+
+    Supports * and ? wildcards, [abc], [^abc] and [a-z] classes, and
+    backslash escapes. Patterns are cached, so repeated scans with the same
+    MATCH don't recompile.
+    """
+    out: list[bytes] = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i : i + 1]
+        if c == b"*":
+            out.append(b".*")
+        elif c == b"?":
+            out.append(b".")
+        elif c == b"\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i : i + 1]))
+        elif c == b"[":
+            i = _compile_class(pattern, i + 1, out)
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile(b"".join(out), re.DOTALL)
+
+
+def _compile_class(pattern: bytes, i: int, out: list[bytes]) -> int:
+    """Translate the [...] class starting at pattern[i]; return the index after it."""
+    n = len(pattern)
+    negate = i < n and pattern[i : i + 1] == b"^"
+    if negate:
+        i += 1
+    members: list[bytes] = []
+    while i < n and pattern[i : i + 1] != b"]":
+        c = pattern[i : i + 1]
+        if c == b"\\" and i + 1 < n:
+            i += 1
+            c = pattern[i : i + 1]
+        end = pattern[i + 2 : i + 3]
+        if pattern[i + 1 : i + 2] == b"-" and end and end != b"]":
+            low, high = sorted((c, end))
+            members.append(re.escape(low) + b"-" + re.escape(high))
+            i += 3
+        else:
+            members.append(re.escape(c))
+            i += 1
+    # An unterminated class runs to the end of the pattern, as in Redis
+    if not members:
+        # [] and [^] match nothing and anything respectively
+        out.append(b"." if negate else b"(?!)")
+    else:
+        out.append(b"[" + (b"^" if negate else b"") + b"".join(members) + b"]")
+    return i + 1
+
+
+def literal_prefix(pattern: bytes) -> bytes:
+    """The leading part of pattern that can only match itself."""
+    prefix = bytearray()
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == 0x5C and i + 1 < len(pattern):  # "\"
+            i += 1
+            prefix.append(pattern[i])
+        elif c in _SPECIAL:
+            break
+        else:
+            prefix.append(c)
+        i += 1
+    return bytes(prefix)
@@ -0,0 +1,65 @@
+"""
+Keyspace benchmark: memory per key and GET latency.
+
+Stores N keys holding small integers, a tenth of them with an EX expiry,
+and reports the process's RSS growth per key, the database's own
+used_memory estimate, and the mean cost of SET and GET through the
+command registry. The key names are built before the RSS baseline, so
+their bytes are not counted.
+
+Usage, from the repository root:
+    python -m benchmarks.keyspace [N]    (default 10,000,000)
+"""
+
+import gc
+import sys
+import time
+
+from app.commands.registry import CommandRegistry
+from app.data.db import DataBase
+
+GET_SAMPLE = 1_000_000
+
+
+def rss() -> int:
+    """Resident set size of this process, in bytes."""
+    with open("/proc/self/status") as f:
+        return int(f.read().split("VmRSS:")[1].split()[0]) * 1024
+
+
+def main(n: int) -> None:
+    db = DataBase()
+    registry = CommandRegistry()
+    registry.auto_discover(db)
+    keys = [b"key:%d" % i for i in range(n)]
+
+    gc.collect()
+    before = rss()
+    start = time.perf_counter()
+    for i, key in enumerate(keys):
+        if i % 10:
+            registry.execute([b"SET", key, b"%d" % (i % 1000)])
+        else:
+            registry.execute([b"SET", key, b"%d" % (i % 1000), b"EX", b"1000"])
+    set_time = time.perf_counter() - start
+    gc.collect()
+    grown = rss() - before
+
+    get = registry.get(b"GET")
+    assert get is not None
+    sample = keys[:GET_SAMPLE]
+    start = time.perf_counter()
+    for key in sample:
+        get.execute([key])
+    get_time = time.perf_counter() - start
+
+    print(
+        f"{n:,} keys: RSS +{grown / n:.0f} B/key, "
+        f"used_memory {db.used_memory / n:.0f} B/key, "
+        f"SET {set_time / n * 1e6:.2f} us, "
+        f"GET {get_time / len(sample) * 1e9:.0f} ns"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
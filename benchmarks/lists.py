@@ -0,0 +1,54 @@
+"""
+List benchmark: per-operation cost as a list grows.
+
+For each size, builds a list of that many elements and times pushes and
+pops at both ends and an LINDEX in the middle of the list, straight on
+ListOps. With the QuickList the end operations should stay flat from a
+thousand elements up to ten million.
+
+Usage, from the repository root:
+    python -m benchmarks.lists [MAX_SIZE]    (default 10,000,000)
+"""
+
+import sys
+import time
+
+from app.data.db import DataBase
+from app.data.list_helper import ListOps
+
+SIZES = (1_000, 100_000, 1_000_000, 10_000_000)
+BATCH = 100_000  # Elements per RPUSH while building the list
+END_OPS = 20_000
+INDEX_OPS = 200
+
+
+def bench(n: int) -> str:
+    """Time the operations on a list of n elements."""
+    ops = ListOps(DataBase())
+    for i in range(0, n, BATCH):
+        ops.rpush(b"q", [b"x"] * min(BATCH, n - i))
+
+    timings = []
+    for name, op, repeat in (
+        ("LPUSH", lambda: ops.lpush(b"q", [b"y"]), END_OPS),
+        ("LPOP", lambda: ops.lpop(b"q"), END_OPS),
+        ("RPUSH", lambda: ops.rpush(b"q", [b"y"]), END_OPS),
+        ("RPOP", lambda: ops.rpop(b"q"), END_OPS),
+        ("LINDEX mid", lambda: ops.lindex(b"q", n // 2), INDEX_OPS),
+    ):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            op()
+        took = time.perf_counter() - start
+        timings.append(f"{name} {took / repeat * 1e6:.2f} us")
+    return f"{n:>12,}  " + "  ".join(timings)
+
+
+def main(max_size: int) -> None:
+    for n in SIZES:
+        if n <= max_size:
+            print(bench(n))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,84 @@
+"""
+Parser benchmark: parse cost per argument as commands grow.
+
+Parses an RPUSH of N ten-byte values with the cursor-based parse_resp
+and RequestParser, and with a baseline that slices off the rest of the
+buffer after every element, as the parser did before it walked the
+buffer with an integer cursor. The baseline's cost per argument grows
+with N, as every slice copies the whole tail; the cursor parsers' should
+stay flat. The baseline skips the checks the old parser made, so for
+small commands it is a lower bound on the old cost, not a fair race.
+
+Usage, from the repository root:
+    python -m benchmarks.parser [MAX_ARGS]    (default 10,000)
+"""
+
+import sys
+import time
+from collections.abc import Callable
+
+from app.resp_parser import RequestParser, parse_resp
+
+SIZES = (10, 100, 1_000, 10_000)
+ARGS_PER_SIZE = 200_000  # Arguments parsed for each size, in whole commands
+
+
+def slicing_parse(data: bytes) -> tuple[list[bytes], bytes]:
+    """
+    Parse an array of bulk strings the way the slicing parser did.
+
+    Returns: (elements, remaining_bytes)
+    """
+    end = data.index(b"\r\n")
+    count = int(data[1:end])
+    data = data[end + 2 :]
+    elements = []
+    for _ in range(count):
+        end = data.index(b"\r\n")
+        length = int(data[1:end])
+        start = end + 2
+        elements.append(data[start : start + length])
+        data = data[start + length + 2 :]
+    return elements, data
+
+
+def request_parser_parse(data: bytes) -> list:
+    parser = RequestParser()
+    parser.feed(data)
+    return parser.parse()
+
+
+def rpush(n: int) -> bytes:
+    """An RPUSH of n ten-byte values, in RESP."""
+    return (
+        b"*%d\r\n$5\r\nRPUSH\r\n$3\r\nkey\r\n" % (n + 2) + b"$10\r\n0123456789\r\n" * n
+    )
+
+
+def ns_per_arg(parse: Callable[[bytes], object], data: bytes, args: int) -> float:
+    repeat = max(ARGS_PER_SIZE // args, 1)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(data)
+    return (time.perf_counter() - start) / repeat / args * 1e9
+
+
+def main(max_args: int) -> None:
+    for n in SIZES:
+        if n > max_args:
+            break
+        data = rpush(n)
+        assert slicing_parse(data)[0] == parse_resp(data)[0]
+        timings = "  ".join(
+            f"{name} {ns_per_arg(parse, data, n + 2):7.1f} ns/arg"
+            for name, parse in (
+                ("slicing", slicing_parse),
+                ("parse_resp", parse_resp),
+                ("RequestParser", request_parser_parse),
+            )
+        )
+        print(f"{n:>7,} args  {timings}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,69 @@
+"""
+Stream benchmark: memory per entry, XADD cost and read latency.
+
+Appends N three-field entries to one stream through StreamOps, reporting
+the mean XADD cost, the process's RSS growth per entry and the
+database's used_memory estimate. It then times reads of ten entries: an
+XREAD after the tenth-to-last entry and an XRANGE in the middle.
+
+Entries get explicit IDs 1-0, 2-0, ... so the read bounds are known.
+
+Usage, from the repository root:
+    python -m benchmarks.streams [N]    (default 10,000,000)
+"""
+
+import gc
+import sys
+import time
+
+from app.data.db import DataBase
+from app.data.stream_helper import StreamOps
+
+READS = 1000
+
+
+def rss() -> int:
+    """Resident set size of this process, in bytes."""
+    with open("/proc/self/status") as f:
+        return int(f.read().split("VmRSS:")[1].split()[0]) * 1024
+
+
+def main(n: int) -> None:
+    db = DataBase()
+    ops = StreamOps(db)
+
+    gc.collect()
+    before = rss()
+    start = time.perf_counter()
+    for i in range(1, n + 1):
+        ops.add(
+            b"events",
+            f"{i}-0",
+            {b"event": b"click", b"user": b"%d" % (i % 100_000), b"page": b"/home"},
+        )
+    took = time.perf_counter() - start
+    gc.collect()
+    grown = rss() - before
+    print(
+        f"{n:,} entries: XADD {took / n * 1e6:.2f} us, "
+        f"RSS +{grown / 2**20:.0f} MB ({grown / n:.0f} B/entry), "
+        f"used_memory {db.used_memory / n:.0f} B/entry"
+    )
+
+    middle = n // 2
+    for name, read in (
+        ("XREAD after the last 10", lambda: ops.xread(b"events", f"{n - 10}-0")),
+        (
+            "XRANGE 10 in the middle",
+            lambda: ops.xrange(b"events", f"{middle}-0", f"{middle + 9}-0"),
+        ),
+    ):
+        start = time.perf_counter()
+        for _ in range(READS):
+            read()
+        took = time.perf_counter() - start
+        print(f"{name}: {took / READS * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
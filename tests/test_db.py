@@ -0,0 +1,23 @@
+import unittest
+
+from app.data.db import STRING, DataBase, RedisValue
+
+
+class KeyLogCompactionTest(unittest.TestCase):
+    def test_key_set_when_compacting_stays_in_log(self):
+        db = DataBase()
+        keys = [b"key:%d" % i for i in range(2000)]
+        for key in keys:
+            db.set(key, RedisValue(dtype=STRING, data=b"v"))
+        for key in keys:
+            db.delete(key)
+        # The log holds only stale entries now; this set compacts it
+        db.set(b"new", RedisValue(dtype=STRING, data=b"v"))
+
+        self.assertEqual(len(db.key_log), 1)
+        self.assertEqual(db.scan(0, count=10), (0, [b"new"]))
+        self.assertEqual(db.random_key(), b"new")
+
+
+if __name__ == "__main__":
+    unittest.main()
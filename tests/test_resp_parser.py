@@ -0,0 +1,35 @@
+import unittest
+
+from app.config import DEFAULT_PARSER_CONFIG
+from app.resp_parser import RequestParser
+from app.types import RESPProtocolError
+
+BIG_VALUE = b"x" * DEFAULT_PARSER_CONFIG.big_arg_threshold
+
+
+class RequestParserErrorTest(unittest.TestCase):
+    def test_commands_before_error_are_kept(self):
+        parser = RequestParser()
+        parser.feed(b"*1\r\n$4\r\nPING\r\n*1\r\n$4\r\nECHO\r\n!garbage\r\n")
+
+        with self.assertRaises(RESPProtocolError) as raised:
+            parser.parse()
+
+        self.assertEqual(raised.exception.commands, [[b"PING"], [b"ECHO"]])
+
+    def test_big_argument_before_error_is_kept(self):
+        parser = RequestParser()
+        header = b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$%d\r\n" % len(BIG_VALUE)
+        parser.feed(header + BIG_VALUE[:100])
+        self.assertEqual(parser.parse(), [])
+        self.assertIsNotNone(parser.big_arg_buffer())
+
+        parser.feed(BIG_VALUE[100:] + b"\r\n!garbage\r\n")
+        with self.assertRaises(RESPProtocolError) as raised:
+            parser.parse()
+
+        self.assertEqual(raised.exception.commands, [[b"SET", b"k", BIG_VALUE]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from app.commands.registry import CommandRegistry
+from app.config import DEFAULT_PARSER_CONFIG
+from app.connection import ClientConnection
+from app.data.db import DataBase
+from app.server import RedisServer
+
+BIG_VALUE = b"x" * DEFAULT_PARSER_CONFIG.big_arg_threshold
+
+
+class ProtocolErrorTest(unittest.TestCase):
+    """Commands received ahead of malformed input are answered first."""
+
+    def setUp(self):
+        self.db = DataBase()
+        registry = CommandRegistry()
+        registry.auto_discover(self.db)
+        # Not started: input is fed straight to the request handling
+        self.server = RedisServer(registry, self.db)
+        self.client = ClientConnection()
+
+    def test_command_in_same_read_as_error(self):
+        self.server._handle_data(self.client, b"*1\r\n$4\r\nPING\r\n!garbage\r\n")
+
+        self.assertEqual(
+            bytes(self.client.write_buffer), b"+PONG\r\n-ERR protocol error\r\n"
+        )
+        self.assertTrue(self.client.close_after_reply)
+
+    def test_big_argument_command_in_same_read_as_error(self):
+        header = b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$%d\r\n" % len(BIG_VALUE)
+        self.server._handle_data(self.client, header + BIG_VALUE[:100])
+        self.server._handle_data(self.client, BIG_VALUE[100:] + b"\r\n!garbage\r\n")
+
+        self.assertEqual(
+            bytes(self.client.write_buffer), b"+OK\r\n-ERR protocol error\r\n"
+        )
+        self.assertEqual(self.db.get(b"k").data, BIG_VALUE)
+
+
+if __name__ == "__main__":
+    unittest.main()